@@ -3,82 +3,141 @@ from __future__ import annotations
 import os
 
 try:
-    os.environ.setdefault("EVENTLET_NO_GREENDNS", "1")
+    # eventlet only honours "yes"; greendns costs ~150ms of imports and
+    # main.py restores the blocking resolver anyway.
+    os.environ.setdefault("EVENTLET_NO_GREENDNS", "yes")
 except Exception:
     pass
 
-try:  # Ensure eventlet is monkey-patched as early as possible so any socket
-    # modules (redis manager/socket) are compatible when using eventlet.
-    import importlib
-
-    eventlet = importlib.import_module("eventlet")
-    eventlet.monkey_patch()
-except Exception:
-    # Missing eventlet is acceptable in test environments; the async backend
-    # will be chosen from available libraries when creating the app.
-    pass
+# The default server runs on eventlet and needs the stdlib patched before
+# anything imports socket/threading (redis, the Socket.IO message queue, the
+# probe thread pool). ``SERVER_MODE=asgi`` runs on asyncio instead and must
+# not be patched.
+if os.environ.get("SERVER_MODE", "eventlet").strip().lower() != "asgi":
+    try:
+        import importlib
+
+        eventlet = importlib.import_module("eventlet")
+        # psycopg2 is made green when a PostgreSQL pool is first built
+        # (``database.green_psycopg2``) rather than imported here.
+        eventlet.monkey_patch(psycopg=False)
+    except Exception:
+        # Missing eventlet is acceptable in test environments; the async
+        # backend will be chosen from available libraries when creating the app.
+        pass
 
 from flask import Flask
 from flask_cors import CORS
 from flask_socketio import SocketIO
-try:  # Ensure eventlet monkey patched early so redis works with socketio
-    import importlib
-
-    eventlet = importlib.import_module("eventlet")
-    # eventlet.monkey_patch should be called once and as early as possible.
-    eventlet.monkey_patch()
-except Exception:
-    # If eventlet isn't available, nothing to patch. When running in a different
-    # async mode the app chooses a compatible library automatically.
-    pass
 
+from .admission import build_admission
+from .cluster import build_coordinator
+from .conditional import RepresentationCache
 from .config import Settings
 from .database import DatabaseRegistry
-from .routes import api_bp
+from .events import build_event_log
+from .health import HealthCache, HealthSampler
+from .jobs import JobQueue, build_backend
+from .message_queue import MessageQueueUpgrade
+from .monitor import HubMonitor
+from .rooms import Broadcaster
+from .serialization import SerializerJSONProvider, get_serializer
+from .routes import api_bp, metrics_bp
 from .ws import register_socketio_handlers, start_health_push
 
 socketio = SocketIO(cors_allowed_origins="*", async_mode=None, json=None)
 
 
-def create_app(settings: Settings | None = None):
-    """Application factory that wires Flask, Socket.IO, and database adapters."""
-
-    settings = settings or Settings.from_env()
+def create_flask_app(settings: Settings, registry) -> Flask:
+    """Flask app with the REST API wired to ``registry`` through a health cache.
 
+    Shared by the eventlet server (``create_app``) and the ASGI server
+    (``app.asgi.create_asgi_app``), which adds its own Socket.IO server.
+    """
     app = Flask(__name__)
     CORS(app)
 
-    registry = DatabaseRegistry(settings=settings)
+    serializer = get_serializer(settings.app.serializer)
+    provider = SerializerJSONProvider(app)
+    provider.serializer = serializer
+    app.json = provider
+    app.config["serializer"] = serializer
+
+    health = HealthCache(registry, settings.probe)
     app.config["settings"] = settings
     app.config["db_registry"] = registry
+    app.config["health_cache"] = health
+    app.config["representations"] = RepresentationCache()
+    admission = build_admission(settings)
+    health.admission = admission
+    app.config["admission"] = admission
+
+    event_log = build_event_log(settings)
+    if event_log is not None:
+        health.on_sample = event_log.record_health
+    app.config["event_log"] = event_log
 
     app.register_blueprint(api_bp)
+    app.register_blueprint(metrics_bp)
+    return app
 
-    message_queue = settings.redis.url if settings.redis.url else None
-
-    # Before passing Redis as a message queue to Socket.IO, try a quick ping.
-    # In some production environments the DNS resolver may timeout; failing
-    # here would crash the worker. As a safety measure, we silently disable
-    # message_queue when the connection cannot be established.
-    if message_queue:
-        try:
-            # We import redis lazily here so tests without Redis don't break.
-            import redis as _redis
-
-            _r = _redis.from_url(message_queue, socket_timeout=1)
-            _r.ping()
-        except Exception:
-            # Redis not reachable — disable pubsub to avoid crashing the process.
-            app.logger.warning(
-                "Redis message queue %s not reachable; starting without message queue",
-                message_queue,
-            )
-            message_queue = None
 
-    socketio.init_app(app, message_queue=message_queue)
-    register_socketio_handlers(socketio, registry, settings)
+def create_app(settings: Settings | None = None):
+    """Application factory that wires Flask, Socket.IO, and database adapters."""
+
+    settings = settings or Settings.from_env()
+
+    registry = DatabaseRegistry(settings=settings)
+    app = create_flask_app(settings, registry)
+    health = app.config["health_cache"]
+    event_log = app.config["event_log"]
+
+    # The same serializer encodes Socket.IO packets; a broadcast is encoded
+    # once and the packet reused for every recipient.
+    socketio.init_app(app, json=app.config["serializer"])
+
+    broadcaster = Broadcaster(socketio)
+    app.config["broadcaster"] = broadcaster
+    upgrade = MessageQueueUpgrade(settings.redis.url, broadcaster) if settings.redis.url else None
+    app.config["message_queue"] = upgrade
+
+    jobs_backend = build_backend(settings.jobs, settings.redis.url, settings.redis.channel)
+    jobs = JobQueue(settings.jobs, jobs_backend, broadcaster.emit_many, events=event_log)
+    app.config["job_queue"] = jobs
+    register_socketio_handlers(socketio, health, broadcaster, settings)
 
     if settings.app.enable_background_tasks:
-        start_health_push(socketio, registry, settings)
+        if upgrade is not None:
+            # Serve straight away and attach the Redis message queue once
+            # Redis answers, rather than blocking startup on a ping.
+            import socketio as _socketio
+
+            socketio.start_background_task(
+                upgrade.run,
+                socketio.server,
+                lambda: _socketio.RedisManager(settings.redis.url, channel="flask-socketio"),
+                socketio.sleep,
+            )
+        if settings.monitor.enabled:
+            monitor = HubMonitor(settings.monitor)
+            monitor.start(socketio.start_background_task, socketio.sleep)
+            app.config["hub_monitor"] = monitor
+        sampler = HealthSampler(registry, health, settings.probe)
+        app.config["health_sampler"] = sampler
+        coordinator = build_coordinator(settings, sampler)
+        active = None
+        if coordinator is None:
+            sampler.start(socketio.start_background_task, socketio.sleep)
+        else:
+            # Only the elected worker samples; the rest mirror its snapshots.
+            coordinator.start(socketio.start_background_task, socketio.sleep)
+            app.config["health_coordinator"] = coordinator
+            # With a message queue the leader's patches already reach every
+            # worker's clients.
+            active = lambda: coordinator.is_leader or not broadcaster.shared  # noqa: E731
+        start_health_push(socketio, health, broadcaster, settings, active=active)
+        jobs.start(socketio.start_background_task, socketio.sleep)
+        if event_log is not None:
+            event_log.start(socketio.start_background_task)
 
     return app, socketio
@@ -0,0 +1,207 @@
+"""Admission control for endpoints that can wait on live connector checks.
+
+Live checks themselves are already deduplicated by ``DatabaseRegistry``:
+one check per connector is in flight at a time, and every request that needs
+a fresh result waits on that same check. What grows without bound under a
+burst is the number of waiting requests, each holding a worker and a client
+connection. ``AdmissionController`` caps those waiters per connector, lets a
+few more queue briefly, and sheds the rest. Per-client token buckets can
+additionally rate-limit each caller.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from time import monotonic
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .config import AdmissionSection, Settings
+from .metrics import ADMISSION_QUEUE_WAIT, ADMISSION_SHED, ADMISSION_WAITING
+
+logger = logging.getLogger(__name__)
+
+# One bucket per client key: refill from the elapsed time, take a token if
+# there is one, otherwise report how long until there will be. Redis' own
+# clock is used so replicas with skewed clocks share buckets correctly.
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'at')
+local tokens = tonumber(state[1]) or burst
+local at = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - at) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'at', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class Overloaded(Exception):
+    """Raised when a request is turned away. ``status`` is 503 when the
+    server is saturated and 429 when the client is over its rate limit."""
+
+    def __init__(self, message: str, retry_after: float, status: int = 503):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status = status
+
+
+class Gate:
+    """Bounded concurrency for one connector, with a short bounded queue."""
+
+    def __init__(self, name: str, limit: int, queue_size: int, retry_after: float):
+        self.name = name
+        self.queue_size = queue_size
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(max(limit, 1))
+        self._lock = threading.Lock()
+        self._queued = 0
+
+    def acquire(self, deadline: float) -> None:
+        if not self._slots.acquire(blocking=False):
+            self._wait(deadline)
+        ADMISSION_WAITING.inc(connector=self.name)
+
+    def _wait(self, deadline: float) -> None:
+        with self._lock:
+            if self._queued >= self.queue_size:
+                ADMISSION_SHED.inc(reason="queue_full", target=self.name)
+                raise Overloaded(f"Too many requests waiting on '{self.name}'", self.retry_after)
+            self._queued += 1
+        start = monotonic()
+        try:
+            acquired = self._slots.acquire(timeout=max(deadline - start, 0.0))
+        finally:
+            with self._lock:
+                self._queued -= 1
+        ADMISSION_QUEUE_WAIT.observe(monotonic() - start, connector=self.name)
+        if not acquired:
+            ADMISSION_SHED.inc(reason="queue_timeout", target=self.name)
+            raise Overloaded(f"Timed out queueing for '{self.name}'", self.retry_after)
+
+    def release(self) -> None:
+        ADMISSION_WAITING.dec(connector=self.name)
+        self._slots.release()
+
+
+class MemoryRateLimiter:
+    """Token buckets in process memory. The least recently seen clients are
+    forgotten beyond ``max_clients``; a forgotten client starts with a full
+    bucket again."""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = float(max(burst, 1))
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, client: str) -> float:
+        """Take a token for ``client``; return 0, or the seconds until one is available."""
+        now = monotonic()
+        with self._lock:
+            tokens, at = self._buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - at) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[client] = (tokens, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class RedisRateLimiter:
+    """Token buckets in Redis hashes under ``<prefix>:ratelimit:<client>``,
+    shared by every replica. Each take is one atomic script call. If Redis
+    is unreachable, requests are let through rather than failed."""
+
+    def __init__(self, url: str, prefix: str, rate: float, burst: int, timeout: float = 0.5):
+        import redis
+
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.prefix = prefix
+        self._client = redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        self._script = self._client.register_script(_TOKEN_BUCKET_LUA)
+
+    def take(self, client: str) -> float:
+        try:
+            return float(self._script(keys=[f"{self.prefix}:ratelimit:{client}"], args=[self.rate, self.burst]))
+        except Exception as exc:
+            logger.warning("Rate limit check failed, admitting request: %s", exc)
+            return 0.0
+
+
+class AdmissionController:
+    def __init__(self, config: AdmissionSection, retry_after: float, limiter=None):
+        self.config = config
+        self.retry_after = retry_after
+        self.limiter = limiter
+        self._gates: Dict[str, Gate] = {}
+        self._lock = threading.Lock()
+
+    def gate(self, name: str) -> Gate:
+        gate = self._gates.get(name)
+        if gate is None:
+            with self._lock:
+                gate = self._gates.setdefault(
+                    name, Gate(name, self.config.max_inflight, self.config.queue_size, self.retry_after)
+                )
+        return gate
+
+    @contextmanager
+    def waiting(self, names: Iterable[str]) -> Iterator[None]:
+        """Hold a waiter slot for each connector in ``names``.
+
+        Slots are taken in name order so concurrent requests cannot deadlock,
+        and the whole set must be acquired within ``queue_timeout``.
+        Raises ``Overloaded`` otherwise.
+        """
+        deadline = monotonic() + self.config.queue_timeout
+        held: List[Gate] = []
+        try:
+            for name in sorted(names):
+                gate = self.gate(name)
+                gate.acquire(deadline)
+                held.append(gate)
+            yield
+        finally:
+            for gate in held:
+                gate.release()
+
+    def admit(self, client: str, target: str) -> None:
+        """Charge one request by ``client`` to its token bucket."""
+        if self.limiter is None:
+            return
+        wait = self.limiter.take(client)
+        if wait > 0:
+            ADMISSION_SHED.inc(reason="rate_limited", target=target)
+            raise Overloaded("Rate limit exceeded", wait, status=429)
+
+
+def build_admission(settings: Settings) -> Optional[AdmissionController]:
+    config = settings.admission
+    if not config.enabled:
+        return None
+    limiter = None
+    if config.rate > 0:
+        if config.store == "redis" and settings.redis.url:
+            limiter = RedisRateLimiter(settings.redis.url, settings.redis.channel, config.rate, config.burst)
+        else:
+            if config.store == "redis":
+                logger.warning("ADMISSION_RATE_STORE=redis needs REDIS_URL; keeping rate limits in memory")
+            limiter = MemoryRateLimiter(config.rate, config.burst)
+    return AdmissionController(config, retry_after=settings.probe.report_deadline, limiter=limiter)
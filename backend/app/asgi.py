@@ -0,0 +1,240 @@
+"""ASGI serving mode: python-socketio's ``AsyncServer`` on asyncio.
+
+Run with ``SERVER_MODE=asgi python main.py`` or directly with
+``SERVER_MODE=asgi uvicorn --factory app.asgi:create_asgi_app``. The REST API
+is the same Flask app as in eventlet mode, served from a thread pool; health
+probes run on the event loop through async drivers and nothing is
+monkey-patched.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set
+
+import socketio
+
+from . import create_flask_app
+from .async_database import AsyncDatabaseRegistry
+from .cluster import build_coordinator
+from .config import Settings
+from .health import HealthCache, HealthSampler
+from .jobs import JobQueue, build_backend
+from .message_queue import MessageQueueUpgrade
+from .metrics import SOCKET_CLIENTS, SOCKET_EMITS
+from .monitor import HubMonitor
+from .rooms import HEALTH_ROOM, JOBS_UPDATE_ROOM, Broadcaster
+from .ws import INVALID_JOB_ROOM, _requested_job_room, _requested_rooms, broadcast_health, health_message
+
+
+class LoopEmitter:
+    """Synchronous ``emit`` over an ``AsyncServer``.
+
+    ``Broadcaster``, REST handlers and job worker threads call ``emit`` the
+    same way they do with Flask-SocketIO; the coroutine is scheduled on the
+    server's event loop from whichever thread the call comes from.
+    """
+
+    def __init__(self, server: socketio.AsyncServer):
+        self.server = server
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def emit(self, event: str, data: Any, to: Any = None, skip_sid: Optional[str] = None) -> None:
+        if self.loop is None:
+            raise RuntimeError("LoopEmitter used before the ASGI app started")
+        coro = self.server.emit(event, data, to=to, skip_sid=skip_sid)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            task = self.loop.create_task(coro)
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+
+def register_async_handlers(
+    sio: socketio.AsyncServer,
+    health: HealthCache,
+    broadcaster: Broadcaster,
+    settings: Settings,
+) -> None:
+    """The ``register_socketio_handlers`` contract for ``AsyncServer``."""
+    directory = broadcaster.directory
+
+    async def _emit(event: str, payload: Any, sid: str) -> None:
+        SOCKET_EMITS.inc(event=event)
+        await sio.emit(event, payload, to=sid)
+
+    async def _push_snapshot(sid: str, connector: Optional[str] = None) -> None:
+        seq, report = health.snapshot(names=None if connector is None else [connector])
+        await _emit("health:update", health_message(seq, report), sid)
+
+    async def _join(sid: str, room: str) -> None:
+        if not directory.join(sid, room):
+            return
+        await sio.enter_room(sid, room)
+        if room == HEALTH_ROOM:
+            await _push_snapshot(sid)
+        elif room.startswith("connector:"):
+            await _push_snapshot(sid, room.partition(":")[2])
+
+    async def _leave(sid: str, room: str) -> None:
+        await sio.leave_room(sid, room)
+        directory.leave(sid, room)
+
+    @sio.on("connect")
+    async def handle_connect(sid, environ, auth=None):  # pragma: no cover - exercised via runtime
+        SOCKET_CLIENTS.inc()
+        await _emit(
+            "system",
+            {
+                "message": "Connected to auto-deployment lab",
+                "service": settings.app.name,
+                "version": settings.app.version,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            },
+            sid,
+        )
+
+    @sio.on("disconnect")
+    async def handle_disconnect(sid, *args):  # pragma: no cover - exercised via runtime
+        SOCKET_CLIENTS.dec()
+        directory.drop(sid)
+
+    @sio.on("subscribe")
+    async def subscribe(sid, data=None):  # pragma: no cover - exercised via runtime
+        for room in _requested_rooms(data, health.registry.names()):
+            await _join(sid, room)
+        return {"rooms": directory.rooms_of(sid)}
+
+    @sio.on("unsubscribe")
+    async def unsubscribe(sid, data=None):  # pragma: no cover - exercised via runtime
+        for room in _requested_rooms(data, health.registry.names()):
+            await _leave(sid, room)
+        return {"rooms": directory.rooms_of(sid)}
+
+    @sio.on("health:request")
+    async def push_health(sid, *args):  # pragma: no cover - exercised via runtime
+        await _push_snapshot(sid)
+
+    @sio.on("health:resync")
+    async def resync_health(sid, *args):  # pragma: no cover - exercised via runtime
+        await _push_snapshot(sid)
+
+    @sio.on("jobs:subscribe")
+    async def subscribe_job(sid, data=None):  # pragma: no cover - exercised via runtime
+        room = _requested_job_room(data)
+        if room is None:
+            return INVALID_JOB_ROOM
+        await _join(sid, room)
+        return {"rooms": directory.rooms_of(sid)}
+
+    @sio.on("jobs:unsubscribe")
+    async def unsubscribe_job(sid, data=None):  # pragma: no cover - exercised via runtime
+        room = _requested_job_room(data)
+        if room is None:
+            return INVALID_JOB_ROOM
+        await _leave(sid, room)
+        return {"rooms": directory.rooms_of(sid)}
+
+    @sio.on("jobs:simulate")
+    async def simulate_job(sid, data=None):  # pragma: no cover - exercised via runtime
+        data = data or {}
+        update = {
+            "stage": data.get("stage", "deploy"),
+            "status": data.get("status", "running"),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+        await _emit("jobs:update", update, sid)
+        broadcaster.emit("jobs:update", update, JOBS_UPDATE_ROOM, skip_sid=sid)
+
+
+def _spawn_thread(target: Any) -> None:
+    threading.Thread(target=target, daemon=True).start()
+
+
+def create_asgi_app(settings: Optional[Settings] = None) -> socketio.ASGIApp:
+    """Application factory for the ASGI server."""
+    from a2wsgi import WSGIMiddleware
+
+    settings = settings or Settings.from_env()
+
+    registry = AsyncDatabaseRegistry(settings)
+    flask_app = create_flask_app(settings, registry)
+    health: HealthCache = flask_app.config["health_cache"]
+    event_log = flask_app.config["event_log"]
+    # Request handlers run in worker threads and cannot await the loop's
+    # probes, so they always read what the sampler published.
+    health.passive = True
+
+    sio = socketio.AsyncServer(
+        async_mode="asgi",
+        cors_allowed_origins="*",
+        json=flask_app.config["serializer"],
+    )
+
+    emitter = LoopEmitter(sio)
+    broadcaster = Broadcaster(emitter)
+    flask_app.config["broadcaster"] = broadcaster
+    upgrade = MessageQueueUpgrade(settings.redis.url, broadcaster) if settings.redis.url else None
+    flask_app.config["message_queue"] = upgrade
+
+    jobs_backend = build_backend(settings.jobs, settings.redis.url, settings.redis.channel)
+    jobs = JobQueue(settings.jobs, jobs_backend, broadcaster.emit_many, events=event_log)
+    flask_app.config["job_queue"] = jobs
+    register_async_handlers(sio, health, broadcaster, settings)
+
+    sampler = HealthSampler(registry, health, settings.probe)
+    flask_app.config["health_sampler"] = sampler
+    coordinator = build_coordinator(settings, sampler)
+    flask_app.config["health_coordinator"] = coordinator
+    monitor = HubMonitor(settings.monitor) if settings.monitor.enabled else None
+    flask_app.config["hub_monitor"] = monitor
+
+    async def _push_health() -> None:  # pragma: no cover - exercised via runtime
+        last_sent: Dict[str, int] = {}
+        while True:
+            await asyncio.sleep(settings.app.broadcast_interval)
+            # With a message queue the leader's patches already reach every
+            # worker's clients.
+            if coordinator is None or not broadcaster.shared or coordinator.is_leader:
+                broadcast_health(health, broadcaster, last_sent)
+
+    async def on_startup() -> None:
+        emitter.loop = asyncio.get_running_loop()
+        sio.start_background_task(coordinator.run_async if coordinator else sampler.run_async)
+        if settings.app.enable_background_tasks:
+            if upgrade is not None:
+                sio.start_background_task(
+                    upgrade.run_async, sio, lambda: socketio.AsyncRedisManager(settings.redis.url)
+                )
+            if monitor is not None:
+                sio.start_background_task(monitor.run_async)
+            sio.start_background_task(_push_health)
+            jobs.start(_spawn_thread, time.sleep)
+            if event_log is not None:
+                event_log.start(_spawn_thread)
+
+    async def on_shutdown() -> None:
+        if coordinator is not None:
+            coordinator.stop()
+        sampler.stop()
+        jobs.stop()
+        if monitor is not None:
+            monitor.stop()
+        if event_log is not None:
+            await asyncio.get_running_loop().run_in_executor(None, event_log.stop)
+        await registry.close()
+
+    return socketio.ASGIApp(
+        sio,
+        other_asgi_app=WSGIMiddleware(flask_app),
+        on_startup=on_startup,
+        on_shutdown=on_shutdown,
+    )
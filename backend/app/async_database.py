@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Type
+
+from .config import Settings
+from .database import (
+    DEEP_STATS_FIELDS,
+    DEEP_STATS_SQL,
+    BaseConnector,
+    MongoConnector,
+    PostgresConnector,
+    RedisConnector,
+    _elapsed_ms,
+    build_connectors,
+)
+from .history import LatencyHistory
+
+
+class AsyncConnector(BaseConnector):
+    """Async-native counterpart of ``BaseConnector`` for the ASGI server.
+
+    The pool is created on the event loop the first time it is needed and
+    each check is bounded by ``timeout``. Breaker, history and metrics
+    handling is shared with the synchronous connectors.
+    """
+
+    # Created on first use so it binds to the loop that runs the checks.
+    _apool_lock: Optional[asyncio.Lock] = None
+
+    async def _create_pool(self) -> Any:  # type: ignore[override]
+        raise NotImplementedError
+
+    async def _close_pool(self, pool: Any) -> None:  # type: ignore[override]
+        raise NotImplementedError
+
+    async def ping(self) -> Dict[str, Any]:  # type: ignore[override]
+        raise NotImplementedError
+
+    async def pool(self) -> Any:  # type: ignore[override]
+        if self._pool is None:
+            if self._apool_lock is None:
+                self._apool_lock = asyncio.Lock()
+            async with self._apool_lock:
+                if self._pool is None:
+                    self._pool = await self._create_pool()
+        return self._pool
+
+    async def recycle(self) -> None:  # type: ignore[override]
+        pool, self._pool = self._pool, None
+        if pool is None:
+            return
+        try:
+            await self._close_pool(pool)
+        except Exception:  # pragma: no cover - best effort cleanup
+            pass
+
+    async def close(self) -> None:  # type: ignore[override]
+        await self.recycle()
+
+    async def status(self) -> Dict[str, Any]:  # type: ignore[override]
+        timestamp = datetime.now(timezone.utc).isoformat()
+        entry = self._precheck(timestamp)
+        if entry is not None:
+            return entry
+        try:
+            measurements = await asyncio.wait_for(self.ping(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            await self.recycle()
+            return self._failed(TimeoutError(f"Check timed out after {self.timeout:g}s"), timestamp)
+        except Exception as exc:
+            await self.recycle()
+            return self._failed(exc, timestamp)
+        return self._succeeded(measurements, timestamp)
+
+
+class AsyncMongoConnector(AsyncConnector, MongoConnector):
+    async def _create_pool(self) -> Any:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        timeout_ms = int(self.timeout * 1000)
+        client = AsyncIOMotorClient(
+            host=self.config.host,
+            port=self.config.port,
+            username=self.config.user,
+            password=self.config.password,
+            maxPoolSize=self.pool_size,
+            minPoolSize=0,
+            serverSelectionTimeoutMS=timeout_ms,
+            connectTimeoutMS=timeout_ms,
+            socketTimeoutMS=timeout_ms,
+        )
+        try:
+            await client.admin.command("ping")
+        except Exception:
+            client.close()
+            raise
+        return client
+
+    async def _close_pool(self, pool: Any) -> None:
+        pool.close()
+
+    async def ping(self) -> Dict[str, Any]:
+        start = perf_counter()
+        client = await self.pool()
+        connect = _elapsed_ms(start)
+        start = perf_counter()
+        await client.admin.command("ping")
+        latency = _elapsed_ms(start)
+        if self._stats_due():
+            await self._collect_stats_async(client)
+        return {
+            "latency_ms": latency,
+            "connect_ms": connect,
+            "database": self.config.database,
+            "collection": self.config.collection,
+            **self._stats_entry(),
+        }
+
+    async def _collect_stats_async(self, client: Any) -> None:
+        from pymongo.errors import OperationFailure
+
+        start = perf_counter()
+        try:
+            server = await client.admin.command("serverStatus", metrics=0, locks=0)
+            try:
+                replica_set = await client.admin.command("replSetGetStatus")
+            except OperationFailure:
+                replica_set = None
+            collection = None
+            if self.config.database:
+                try:
+                    collection = await client[self.config.database].command("collStats", self.config.collection)
+                except OperationFailure:
+                    collection = None
+        except Exception as exc:
+            self._record_stats(None, _elapsed_ms(start), exc)
+            return
+        self._record_stats(self._parse_stats(server, replica_set, collection), _elapsed_ms(start))
+
+
+class AsyncRedisConnector(AsyncConnector, RedisConnector):
+    async def _create_pool(self) -> Any:
+        from redis import asyncio as aioredis
+
+        pool = aioredis.BlockingConnectionPool.from_url(
+            self.config.url,
+            max_connections=self.pool_size,
+            timeout=self.timeout,
+            socket_timeout=self.timeout,
+            socket_connect_timeout=self.timeout,
+        )
+        return aioredis.Redis(connection_pool=pool)
+
+    async def _close_pool(self, pool: Any) -> None:
+        await pool.connection_pool.disconnect()
+
+    async def ping(self) -> Dict[str, Any]:
+        start = perf_counter()
+        client = await self.pool()
+        connection_pool = client.connection_pool
+        await connection_pool.release(await connection_pool.get_connection("PING"))
+        connect = _elapsed_ms(start)
+        sections = self._pipeline_sections()
+        pipe = client.pipeline(transaction=False)
+        pipe.ping()
+        for section in sections:
+            pipe.info(section)
+        start = perf_counter()
+        replies = await pipe.execute(raise_on_error=False)
+        latency = _elapsed_ms(start)
+        return {
+            "latency_ms": latency,
+            "connect_ms": connect,
+            **self._parse_replies(sections, replies, latency),
+            "channel": self.config.channel,
+            **self._stats_entry(),
+        }
+
+
+def asyncpg_params(dsn: str) -> Dict[str, Any]:
+    """asyncpg only understands URL DSNs; convert a libpq ``key=value`` DSN
+    to connect keyword arguments."""
+    if "://" in dsn:
+        return {"dsn": dsn}
+    from psycopg2.extensions import parse_dsn
+
+    params = parse_dsn(dsn)
+    mapping = {"dbname": "database", "host": "host", "port": "port", "user": "user", "password": "password"}
+    return {mapping[key]: value for key, value in params.items() if key in mapping}
+
+
+class AsyncPostgresConnector(AsyncConnector, PostgresConnector):
+    async def _create_pool(self) -> Any:
+        import asyncpg
+
+        dsn = self.config.dsn or self.config.build_dsn()
+        if not dsn:
+            raise RuntimeError("PostgreSQL DSN missing")
+        return await asyncpg.create_pool(
+            min_size=1,
+            max_size=max(self.pool_size, 1),
+            timeout=self.timeout,
+            command_timeout=self.timeout,
+            **asyncpg_params(dsn),
+        )
+
+    async def _close_pool(self, pool: Any) -> None:
+        pool.terminate()
+
+    async def ping(self) -> Dict[str, Any]:
+        start = perf_counter()
+        pool = await self.pool()
+        async with pool.acquire() as conn:
+            connect = _elapsed_ms(start)
+            start = perf_counter()
+            await conn.fetchval("SELECT 1")
+            latency = _elapsed_ms(start)
+            if self._stats_due():
+                # asyncpg prepares the statement once per connection through
+                # its statement cache.
+                start = perf_counter()
+                try:
+                    row = await conn.fetchrow(DEEP_STATS_SQL, self.config.long_transaction_seconds)
+                except Exception as exc:
+                    self._record_stats(None, _elapsed_ms(start), exc)
+                else:
+                    self._record_stats(dict(zip(DEEP_STATS_FIELDS, row)), _elapsed_ms(start))
+        return {
+            "latency_ms": latency,
+            "connect_ms": connect,
+            "database": self.config.database,
+            "host": self.config.host,
+            **self._stats_entry(),
+        }
+
+
+ASYNC_CONNECTORS: Dict[str, Type[BaseConnector]] = {
+    MongoConnector.name: AsyncMongoConnector,
+    RedisConnector.name: AsyncRedisConnector,
+    PostgresConnector.name: AsyncPostgresConnector,
+}
+
+
+class AsyncDatabaseRegistry:
+    """Event-loop registry used by the ASGI server.
+
+    ``submit`` returns an ``asyncio.Task`` (which, like the thread pool
+    ``Future`` of ``DatabaseRegistry``, supports ``done``, ``result`` and
+    ``add_done_callback``), so ``HealthSampler`` drives both registries the
+    same way. Connector types without async support, such as synchronous
+    plugins, are run in the default executor.
+    """
+
+    def __init__(self, settings: Settings):
+        self._connectors: Dict[str, BaseConnector] = build_connectors(settings, ASYNC_CONNECTORS)
+        self.report_deadline = settings.probe.report_deadline
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def _connector(self, name: str) -> BaseConnector:
+        connector = self._connectors.get(name)
+        if not connector:
+            raise KeyError(f"Unknown database connector '{name}'")
+        return connector
+
+    def _check(self, connector: BaseConnector) -> Any:
+        if isinstance(connector, AsyncConnector):
+            return connector.status()
+        return asyncio.get_running_loop().run_in_executor(None, connector.status)
+
+    def submit(self, name: str) -> asyncio.Task:
+        """Start a check for ``name`` or return the one already in flight.
+
+        Must be called from the event loop thread.
+        """
+        task = self._inflight.get(name)
+        if task is None or task.done():
+            task = asyncio.ensure_future(self._check(self._connectors[name]))
+            self._inflight[name] = task
+        return task
+
+    def names(self) -> List[str]:
+        return list(self._connectors)
+
+    def history_for(self, name: str) -> LatencyHistory:
+        return self._connector(name).history
+
+    async def close(self) -> None:
+        for connector in self._connectors.values():
+            result = connector.close()
+            if asyncio.iscoroutine(result):
+                await result
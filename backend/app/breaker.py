@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+from time import monotonic
+from typing import Any, Callable, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Per-connector circuit breaker.
+
+    ``threshold`` consecutive failures open the circuit. While it is open,
+    ``allow()`` refuses calls so the connector can answer with the last error
+    without touching the network. After ``reset`` seconds (doubled on every
+    consecutive trip, capped at ``max_reset`` and spread by ``jitter``) one
+    trial call is let through in the half-open state: success closes the
+    circuit, failure opens it again for longer.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 3,
+        reset: float = 5.0,
+        max_reset: float = 300.0,
+        jitter: float = 0.1,
+        clock: Callable[[], float] = monotonic,
+    ):
+        self.threshold = max(threshold, 1)
+        self.reset = reset
+        self.max_reset = max_reset
+        self.jitter = jitter
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.last_error: Optional[str] = None
+        self._streak = 0
+        self._retry_at = 0.0
+        self._retry_wall: Optional[str] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.clock() >= self._retry_at:
+                self.state = HALF_OPEN
+                self._trial = False
+            if self.state == HALF_OPEN and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.last_error = None
+            self._streak = 0
+            self._retry_wall = None
+            self._trial = False
+
+    def record_failure(self, error: str) -> bool:
+        """Count a failed call; return True when it opened the circuit."""
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            if self.state == CLOSED and self.failures < self.threshold:
+                return False
+            delay = min(self.reset * (2 ** self._streak), self.max_reset)
+            delay = max(delay + random.uniform(-delay * self.jitter, delay * self.jitter), 0.0)
+            self.state = OPEN
+            self.trips += 1
+            self._streak += 1
+            self._trial = False
+            self._retry_at = self.clock() + delay
+            self._retry_wall = (datetime.now(timezone.utc) + timedelta(seconds=delay)).isoformat()
+            return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "retry_at": self._retry_wall if self.state != CLOSED else None,
+        }
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+from time import monotonic, time
+from typing import Any, Callable, Dict, Optional
+from uuid import uuid4
+
+from .config import Settings
+from .health import HealthCache, HealthSampler
+from .metrics import SAMPLER_LEADER
+
+logger = logging.getLogger(__name__)
+
+# Renew only while we still own the key, so a process that stalled past the
+# TTL cannot extend (or delete) a lock another process has since taken.
+_RENEW_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('pexpire', KEYS[1], ARGV[2]) end return 0"
+_RELEASE_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+
+class RedisLeaderLock:
+    """Leader lease stored in one Redis key with a TTL.
+
+    ``acquire`` takes the key if it is free or renews it if this process
+    already holds it; a leader that stops renewing loses the lease after
+    ``ttl`` seconds and another process takes over.
+    """
+
+    def __init__(self, url: str, key: str, ttl: float):
+        import redis
+
+        self._client = redis.from_url(url, socket_timeout=max(ttl / 3, 1.0))
+        self._errors = redis.RedisError
+        self.key = key
+        self.ttl_ms = int(ttl * 1000)
+        self.token = uuid4().hex
+        self._held = False
+
+    def acquire(self) -> bool:
+        try:
+            if self._held and self._client.eval(_RENEW_SCRIPT, 1, self.key, self.token, self.ttl_ms):
+                return True
+            self._held = bool(self._client.set(self.key, self.token, nx=True, px=self.ttl_ms))
+        except self._errors as exc:
+            # Without Redis we cannot prove we still hold the lease.
+            logger.warning("Leader lock %s unavailable: %s", self.key, exc)
+            self._held = False
+        return self._held
+
+    def release(self) -> None:
+        if self._held:
+            try:
+                self._client.eval(_RELEASE_SCRIPT, 1, self.key, self.token)
+            except self._errors:  # pragma: no cover - best effort cleanup
+                pass
+        self._held = False
+
+
+class FileLeaderLock:
+    """Leader lock for several workers on one host: an exclusive ``flock`` on
+    ``path``. The kernel drops it when the holding process exits."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> bool:
+        import fcntl
+
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        import fcntl
+
+        if self._fd is None:
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+
+class RedisHealthStore:
+    """Shared health snapshots in one Redis hash, one field per connector."""
+
+    def __init__(self, url: str, key: str):
+        import redis
+
+        self._client = redis.from_url(url, socket_timeout=5)
+        self.key = key
+
+    def write(self, records: Dict[str, Dict[str, Any]]) -> None:
+        self._client.hset(self.key, mapping={name: json.dumps(record) for name, record in records.items()})
+
+    def read(self) -> Dict[str, Dict[str, Any]]:
+        raw = self._client.hgetall(self.key)
+        return {
+            (name.decode() if isinstance(name, bytes) else name): json.loads(value)
+            for name, value in raw.items()
+        }
+
+
+class FileHealthStore:
+    """Shared health snapshots in a JSON file, replaced atomically on write."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._written: Dict[str, Dict[str, Any]] = {}
+        self._read_mtime: Optional[int] = None
+        self._read_cache: Dict[str, Dict[str, Any]] = {}
+
+    def write(self, records: Dict[str, Dict[str, Any]]) -> None:
+        self._written.update(records)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self._written))
+        os.replace(tmp, self.path)
+
+    def read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        if mtime != self._read_mtime:
+            self._read_cache = json.loads(self.path.read_text() or "{}")
+            self._read_mtime = mtime
+        return self._read_cache
+
+
+class HealthCoordinator:
+    """Runs the health sampler in exactly one process of a multi-worker deployment.
+
+    Every process calls ``step`` in a loop. The process holding the leader
+    lock ticks the sampler and writes each newly published snapshot to the
+    shared store; the others only copy snapshots from the store into their
+    passive cache, keeping the leader's ages and sequence numbers so
+    ``health:update`` patches stay consistent whichever worker a client is
+    connected to. When the leader dies its lease expires and another worker
+    takes over, numbering on from the highest version in the store so
+    followers that already hold the old leader's versions accept its changes.
+    """
+
+    def __init__(self, lock: Any, store: Any, sampler: HealthSampler, poll_interval: float = 1.0):
+        self.lock = lock
+        self.store = store
+        self.sampler = sampler
+        self.cache: HealthCache = sampler.cache
+        self.poll_interval = poll_interval
+        self.is_leader = False
+        self._exported: Dict[str, float] = {}
+        self._imported: Dict[str, float] = {}
+        self._seeded = False
+        self._running = False
+        SAMPLER_LEADER.set(0)
+
+    def _export(self) -> None:
+        now_wall, now = time(), monotonic()
+        changed = {}
+        exported = {}
+        for name, record in self.cache.export().items():
+            if self._exported.get(name) == record["taken_at"]:
+                continue
+            exported[name] = record["taken_at"]
+            changed[name] = {
+                "entry": record["entry"],
+                "published_at": now_wall - (now - record["taken_at"]),
+                "expires_in": record["expires_in"],
+                "version": record["version"],
+            }
+        if changed:
+            self.store.write(changed)
+            self._exported.update(exported)
+
+    def _import(self) -> None:
+        known = set(self.cache.registry.names())
+        now_wall = time()
+        for name, record in self.store.read().items():
+            if name not in known or self._imported.get(name) == record["published_at"]:
+                continue
+            self._imported[name] = record["published_at"]
+            self.cache.publish(
+                name,
+                record["entry"],
+                expires_in=record["expires_in"],
+                age=max(now_wall - record["published_at"], 0.0),
+                version=record["version"],
+            )
+
+    def _seed(self) -> None:
+        versions = [record.get("version", 0) for record in self.store.read().values()]
+        self.cache.advance(max(versions, default=0))
+        self._seeded = True
+
+    def step(self) -> float:
+        """Acquire or renew leadership, then sample or mirror; return the
+        delay until the next step."""
+        leader = self.lock.acquire()
+        if leader != self.is_leader:
+            logger.info("Health sampler leadership %s (pid %s)", "acquired" if leader else "lost", os.getpid())
+            self.is_leader = leader
+            SAMPLER_LEADER.set(1 if leader else 0)
+            self._exported.clear()
+            self._imported.clear()
+            self._seeded = False
+        try:
+            if leader:
+                if not self._seeded:
+                    self._seed()
+                delay = self.sampler.tick()
+                self._export()
+                return min(delay, self.poll_interval)
+            self._import()
+        except Exception as exc:  # pragma: no cover - shared store outage
+            logger.warning("Shared health state unavailable: %s", exc)
+        return self.poll_interval
+
+    def start(self, spawn: Callable[..., Any], sleep: Callable[[float], Any]) -> None:
+        if self._running:
+            return
+        self._running = True
+        self.cache.passive = True
+
+        def _loop():  # pragma: no cover - exercised via runtime
+            while self._running:
+                sleep(max(self.step(), 0.05))
+
+        spawn(_loop)
+
+    async def run_async(self) -> None:
+        """``start`` for the ASGI server; the sampler ticks on the event loop."""
+        self._running = True
+        self.cache.passive = True
+        while self._running:
+            await asyncio.sleep(max(self.step(), 0.05))
+
+    def stop(self) -> None:
+        self._running = False
+        self.lock.release()
+        self.is_leader = False
+        SAMPLER_LEADER.set(0)
+
+
+def build_coordinator(settings: Settings, sampler: HealthSampler) -> Optional[HealthCoordinator]:
+    """Return a coordinator for ``LEADER_ELECTION``, or None for single-process mode."""
+    cluster = settings.cluster
+    election = cluster.election
+    if election in ("", "none"):
+        return None
+    if election == "auto":
+        election = "redis" if settings.redis.url else "file"
+    if election == "redis":
+        if not settings.redis.url:
+            raise ValueError("LEADER_ELECTION=redis requires REDIS_URL")
+        prefix = settings.redis.channel
+        lock: Any = RedisLeaderLock(settings.redis.url, f"{prefix}:health:leader", cluster.lock_ttl)
+        store: Any = RedisHealthStore(settings.redis.url, f"{prefix}:health:snapshots")
+    elif election == "file":
+        lock = FileLeaderLock(cluster.lock_file)
+        store = FileHealthStore(cluster.state_file)
+    else:
+        raise ValueError(f"Unknown LEADER_ELECTION '{cluster.election}' (none, auto, redis, file)")
+    return HealthCoordinator(lock, store, sampler, poll_interval=cluster.poll_interval)
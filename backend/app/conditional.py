@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from time import monotonic
+from typing import Any, Callable
+
+from flask import Response, request
+
+
+def content_etag(content: Any) -> str:
+    """Strong ETag for ``content``: a digest of its canonical JSON form, so
+    replicas serving the same content agree on the tag."""
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+@dataclass
+class Representation:
+    etag: str
+    body: bytes
+    last_modified: datetime
+    rendered_at: float
+
+    def age(self) -> int:
+        return int(monotonic() - self.rendered_at)
+
+
+class RepresentationCache:
+    """The latest rendered body of each route, reused while its content is
+    unchanged.
+
+    ``content`` identifies a response: the response data itself, or a
+    version key when the data carries measurements that change without the
+    resource changing. While it hashes to the same ETag, the body rendered
+    the first time is served byte for byte, which keeps the ETag strong and
+    skips re-serializing.
+    ``Last-Modified`` has one-second resolution, so it is bumped by a second
+    when the content changes again within the same second; otherwise an
+    ``If-Modified-Since`` client could miss the change. Routes that vary with
+    the query string are kept for the ``max_routes`` most recently rendered.
+    """
+
+    def __init__(self, max_routes: int = 256):
+        self.max_routes = max_routes
+        self._latest: "OrderedDict[str, Representation]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, route: str, content: Any, render: Callable[[], bytes]) -> Representation:
+        etag = content_etag(content)
+        current = self._latest.get(route)
+        if current is not None and current.etag == etag:
+            return current
+        body = render()
+        modified = datetime.now(timezone.utc).replace(microsecond=0)
+        with self._lock:
+            previous = self._latest.get(route)
+            if previous is not None and previous.etag == etag:
+                return previous
+            if previous is not None and modified <= previous.last_modified:
+                modified = previous.last_modified + timedelta(seconds=1)
+            representation = Representation(etag, body, modified, monotonic())
+            self._latest[route] = representation
+            self._latest.move_to_end(route)
+            if len(self._latest) > self.max_routes:
+                self._latest.popitem(last=False)
+        return representation
+
+
+def conditional_response(representation: Representation, cache_control: str) -> Response:
+    """JSON response for ``representation``, or an empty 304 when the
+    request's ``If-None-Match`` (or, without one, ``If-Modified-Since``)
+    shows the client already has it."""
+    response = Response(representation.body, mimetype="application/json")
+    response.set_etag(representation.etag)
+    response.last_modified = representation.last_modified
+    response.headers["Cache-Control"] = cache_control
+    response.headers["Age"] = str(representation.age())
+    return response.make_conditional(request)
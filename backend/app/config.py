@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import json
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from pathlib import Path
 from urllib.parse import quote
 
@@ -13,6 +14,18 @@ def _to_bool(value: Optional[str], default: bool) -> bool:
     return value.strip().lower() in {"1", "true", "yes", "on"}
 
 
+def _option_secret(options: Dict[str, Any], key: str) -> Optional[str]:
+    """Read ``key`` from connector options, falling back to ``<key>_file``."""
+    value = options.get(key)
+    path = options.get(f"{key}_file")
+    if not value and path:
+        try:
+            value = Path(path).read_text().strip()
+        except FileNotFoundError:
+            value = None
+    return value
+
+
 @dataclass
 class AppSection:
     name: str
@@ -22,6 +35,10 @@ class AppSection:
     debug: bool
     broadcast_interval: float
     enable_background_tasks: bool
+    server_mode: str = "eventlet"
+    serializer: str = "auto"
+    echo_max_bytes: int = 64 * 1024 * 1024
+    echo_chunk_bytes: int = 64 * 1024
 
     @classmethod
     def from_env(cls) -> "AppSection":
@@ -34,6 +51,10 @@ class AppSection:
             debug=_to_bool(env.get("FLASK_DEBUG"), False),
             broadcast_interval=float(env.get("BROADCAST_INTERVAL_SECONDS", "15")),
             enable_background_tasks=_to_bool(env.get("ENABLE_BACKGROUND_TASKS"), True),
+            server_mode=env.get("SERVER_MODE", "eventlet").strip().lower(),
+            serializer=env.get("JSON_SERIALIZER", "auto").strip().lower(),
+            echo_max_bytes=int(env.get("ECHO_MAX_BYTES", str(64 * 1024 * 1024))),
+            echo_chunk_bytes=int(env.get("ECHO_CHUNK_BYTES", str(64 * 1024))),
         )
 
 
@@ -45,6 +66,8 @@ class MongoSection:
     password: Optional[str]
     database: Optional[str]
     collection: str
+    deep_probe: bool = False
+    deep_interval: float = 60.0
 
     @classmethod
     def from_env(cls) -> "MongoSection":
@@ -63,13 +86,38 @@ class MongoSection:
                 pwd = None
         database = env.get("MONGO_DB")
         collection = env.get("MONGO_COLLECTION", "deploy_events")
-        return cls(host=host, port=port, user=user, password=pwd, database=database, collection=collection)
+        return cls(
+            host=host,
+            port=port,
+            user=user,
+            password=pwd,
+            database=database,
+            collection=collection,
+            deep_probe=_to_bool(env.get("MONGO_DEEP_PROBE"), False),
+            deep_interval=float(env.get("MONGO_DEEP_PROBE_INTERVAL_SECONDS", "60")),
+        )
+
+    @classmethod
+    def from_options(cls, options: Dict[str, Any]) -> "MongoSection":
+        port = options.get("port")
+        return cls(
+            host=options.get("host"),
+            port=int(port) if port else None,
+            user=options.get("user"),
+            password=_option_secret(options, "password"),
+            database=options.get("database"),
+            collection=options.get("collection", "deploy_events"),
+            deep_probe=_to_bool(str(options.get("deep_probe", "")) or None, False),
+            deep_interval=float(options.get("deep_interval", 60.0)),
+        )
 
 
 @dataclass
 class RedisSection:
     url: Optional[str]
     channel: str
+    deep_probe: bool = False
+    deep_interval: float = 15.0
 
     @classmethod
     def from_env(cls) -> "RedisSection":
@@ -91,7 +139,21 @@ class RedisSection:
                 else:
                     url = f"redis://{host}:{port}/0"
 
-        return cls(url=url, channel=env.get("REDIS_CHANNEL", "auto-deploy"))
+        return cls(
+            url=url,
+            channel=env.get("REDIS_CHANNEL", "auto-deploy"),
+            deep_probe=_to_bool(env.get("REDIS_DEEP_PROBE"), False),
+            deep_interval=float(env.get("REDIS_DEEP_PROBE_INTERVAL_SECONDS", "15")),
+        )
+
+    @classmethod
+    def from_options(cls, options: Dict[str, Any]) -> "RedisSection":
+        return cls(
+            url=_option_secret(options, "url"),
+            channel=options.get("channel", "auto-deploy"),
+            deep_probe=_to_bool(str(options.get("deep_probe", "")) or None, False),
+            deep_interval=float(options.get("deep_interval", 15.0)),
+        )
 
 
 @dataclass
@@ -102,6 +164,9 @@ class PostgresSection:
     user: Optional[str]
     password: Optional[str]
     database: Optional[str]
+    deep_probe: bool = False
+    deep_interval: float = 60.0
+    long_transaction_seconds: float = 300.0
 
     @classmethod
     def from_env(cls) -> "PostgresSection":
@@ -119,6 +184,24 @@ class PostgresSection:
                           if env.get("DB_PASSWORD_FILE") and Path(env.get("DB_PASSWORD_FILE")).exists()
                           else None)),
             database=env.get("POSTGRES_DB") or env.get("DB_NAME"),
+            deep_probe=_to_bool(env.get("POSTGRES_DEEP_PROBE"), False),
+            deep_interval=float(env.get("POSTGRES_DEEP_PROBE_INTERVAL_SECONDS", "60")),
+            long_transaction_seconds=float(env.get("POSTGRES_LONG_TRANSACTION_SECONDS", "300")),
+        )
+
+    @classmethod
+    def from_options(cls, options: Dict[str, Any]) -> "PostgresSection":
+        port = options.get("port")
+        return cls(
+            dsn=_option_secret(options, "dsn"),
+            host=options.get("host"),
+            port=int(port) if port else None,
+            user=options.get("user"),
+            password=_option_secret(options, "password"),
+            database=options.get("database"),
+            deep_probe=_to_bool(str(options.get("deep_probe", "")) or None, False),
+            deep_interval=float(options.get("deep_interval", 60.0)),
+            long_transaction_seconds=float(options.get("long_transaction_seconds", 300.0)),
         )
 
     def build_dsn(self) -> Optional[str]:
@@ -133,20 +216,298 @@ class PostgresSection:
         )
 
 
+def _parse_float_map(value: Optional[str]) -> Dict[str, float]:
+    """Parse ``"redis=2,postgres=10"`` into ``{"redis": 2.0, "postgres": 10.0}``."""
+    result: Dict[str, float] = {}
+    for item in (value or "").split(","):
+        key, sep, raw = item.partition("=")
+        if sep and key.strip():
+            result[key.strip()] = float(raw)
+    return result
+
+
+def _parse_float_list(value: Optional[str], default: List[float]) -> List[float]:
+    items = [item.strip() for item in (value or "").split(",") if item.strip()]
+    return [float(item) for item in items] if items else list(default)
+
+
+@dataclass
+class ProbeSection:
+    pool_size: int = 4
+    workers: int = 16
+    timeout: float = 5.0
+    parallel: bool = True
+    report_deadline: float = 6.0
+    cache_ttl: float = 5.0
+    stale_ttl: float = 30.0
+    connector_ttls: Dict[str, float] = field(default_factory=dict)
+    interval: float = 10.0
+    connector_intervals: Dict[str, float] = field(default_factory=dict)
+    jitter: float = 0.1
+    max_backoff: float = 120.0
+    history_samples: int = 512
+    history_slot_seconds: float = 60.0
+    history_slots: int = 60
+    history_windows: List[float] = field(default_factory=lambda: [60.0, 300.0, 3600.0])
+    breaker_threshold: int = 3
+    breaker_reset: float = 5.0
+    breaker_max_reset: float = 300.0
+
+    def ttl_for(self, name: str) -> float:
+        return self.connector_ttls.get(name, self.cache_ttl)
+
+    def interval_for(self, name: str) -> float:
+        return self.connector_intervals.get(name, self.interval)
+
+    @classmethod
+    def from_env(cls) -> "ProbeSection":
+        env = os.environ
+        return cls(
+            pool_size=int(env.get("PROBE_POOL_SIZE", "4")),
+            workers=int(env.get("PROBE_WORKERS", "16")),
+            timeout=float(env.get("PROBE_TIMEOUT_SECONDS", "5")),
+            parallel=_to_bool(env.get("PROBE_PARALLEL"), True),
+            report_deadline=float(env.get("PROBE_REPORT_DEADLINE_SECONDS", "6")),
+            cache_ttl=float(env.get("HEALTH_CACHE_TTL_SECONDS", "5")),
+            stale_ttl=float(env.get("HEALTH_STALE_SECONDS", "30")),
+            connector_ttls=_parse_float_map(env.get("HEALTH_CACHE_TTLS")),
+            interval=float(env.get("PROBE_INTERVAL_SECONDS", "10")),
+            connector_intervals=_parse_float_map(env.get("PROBE_INTERVALS")),
+            jitter=float(env.get("PROBE_JITTER", "0.1")),
+            max_backoff=float(env.get("PROBE_MAX_BACKOFF_SECONDS", "120")),
+            history_samples=int(env.get("HISTORY_SAMPLES", "512")),
+            history_slot_seconds=float(env.get("HISTORY_SLOT_SECONDS", "60")),
+            history_slots=int(env.get("HISTORY_SLOTS", "60")),
+            history_windows=_parse_float_list(env.get("HISTORY_WINDOWS_SECONDS"), [60.0, 300.0, 3600.0]),
+            breaker_threshold=int(env.get("BREAKER_FAILURE_THRESHOLD", "3")),
+            breaker_reset=float(env.get("BREAKER_RESET_SECONDS", "5")),
+            breaker_max_reset=float(env.get("BREAKER_MAX_RESET_SECONDS", "300")),
+        )
+
+
+@dataclass
+class ConnectorSpec:
+    """One named connector instance declared in ``CONNECTORS``/``CONNECTORS_FILE``.
+
+    ``type`` selects the connector class (built in or registered through the
+    ``auto_deploy_lab.connectors`` entry point group); ``options`` are passed
+    to that class. ``interval`` and ``ttl`` override the probe schedule and
+    cache TTL for this instance only.
+    """
+
+    name: str
+    type: str
+    options: Dict[str, Any] = field(default_factory=dict)
+    interval: Optional[float] = None
+    ttl: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConnectorSpec":
+        options = dict(data)
+        try:
+            name = str(options.pop("name"))
+            kind = str(options.pop("type"))
+        except KeyError as exc:
+            raise ValueError(f"Connector entry is missing '{exc.args[0]}': {data!r}") from None
+        interval = options.pop("interval", None)
+        ttl = options.pop("ttl", None)
+        return cls(
+            name=name,
+            type=kind,
+            options=options,
+            interval=float(interval) if interval is not None else None,
+            ttl=float(ttl) if ttl is not None else None,
+        )
+
+
+def load_connector_specs(env: Optional[Dict[str, str]] = None) -> List[ConnectorSpec]:
+    """Parse connector instances from ``CONNECTORS`` (inline JSON) or
+    ``CONNECTORS_FILE`` (path to a JSON file); both hold a list of objects."""
+    env = os.environ if env is None else env
+    raw = env.get("CONNECTORS")
+    path = env.get("CONNECTORS_FILE")
+    if not raw and path:
+        raw = Path(path).read_text()
+    if not raw or not raw.strip():
+        return []
+    entries = json.loads(raw)
+    if not isinstance(entries, list):
+        raise ValueError("CONNECTORS must be a JSON list of connector objects")
+    return [ConnectorSpec.from_dict(entry) for entry in entries]
+
+
+@dataclass
+class JobsSection:
+    backend: str = "memory"
+    workers: int = 2
+    queue_size: int = 100
+    retention: int = 500
+    step_seconds: float = 1.0
+
+    @classmethod
+    def from_env(cls) -> "JobsSection":
+        env = os.environ
+        return cls(
+            backend=env.get("JOB_BACKEND", "memory").strip().lower(),
+            workers=int(env.get("JOB_WORKERS", "2")),
+            queue_size=int(env.get("JOB_QUEUE_SIZE", "100")),
+            retention=int(env.get("JOB_RETENTION", "500")),
+            step_seconds=float(env.get("JOB_STEP_SECONDS", "1")),
+        )
+
+
+@dataclass
+class EventsSection:
+    """Persistent event log of health samples, job transitions and breaker
+    changes. ``backend`` is ``none``, ``memory``, ``mongo``, ``postgres`` or
+    ``auto`` (Mongo when it is configured, memory otherwise)."""
+
+    backend: str = "auto"
+    buffer_size: int = 10000
+    batch_size: int = 500
+    flush_interval: float = 2.0
+    retention: int = 10000
+    ttl: float = 0.0
+    table: str = "health_events"
+
+    @classmethod
+    def from_env(cls) -> "EventsSection":
+        env = os.environ
+        return cls(
+            backend=env.get("EVENT_LOG", "auto").strip().lower(),
+            buffer_size=int(env.get("EVENT_BUFFER_SIZE", "10000")),
+            batch_size=int(env.get("EVENT_BATCH_SIZE", "500")),
+            flush_interval=float(env.get("EVENT_FLUSH_SECONDS", "2")),
+            retention=int(env.get("EVENT_MEMORY_RETENTION", "10000")),
+            ttl=float(env.get("EVENT_TTL_SECONDS", "0")),
+            table=env.get("EVENT_TABLE", "health_events"),
+        )
+
+
+@dataclass
+class MonitorSection:
+    """Hub-lag monitor: a background task asks to wake every ``interval``
+    seconds and records how late it actually woke. A native watchdog thread
+    captures the stack of whatever holds the event loop more than
+    ``block_threshold`` seconds past a wake-up, and stalls are logged at most
+    once per ``log_interval``. The lag percentiles reported in health are
+    recomputed at most every ``summary_interval`` seconds."""
+
+    enabled: bool = True
+    interval: float = 0.25
+    window: int = 1200
+    block_threshold: float = 0.1
+    log_interval: float = 30.0
+    summary_interval: float = 15.0
+
+    @classmethod
+    def from_env(cls) -> "MonitorSection":
+        env = os.environ
+        return cls(
+            enabled=_to_bool(env.get("HUB_MONITOR"), True),
+            interval=float(env.get("HUB_LAG_INTERVAL_SECONDS", "0.25")),
+            window=int(env.get("HUB_LAG_WINDOW", "1200")),
+            block_threshold=float(env.get("HUB_BLOCK_THRESHOLD_SECONDS", "0.1")),
+            log_interval=float(env.get("HUB_BLOCK_LOG_SECONDS", "30")),
+            summary_interval=float(env.get("HUB_LAG_SUMMARY_SECONDS", "15")),
+        )
+
+
+@dataclass
+class AdmissionSection:
+    """Admission control for endpoints that can wait on live checks.
+
+    At most ``max_inflight`` requests per connector wait on its live check at
+    once; up to ``queue_size`` more queue for ``queue_timeout`` seconds and
+    the rest are shed with a 503. With ``rate`` above zero each client also
+    gets a token bucket (``rate`` per second, ``burst`` deep) kept in
+    ``store`` (``memory`` or ``redis``). Clients are told apart by
+    ``client_header`` when set (e.g. ``X-Forwarded-For`` behind a trusted
+    proxy), by remote address otherwise."""
+
+    enabled: bool = True
+    max_inflight: int = 32
+    queue_size: int = 64
+    queue_timeout: float = 0.5
+    rate: float = 0.0
+    burst: int = 20
+    store: str = "memory"
+    client_header: str = ""
+
+    @classmethod
+    def from_env(cls) -> "AdmissionSection":
+        env = os.environ
+        return cls(
+            enabled=_to_bool(env.get("ADMISSION_CONTROL"), True),
+            max_inflight=int(env.get("ADMISSION_MAX_INFLIGHT", "32")),
+            queue_size=int(env.get("ADMISSION_QUEUE_SIZE", "64")),
+            queue_timeout=float(env.get("ADMISSION_QUEUE_SECONDS", "0.5")),
+            rate=float(env.get("ADMISSION_RATE_PER_SECOND", "0")),
+            burst=int(env.get("ADMISSION_BURST", "20")),
+            store=env.get("ADMISSION_RATE_STORE", "memory").strip().lower(),
+            client_header=env.get("ADMISSION_CLIENT_HEADER", "").strip(),
+        )
+
+
+@dataclass
+class ClusterSection:
+    """Multi-process mode: ``election`` picks how workers agree on the one
+    process that samples health (``none`` disables it, ``auto`` uses Redis
+    when ``REDIS_URL`` is set and a lock file otherwise)."""
+
+    election: str = "none"
+    lock_ttl: float = 10.0
+    lock_file: str = "/tmp/auto-deploy-lab.leader"
+    state_file: str = "/tmp/auto-deploy-lab.health.json"
+    poll_interval: float = 1.0
+
+    @classmethod
+    def from_env(cls) -> "ClusterSection":
+        env = os.environ
+        return cls(
+            election=env.get("LEADER_ELECTION", "none").strip().lower(),
+            lock_ttl=float(env.get("LEADER_LOCK_TTL_SECONDS", "10")),
+            lock_file=env.get("LEADER_LOCK_FILE", "/tmp/auto-deploy-lab.leader"),
+            state_file=env.get("SHARED_HEALTH_FILE", "/tmp/auto-deploy-lab.health.json"),
+            poll_interval=float(env.get("SHARED_HEALTH_POLL_SECONDS", "1")),
+        )
+
+
 @dataclass
 class Settings:
     app: AppSection
     mongo: MongoSection
     redis: RedisSection
     postgres: PostgresSection
+    probe: ProbeSection = field(default_factory=ProbeSection)
+    jobs: JobsSection = field(default_factory=JobsSection)
+    connectors: List[ConnectorSpec] = field(default_factory=list)
+    cluster: ClusterSection = field(default_factory=ClusterSection)
+    events: EventsSection = field(default_factory=EventsSection)
+    monitor: MonitorSection = field(default_factory=MonitorSection)
+    admission: AdmissionSection = field(default_factory=AdmissionSection)
 
     @classmethod
     def from_env(cls) -> "Settings":
+        connectors = load_connector_specs()
+        probe = ProbeSection.from_env()
+        for spec in connectors:
+            if spec.interval is not None:
+                probe.connector_intervals.setdefault(spec.name, spec.interval)
+            if spec.ttl is not None:
+                probe.connector_ttls.setdefault(spec.name, spec.ttl)
         return cls(
             app=AppSection.from_env(),
             mongo=MongoSection.from_env(),
             redis=RedisSection.from_env(),
             postgres=PostgresSection.from_env(),
+            probe=probe,
+            jobs=JobsSection.from_env(),
+            connectors=connectors,
+            cluster=ClusterSection.from_env(),
+            events=EventsSection.from_env(),
+            monitor=MonitorSection.from_env(),
+            admission=AdmissionSection.from_env(),
         )
 
     @classmethod
@@ -171,6 +532,8 @@ class Settings:
                 password=None,
                 database=None,
             ),
+            probe=ProbeSection(pool_size=2, timeout=1.0, report_deadline=2.0),
+            jobs=JobsSection(queue_size=10, step_seconds=0.0),
         )
 
     def safe_export(self) -> Dict[str, Any]:
@@ -181,6 +544,7 @@ class Settings:
                 "host": self.app.host,
                 "port": self.app.port,
                 "broadcast_interval": self.app.broadcast_interval,
+                "server_mode": self.app.server_mode,
             },
             "mongo": {
                 "enabled": bool(self.mongo.host and self.mongo.port),
@@ -196,4 +560,7 @@ class Settings:
                 "host": self.postgres.host,
                 "database": self.postgres.database,
             },
+            "connectors": [{"name": spec.name, "type": spec.type} for spec in self.connectors],
+            "cluster": {"election": self.cluster.election},
+            "events": {"backend": self.events.backend},
         }
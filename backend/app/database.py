@@ -1,21 +1,134 @@
 from __future__ import annotations
 
+import atexit
+import logging
+import sys
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures import wait
 from datetime import datetime, timezone
-from time import perf_counter
-from typing import Any, Dict
-
-import psycopg2
-import redis
-from pymongo import MongoClient
+from importlib.metadata import entry_points
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type
 
+from .breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
 from .config import MongoSection, PostgresSection, RedisSection, Settings
+from .history import LatencyHistory
+from .metrics import BREAKER_STATE, BREAKER_TRIPS, CONNECTOR_STATS, PROBE_LATENCY, PROBE_OUTCOMES
+
+if TYPE_CHECKING:  # pragma: no cover
+    import redis
+    from psycopg2.pool import ThreadedConnectionPool
+    from pymongo import MongoClient
+
+# Driver modules (pymongo, redis, psycopg2) are imported by the connector
+# that needs them, when it first builds its pool, so an unconfigured store
+# costs nothing at import time or startup.
+
+logger = logging.getLogger(__name__)
+
+
+# Gauge values for ``health_breaker_state``.
+_BREAKER_LEVELS = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+def green_psycopg2() -> None:
+    """Make psycopg2 yield to the eventlet hub when running monkey-patched.
+
+    psycopg2 is a C extension, so monkey-patching alone leaves its socket
+    I/O blocking the whole hub. The app patches with ``psycopg=False``
+    because eventlet would otherwise import psycopg2 at startup; code that
+    opens PostgreSQL connections calls this first instead, which installs
+    ``_green_wait`` as psycopg2's wait callback.
+    """
+    if "eventlet" not in sys.modules:
+        return
+    from eventlet import patcher
+
+    if patcher.is_monkey_patched("socket"):
+        from psycopg2 import extensions
+
+        extensions.set_wait_callback(_green_wait)
+
+
+def _green_wait(conn: Any, timeout: Optional[float] = None) -> None:
+    """psycopg2 wait callback that parks the calling greenlet on the hub.
+
+    Unlike eventlet's own callback it gives up once the server has been
+    silent for the connection's ``connect_timeout``: libpq only enforces
+    that timeout on blocking connects, so a server that accepts the TCP
+    connection and never answers would otherwise hang the probe forever.
+    The connection is closed and ``OperationalError`` raised.
+    """
+    from eventlet.hubs import trampoline
+    from psycopg2 import OperationalError, extensions
+
+    limit = extensions.parse_dsn(conn.dsn).get("connect_timeout")
+    limit = float(limit) if limit else timeout
+    while True:
+        state = conn.poll()
+        if state == extensions.POLL_OK:
+            return
+        if state not in (extensions.POLL_READ, extensions.POLL_WRITE):
+            raise OperationalError(f"Bad result from poll: {state!r}")
+        read = state == extensions.POLL_READ
+        try:
+            trampoline(conn.fileno(), read=read, write=not read, timeout=limit, timeout_exc=TimeoutError)
+        except TimeoutError:
+            conn.close()
+            raise OperationalError(f"PostgreSQL did not respond within {limit:g}s") from None
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((perf_counter() - start) * 1000, 2)
 
 
 class BaseConnector:
+    """Health probe for one data store.
+
+    Each connector owns a long-lived client pool that is created lazily on the
+    first check, reused by every later check and dropped (``recycle``) when a
+    check fails so the next one reconnects from scratch. A circuit breaker
+    stops repeated checks against a store that keeps failing: while it is
+    open, ``status()`` returns the last error without a network call.
+    """
+
     name = "base"
 
-    def __init__(self, label: str):
+    # Deep probes collect server statistics alongside the liveness check, at
+    # most once per ``deep_interval``; connectors that support them set both
+    # from their config section.
+    deep_probe = False
+    deep_interval = 60.0
+
+    def __init__(
+        self,
+        label: str,
+        pool_size: int = 4,
+        timeout: float = 5.0,
+        history: Optional[LatencyHistory] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
         self.label = label
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.history = history or LatencyHistory()
+        self.breaker = breaker or CircuitBreaker()
+        self._pool: Any = None
+        self._pool_lock = threading.Lock()
+        self._stats: Optional[Dict[str, Any]] = None
+        self._stats_at: Optional[float] = None
+
+    @classmethod
+    def from_options(cls, name: str, options: Dict[str, Any], **common: Any) -> "BaseConnector":
+        """Build an instance named ``name`` from a ``CONNECTORS`` entry.
+
+        Plugin connectors get the raw options mapping as their first argument;
+        the built-in ones convert it to their config section first.
+        """
+        return cls(options, label=name, **common)
 
     def configured(self) -> bool:
         raise NotImplementedError
@@ -23,126 +136,712 @@ class BaseConnector:
     def ping(self) -> Dict[str, Any]:
         raise NotImplementedError
 
-    def status(self) -> Dict[str, Any]:
-        timestamp = datetime.now(timezone.utc).isoformat()
+    def _create_pool(self) -> Any:
+        raise NotImplementedError
+
+    def _close_pool(self, pool: Any) -> None:
+        raise NotImplementedError
+
+    def pool(self) -> Any:
+        """Return the shared client pool, creating it on first use."""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = self._create_pool()
+        return self._pool
+
+    def recycle(self) -> None:
+        """Discard the current pool; the next check builds a fresh one."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is None:
+            return
+        try:
+            self._close_pool(pool)
+        except Exception:  # pragma: no cover - best effort cleanup
+            pass
+
+    def close(self) -> None:
+        self.recycle()
+
+    def _stats_due(self) -> bool:
+        if not self.deep_probe:
+            return False
+        return self._stats_at is None or monotonic() - self._stats_at >= self.deep_interval
+
+    def _record_stats(
+        self,
+        stats: Optional[Dict[str, Any]],
+        elapsed_ms: float,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Keep the latest deep probe result. Failures are rate-limited too,
+        so a role without access to the statistics is not retried on every
+        check."""
+        self._stats_at = monotonic()
+        if error is not None:
+            logger.warning("Deep probe on %s failed: %s", self.label, error)
+            self._stats = {"error": str(error), "query_ms": elapsed_ms}
+            return
+        self._stats = {**(stats or {}), "query_ms": elapsed_ms}
+        for field, value in self._stats.items():
+            if isinstance(value, (int, float)):
+                CONNECTOR_STATS.set(float(value), connector=self.label, stat=field)
+
+    def _stats_entry(self) -> Dict[str, Any]:
+        if self._stats is None or self._stats_at is None:
+            return {}
+        return {"stats": {**self._stats, "age_s": round(monotonic() - self._stats_at, 3)}}
+
+    def _precheck(self, timestamp: str) -> Optional[Dict[str, Any]]:
+        """Return the entry for a check that must not touch the network
+        (unconfigured connector or open circuit), or None to go ahead."""
         if not self.configured():
+            PROBE_OUTCOMES.inc(connector=self.label, status="skipped")
             return {
                 "status": "skipped",
                 "message": "Configuration missing",
                 "checked_at": timestamp,
             }
-        try:
-            measurements = self.ping()
-            return {"status": "ok", "checked_at": timestamp, **measurements}
-        except Exception as exc:  # pragma: no cover - defensive log
+        if not self.breaker.allow():
+            PROBE_OUTCOMES.inc(connector=self.label, status="open")
             return {
                 "status": "error",
                 "checked_at": timestamp,
-                "error": str(exc),
+                "error": self.breaker.last_error,
+                "breaker": self.breaker.snapshot(),
             }
+        if self.breaker.state == HALF_OPEN:
+            # The trial call is on its way; its outcome sets the next level.
+            BREAKER_STATE.set(_BREAKER_LEVELS[HALF_OPEN], connector=self.label)
+        return None
+
+    def _failed(self, exc: BaseException, timestamp: str) -> Dict[str, Any]:
+        self.history.record(None, ok=False)
+        PROBE_OUTCOMES.inc(connector=self.label, status="error")
+        if self.breaker.record_failure(str(exc)):
+            BREAKER_TRIPS.inc(connector=self.label)
+        BREAKER_STATE.set(_BREAKER_LEVELS[self.breaker.state], connector=self.label)
+        return {
+            "status": "error",
+            "checked_at": timestamp,
+            "error": str(exc),
+            "breaker": self.breaker.snapshot(),
+        }
+
+    def _succeeded(self, measurements: Dict[str, Any], timestamp: str) -> Dict[str, Any]:
+        self.breaker.record_success()
+        BREAKER_STATE.set(_BREAKER_LEVELS[CLOSED], connector=self.label)
+        latency = measurements.get("latency_ms")
+        self.history.record(latency)
+        PROBE_OUTCOMES.inc(connector=self.label, status="ok")
+        if latency is not None:
+            PROBE_LATENCY.observe(latency / 1000, connector=self.label)
+        return {"status": "ok", "checked_at": timestamp, **measurements, "breaker": self.breaker.snapshot()}
+
+    def status(self) -> Dict[str, Any]:
+        timestamp = datetime.now(timezone.utc).isoformat()
+        entry = self._precheck(timestamp)
+        if entry is not None:
+            return entry
+        try:
+            measurements = self.ping()
+        except Exception as exc:  # pragma: no cover - defensive log
+            self.recycle()
+            return self._failed(exc, timestamp)
+        return self._succeeded(measurements, timestamp)
 
 
 class MongoConnector(BaseConnector):
+    """Liveness is an ``admin.ping``. With ``deep_probe`` enabled the pooled
+    client also runs ``serverStatus``, ``replSetGetStatus`` and ``collStats``
+    on the configured collection, at most once per ``deep_interval``."""
+
     name = "mongo"
 
-    def __init__(self, config: MongoSection):
-        super().__init__(self.name)
+    def __init__(self, config: MongoSection, label: Optional[str] = None, **options: Any):
+        super().__init__(label or self.name, **options)
         self.config = config
+        self.deep_probe = config.deep_probe
+        self.deep_interval = config.deep_interval
+        # (total operations, uptime) from the previous serverStatus, for ops/s.
+        self._opcounters: Optional[Tuple[float, float]] = None
+
+    @classmethod
+    def from_options(cls, name: str, options: Dict[str, Any], **common: Any) -> "MongoConnector":
+        return cls(MongoSection.from_options(options), label=name, **common)
 
     def configured(self) -> bool:
         return bool(self.config.host and self.config.port)
 
-    def ping(self) -> Dict[str, Any]:
+    def _create_pool(self) -> MongoClient:
+        from pymongo import MongoClient
+
+        timeout_ms = int(self.timeout * 1000)
         client = MongoClient(
             host=self.config.host,
             port=self.config.port,
             username=self.config.user,
             password=self.config.password,
-            serverSelectionTimeoutMS=5000
+            maxPoolSize=self.pool_size,
+            minPoolSize=0,
+            serverSelectionTimeoutMS=timeout_ms,
+            connectTimeoutMS=timeout_ms,
+            socketTimeoutMS=timeout_ms,
         )
+        # MongoClient connects in the background; finish server selection,
+        # handshake and auth here so the cost is reported as connect time.
+        try:
+            client.admin.command("ping")
+        except Exception:
+            client.close()
+            raise
+        return client
+
+    def _close_pool(self, pool: MongoClient) -> None:
+        pool.close()
+
+    def _parse_stats(
+        self,
+        server: Dict[str, Any],
+        replica_set: Optional[Dict[str, Any]],
+        collection: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        connections = server.get("connections", {})
+        opcounters = server.get("opcounters", {})
+        total_ops = float(sum(value for value in opcounters.values() if isinstance(value, (int, float))))
+        uptime = float(server.get("uptime", 0))
+        ops_per_sec = None
+        if self._opcounters is not None and uptime > self._opcounters[1]:
+            ops_per_sec = round((total_ops - self._opcounters[0]) / (uptime - self._opcounters[1]), 1)
+        self._opcounters = (total_ops, uptime)
+        cache = server.get("wiredTiger", {}).get("cache", {})
+        cache_max = cache.get("maximum bytes configured")
+        stats: Dict[str, Any] = {
+            "connections": connections.get("current"),
+            "connections_available": connections.get("available"),
+            "ops_per_sec": ops_per_sec,
+            "resident_mb": server.get("mem", {}).get("resident"),
+            "cache_fill_ratio": (
+                round(cache["bytes currently in the cache"] / cache_max, 4)
+                if cache_max and "bytes currently in the cache" in cache
+                else None
+            ),
+            "uptime_s": uptime,
+            "replica_set": None,
+            "replication_lag_seconds": None,
+        }
+        if replica_set:
+            members = replica_set.get("members", [])
+            primary = next((m for m in members if m.get("stateStr") == "PRIMARY"), None)
+            lags = [
+                (primary["optimeDate"] - member["optimeDate"]).total_seconds()
+                for member in members
+                if primary and member.get("stateStr") == "SECONDARY" and member.get("optimeDate")
+            ]
+            stats["replica_set"] = replica_set.get("set")
+            stats["members_healthy"] = sum(1 for m in members if m.get("health") == 1)
+            stats["members"] = len(members)
+            stats["replication_lag_seconds"] = max(lags) if lags else None
+        if collection is not None:
+            stats.update(
+                {
+                    "documents": collection.get("count"),
+                    "collection_bytes": collection.get("size"),
+                    "storage_bytes": collection.get("storageSize"),
+                    "indexes": collection.get("nindexes"),
+                    "index_bytes": collection.get("totalIndexSize"),
+                }
+            )
+        return stats
+
+    def _collect_stats(self, client: MongoClient) -> None:
+        from pymongo.errors import OperationFailure
+
+        start = perf_counter()
+        try:
+            # metrics and locks are the bulk of the serverStatus reply and
+            # are not reported.
+            server = client.admin.command("serverStatus", metrics=0, locks=0)
+            try:
+                replica_set = client.admin.command("replSetGetStatus")
+            except OperationFailure:
+                replica_set = None  # standalone or not yet initiated
+            collection = None
+            if self.config.database:
+                try:
+                    collection = client[self.config.database].command("collStats", self.config.collection)
+                except OperationFailure:
+                    collection = None  # collection does not exist yet
+        except Exception as exc:
+            self._record_stats(None, _elapsed_ms(start), exc)
+            return
+        self._record_stats(self._parse_stats(server, replica_set, collection), _elapsed_ms(start))
+
+    def ping(self) -> Dict[str, Any]:
+        start = perf_counter()
+        client = self.pool()
+        connect = _elapsed_ms(start)
         start = perf_counter()
         client.admin.command("ping")
-        latency = round((perf_counter() - start) * 1000, 2)
-        client.close()
+        latency = _elapsed_ms(start)
+        if self._stats_due():
+            self._collect_stats(client)
         return {
             "latency_ms": latency,
+            "connect_ms": connect,
             "database": self.config.database,
             "collection": self.config.collection,
+            **self._stats_entry(),
         }
 
 
 class RedisConnector(BaseConnector):
+    """PING and ``INFO replication`` go out in one pipelined round trip.
+    With ``deep_probe`` enabled, ``INFO memory``, ``clients`` and ``stats``
+    join the same pipeline at most once per ``deep_interval``."""
+
     name = "redis"
 
-    def __init__(self, config: RedisSection):
-        super().__init__(self.name)
+    # INFO sections sent after PING; the deep ones only when stats are due.
+    INFO_SECTIONS = ("replication",)
+    DEEP_INFO_SECTIONS = ("memory", "clients", "stats")
+
+    def __init__(self, config: RedisSection, label: Optional[str] = None, **options: Any):
+        super().__init__(label or self.name, **options)
         self.config = config
+        self.deep_probe = config.deep_probe
+        self.deep_interval = config.deep_interval
+
+    @classmethod
+    def from_options(cls, name: str, options: Dict[str, Any], **common: Any) -> "RedisConnector":
+        return cls(RedisSection.from_options(options), label=name, **common)
 
     def configured(self) -> bool:
         return bool(self.config.url)
 
+    def _create_pool(self) -> redis.Redis:
+        import redis
+
+        pool = redis.BlockingConnectionPool.from_url(
+            self.config.url,
+            max_connections=self.pool_size,
+            timeout=self.timeout,
+            socket_timeout=self.timeout,
+            socket_connect_timeout=self.timeout,
+        )
+        return redis.Redis(connection_pool=pool)
+
+    def _close_pool(self, pool: redis.Redis) -> None:
+        pool.connection_pool.disconnect()
+
+    def _pipeline_sections(self) -> Tuple[str, ...]:
+        if self._stats_due():
+            return self.INFO_SECTIONS + self.DEEP_INFO_SECTIONS
+        return self.INFO_SECTIONS
+
+    def _parse_replies(self, sections: Tuple[str, ...], replies: List[Any], elapsed_ms: float) -> Dict[str, Any]:
+        """Check the pipeline replies, store deep stats, and return the
+        replication fields for the entry."""
+        for reply in replies[:2]:
+            if isinstance(reply, Exception):
+                raise reply
+        info = dict(zip(sections, replies[1:]))
+        if len(sections) > len(self.INFO_SECTIONS):
+            errors = [reply for reply in replies[2:] if isinstance(reply, Exception)]
+            if errors:
+                self._record_stats(None, elapsed_ms, errors[0])
+            else:
+                self._record_stats(redis_stats(info), elapsed_ms)
+        replication = info["replication"]
+        return {"role": replication.get("role"), "connected_slaves": replication.get("connected_slaves")}
+
     def ping(self) -> Dict[str, Any]:
-        client = redis.from_url(self.config.url, socket_timeout=5)
         start = perf_counter()
-        client.ping()
-        latency = round((perf_counter() - start) * 1000, 2)
-        info = client.info(section="replication")
+        client = self.pool()
+        # Check a connection out and straight back in: this opens the socket
+        # when the pool has none idle, and the LIFO pool hands the same
+        # connection to the pipeline below.
+        connection_pool = client.connection_pool
+        connection_pool.release(connection_pool.get_connection("PING"))
+        connect = _elapsed_ms(start)
+        sections = self._pipeline_sections()
+        pipe = client.pipeline(transaction=False)
+        pipe.ping()
+        for section in sections:
+            pipe.info(section)
+        start = perf_counter()
+        replies = pipe.execute(raise_on_error=False)
+        latency = _elapsed_ms(start)
         return {
             "latency_ms": latency,
-            "role": info.get("role"),
-            "connected_slaves": info.get("connected_slaves"),
+            "connect_ms": connect,
+            **self._parse_replies(sections, replies, latency),
             "channel": self.config.channel,
+            **self._stats_entry(),
         }
 
 
+def redis_stats(info: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Deep probe fields from parsed ``INFO`` sections."""
+    memory, clients, stats, replication = (info.get(key, {}) for key in ("memory", "clients", "stats", "replication"))
+    hits, misses = stats.get("keyspace_hits", 0), stats.get("keyspace_misses", 0)
+    result: Dict[str, Any] = {
+        "ops_per_sec": stats.get("instantaneous_ops_per_sec"),
+        "used_memory": memory.get("used_memory"),
+        "maxmemory": memory.get("maxmemory"),
+        "mem_fragmentation_ratio": memory.get("mem_fragmentation_ratio"),
+        "connected_clients": clients.get("connected_clients"),
+        "blocked_clients": clients.get("blocked_clients"),
+        "evicted_keys": stats.get("evicted_keys"),
+        "keyspace_hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+        "replica_lag_seconds": None,
+        "replica_lag_bytes": None,
+    }
+    if replication.get("role") == "master":
+        # redis-py parses each ``slaveN:ip=..,offset=..,lag=..`` line into a dict.
+        replicas = [value for key, value in replication.items() if key.startswith("slave") and isinstance(value, dict)]
+        offset = replication.get("master_repl_offset", 0)
+        if replicas:
+            result["replica_lag_seconds"] = max(replica.get("lag", 0) for replica in replicas)
+            result["replica_lag_bytes"] = max(offset - replica.get("offset", 0) for replica in replicas)
+    else:
+        result["replica_lag_seconds"] = replication.get("master_last_io_seconds_ago")
+        result["master_link_status"] = replication.get("master_link_status")
+    return result
+
+
+# Server-side statistics for the deep probe, gathered in one statement so
+# they cost a single round trip. ``$1`` is the long-transaction threshold in
+# seconds. Replication columns are NULL on a standby and on a primary without
+# replicas.
+DEEP_STATS_SQL = """
+SELECT
+    (SELECT count(*) FROM pg_stat_activity WHERE backend_type = 'client backend') AS connections,
+    (SELECT count(*) FROM pg_stat_activity WHERE backend_type = 'client backend' AND state = 'active') AS active,
+    (SELECT count(*) FROM pg_stat_activity WHERE state LIKE 'idle in transaction%') AS idle_in_transaction,
+    current_setting('max_connections')::int AS max_connections,
+    (SELECT count(*) FROM pg_stat_activity
+      WHERE xact_start IS NOT NULL AND now() - xact_start > make_interval(secs => $1)) AS long_transactions,
+    (SELECT round(blks_hit::numeric / nullif(blks_hit + blks_read, 0), 4)::float8
+       FROM pg_stat_database WHERE datname = current_database()) AS cache_hit_ratio,
+    pg_is_in_recovery() AS in_recovery,
+    (SELECT count(*) FROM pg_stat_replication) AS replicas,
+    CASE WHEN NOT pg_is_in_recovery() THEN
+        (SELECT max(pg_wal_lsn_diff(pg_current_wal_lsn(), replay_lsn))::float8 FROM pg_stat_replication)
+    END AS replication_lag_bytes,
+    CASE WHEN pg_is_in_recovery() THEN
+        extract(epoch FROM now() - pg_last_xact_replay_timestamp())::float8
+    ELSE
+        (SELECT extract(epoch FROM max(replay_lag))::float8 FROM pg_stat_replication)
+    END AS replication_lag_seconds
+"""
+
+DEEP_STATS_FIELDS = (
+    "connections",
+    "active",
+    "idle_in_transaction",
+    "max_connections",
+    "long_transactions",
+    "cache_hit_ratio",
+    "in_recovery",
+    "replicas",
+    "replication_lag_bytes",
+    "replication_lag_seconds",
+)
+
+_DEEP_STATS_STATEMENT = "health_deep_stats"
+
+
 class PostgresConnector(BaseConnector):
+    """Liveness is a ``SELECT 1`` on every check. With ``deep_probe`` enabled
+    the same pooled connection also collects ``DEEP_STATS_SQL`` at most once
+    per ``deep_interval``; checks in between report the last result with its
+    age, so the cheap ping can run often without loading the server's
+    statistics views."""
+
     name = "postgres"
 
-    def __init__(self, config: PostgresSection):
-        super().__init__(self.name)
+    def __init__(self, config: PostgresSection, label: Optional[str] = None, **options: Any):
+        super().__init__(label or self.name, **options)
         self.config = config
+        self.deep_probe = config.deep_probe
+        self.deep_interval = config.deep_interval
+        # Connections on which the stats statement has been PREPAREd.
+        self._prepared: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+    @classmethod
+    def from_options(cls, name: str, options: Dict[str, Any], **common: Any) -> "PostgresConnector":
+        return cls(PostgresSection.from_options(options), label=name, **common)
 
     def configured(self) -> bool:
         return bool(self.config.dsn or self.config.build_dsn())
 
-    def ping(self) -> Dict[str, Any]:
+    def _create_pool(self) -> ThreadedConnectionPool:
+        from psycopg2.pool import ThreadedConnectionPool
+
+        green_psycopg2()
         dsn = self.config.dsn or self.config.build_dsn()
         if not dsn:
             raise RuntimeError("PostgreSQL DSN missing")
+        # psycopg2 closes connections returned beyond ``minconn``; keep one
+        # warm connection for the probe and allow bursts up to ``pool_size``.
+        return ThreadedConnectionPool(
+            1,
+            max(self.pool_size, 1),
+            dsn=dsn,
+            connect_timeout=max(int(self.timeout), 1),
+        )
+
+    def _close_pool(self, pool: ThreadedConnectionPool) -> None:
+        pool.closeall()
+
+    def _collect_stats(self, cursor: Any) -> None:
+        conn = cursor.connection
+        start = perf_counter()
+        try:
+            if conn not in self._prepared:
+                cursor.execute(f"PREPARE {_DEEP_STATS_STATEMENT}(float8) AS {DEEP_STATS_SQL}")
+                self._prepared.add(conn)
+            cursor.execute(f"EXECUTE {_DEEP_STATS_STATEMENT}(%s)", (self.config.long_transaction_seconds,))
+            row = cursor.fetchone()
+        except Exception as exc:
+            self._record_stats(None, _elapsed_ms(start), exc)
+            raise
+        self._record_stats(dict(zip(DEEP_STATS_FIELDS, row)), _elapsed_ms(start))
+
+    def ping(self) -> Dict[str, Any]:
         start = perf_counter()
-        conn = psycopg2.connect(dsn=dsn, connect_timeout=5)
-        with conn.cursor() as cursor:
-            cursor.execute("SELECT 1")
-            cursor.fetchone()
-        conn.close()
-        latency = round((perf_counter() - start) * 1000, 2)
+        pool = self.pool()
+        conn = pool.getconn()
+        connect = _elapsed_ms(start)
+        healthy = False
+        try:
+            conn.autocommit = True
+            start = perf_counter()
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+                latency = _elapsed_ms(start)
+                healthy = True
+                if self._stats_due():
+                    try:
+                        self._collect_stats(cursor)
+                    except Exception:
+                        # The liveness check passed; only the stats failed.
+                        # Drop the connection in case it is in a bad state.
+                        healthy = False
+        finally:
+            pool.putconn(conn, close=not healthy)
         return {
             "latency_ms": latency,
+            "connect_ms": connect,
             "database": self.config.database,
             "host": self.config.host,
+            **self._stats_entry(),
+        }
+
+
+BUILTIN_CONNECTORS: Dict[str, Type[BaseConnector]] = {
+    MongoConnector.name: MongoConnector,
+    RedisConnector.name: RedisConnector,
+    PostgresConnector.name: PostgresConnector,
+}
+
+ENTRY_POINT_GROUP = "auto_deploy_lab.connectors"
+
+
+def connector_types() -> Dict[str, Type[BaseConnector]]:
+    """Built-in connector classes plus any registered by installed packages
+    under the ``auto_deploy_lab.connectors`` entry point group."""
+    types = dict(BUILTIN_CONNECTORS)
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            types[entry_point.name] = entry_point.load()
+        except Exception as exc:  # pragma: no cover - depends on installed plugins
+            logger.warning("Could not load connector type %r: %s", entry_point.name, exc)
+    return types
+
+
+def timeout_entry(deadline: float, name: Optional[str] = None) -> Dict[str, Any]:
+    if name is not None:
+        PROBE_OUTCOMES.inc(connector=name, status="timeout")
+    return {
+        "status": "timeout",
+        "checked_at": datetime.now(timezone.utc).isoformat(),
+        "error": f"Check did not finish within {deadline:g}s",
+    }
+
+
+def build_connectors(settings: Settings, builtins: Dict[str, Type[BaseConnector]]) -> Dict[str, BaseConnector]:
+    """Instantiate the default ``mongo``/``redis``/``postgres`` connectors from
+    ``builtins`` plus every instance declared in ``settings.connectors``."""
+    probe = settings.probe
+
+    def options() -> Dict[str, Any]:
+        return {
+            "pool_size": probe.pool_size,
+            "timeout": probe.timeout,
+            "history": LatencyHistory(
+                capacity=probe.history_samples,
+                slot_seconds=probe.history_slot_seconds,
+                slots=probe.history_slots,
+            ),
+            "breaker": CircuitBreaker(
+                threshold=probe.breaker_threshold,
+                reset=probe.breaker_reset,
+                max_reset=probe.breaker_max_reset,
+                jitter=probe.jitter,
+            ),
         }
 
+    connectors: Dict[str, BaseConnector] = {
+        name: builtins[name](getattr(settings, name), **options())
+        for name in (MongoConnector.name, RedisConnector.name, PostgresConnector.name)
+    }
+    # Extra named instances from CONNECTORS / CONNECTORS_FILE; an entry
+    # reusing a default name ("redis", ...) replaces that connector.
+    types = {**connector_types(), **builtins} if settings.connectors else {}
+    for spec in settings.connectors:
+        connector_cls = types.get(spec.type)
+        if connector_cls is None:
+            raise ValueError(
+                f"Connector '{spec.name}' has unknown type '{spec.type}' "
+                f"(known: {', '.join(sorted(types))})"
+            )
+        common = options()
+        for key in ("pool_size", "timeout"):
+            if key in spec.options:
+                common[key] = type(common[key])(spec.options[key])
+        connectors[spec.name] = connector_cls.from_options(spec.name, spec.options, **common)
+    return connectors
+
+
+# Servers exit without tearing the app down. One exit hook closes every live
+# registry while the hub still runs, rather than leaving their probe threads
+# to be collected during interpreter finalization. The set is weak, so
+# registries that are dropped earlier are not kept alive until exit.
+_REGISTRIES: "weakref.WeakSet[DatabaseRegistry]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_registries() -> None:
+    for registry in list(_REGISTRIES):
+        registry.close()
+
 
 class DatabaseRegistry:
+    """Owns the connectors and fans health checks out over a worker pool.
+
+    In parallel mode every connector is checked at once and the report returns
+    when all checks finish or ``report_deadline`` passes, whichever comes
+    first. A connector whose check is still running is reported as
+    ``timeout`` and later reports join that same in-flight check instead of
+    stacking new ones behind it.
+    """
+
     def __init__(self, settings: Settings):
-        self._connectors = {
-            MongoConnector.name: MongoConnector(settings.mongo),
-            RedisConnector.name: RedisConnector(settings.redis),
-            PostgresConnector.name: PostgresConnector(settings.postgres),
-        }
+        probe = settings.probe
+        self._connectors: Dict[str, BaseConnector] = build_connectors(settings, BUILTIN_CONNECTORS)
+        self.parallel = probe.parallel
+        self.report_deadline = probe.report_deadline
+        # Threads are started on demand, so the cap only matters once that
+        # many checks are in flight at the same time.
+        self._executor: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(
+            max_workers=max(probe.workers, 1),
+            thread_name_prefix="health-probe",
+        )
+        self._inflight: Dict[str, Future] = {}
+        # Guards ``_inflight`` and ``_connectors``, which register/unregister
+        # change while reports iterate over them.
+        self._lock = threading.Lock()
+        _REGISTRIES.add(self)
 
-    def status_for(self, name: str) -> Dict[str, Any]:
+    def _connector(self, name: str) -> BaseConnector:
         connector = self._connectors.get(name)
         if not connector:
             raise KeyError(f"Unknown database connector '{name}'")
-        return connector.status()
+        return connector
+
+    def submit(self, name: str) -> Future:
+        """Start a check for ``name`` or return the one already in flight."""
+        with self._lock:
+            return self._submit(name, self._connector(name))
+
+    def _submit(self, name: str, connector: BaseConnector) -> Future:
+        # Caller holds ``self._lock``.
+        future = self._inflight.get(name)
+        if future is None or future.done():
+            if self._executor is None:
+                raise RuntimeError("Database registry is closed")
+            future = self._executor.submit(connector.status)
+            self._inflight[name] = future
+        return future
+
+    def register(self, connector: BaseConnector, name: Optional[str] = None) -> None:
+        """Add or replace a connector under ``name`` (defaults to its label)."""
+        name = name or connector.label
+        with self._lock:
+            old = self._connectors.get(name)
+            self._connectors[name] = connector
+            self._inflight.pop(name, None)
+        if old is not None and old is not connector:
+            old.close()
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            connector = self._connectors.pop(name, None)
+            self._inflight.pop(name, None)
+        if connector is not None:
+            connector.close()
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._connectors)
+
+    def history_for(self, name: str) -> LatencyHistory:
+        return self._connector(name).history
+
+    def status_for(self, name: str) -> Dict[str, Any]:
+        connector = self._connector(name)
+        if not self.parallel:
+            return connector.status()
+        try:
+            return self.submit(name).result(timeout=self.report_deadline)
+        except FutureTimeout:
+            return timeout_entry(self.report_deadline, name)
+
+    def report(self, parallel: Optional[bool] = None, deadline: Optional[float] = None) -> Dict[str, Any]:
+        parallel = self.parallel if parallel is None else parallel
+        if not parallel:
+            with self._lock:
+                connectors = dict(self._connectors)
+            return {name: connector.status() for name, connector in connectors.items()}
+
+        deadline = self.report_deadline if deadline is None else deadline
+        with self._lock:
+            futures = {name: self._submit(name, connector) for name, connector in self._connectors.items()}
+        wait(futures.values(), timeout=deadline)
+        return {
+            name: future.result() if future.done() else timeout_entry(deadline, name)
+            for name, future in futures.items()
+        }
 
-    def report(self) -> Dict[str, Any]:
-        return {name: connector.status() for name, connector in self._connectors.items()}
+    def close(self) -> None:
+        """Stop the probe threads and close every connector. Safe to call
+        more than once."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            connectors = list(self._connectors.values())
+        if executor is None:
+            return
+        executor.shutdown(wait=False, cancel_futures=True)
+        for connector in connectors:
+            connector.close()
 
-    def summary(self) -> Dict[str, Any]:
-        report = self.report()
-        counters = {"ok": 0, "error": 0, "skipped": 0}
+    def summary(self, parallel: Optional[bool] = None, deadline: Optional[float] = None) -> Dict[str, Any]:
+        report = self.report(parallel=parallel, deadline=deadline)
+        counters = {"ok": 0, "error": 0, "skipped": 0, "timeout": 0}
         for entry in report.values():
             counters[entry["status"]] += 1
         return {"report": report, "counters": counters}
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from time import perf_counter
+from typing import IO, Any, Dict, Iterator, Optional
+
+from .metrics import ECHO_BYTES, ECHO_DURATION, ECHO_FIRST_BYTE
+
+ECHO_MODES = ("json", "stream", "summary")
+
+
+class BodyTooLarge(Exception):
+    """Raised when a request body grows past the configured limit."""
+
+    def __init__(self, limit: int):
+        super().__init__(f"Request body exceeds {limit} bytes")
+        self.limit = limit
+
+
+class NonStandardJSON(ValueError):
+    """Raised for ``NaN`` and ``Infinity``, which JSON does not allow and
+    which no encoder can send back unchanged."""
+
+
+def _reject_constant(name: str) -> Any:
+    raise NonStandardJSON(f"{name} is not valid JSON")
+
+
+def parse_json(raw: bytes) -> Any:
+    """Parse an echoed body exactly as sent.
+
+    Stdlib ``json`` rather than the app serializer: orjson turns integers
+    wider than 64 bits into floats, and an echo must not alter data.
+    Raises ``NonStandardJSON``, or ``ValueError`` for malformed input.
+    """
+    return json.loads(raw, parse_constant=_reject_constant)
+
+
+class EchoMeter:
+    """Byte counts and timings for one echo request.
+
+    ``first_byte_ms`` is the time from the start of the request to the first
+    body chunk read from the client; throughput covers the whole body.
+    """
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.started = perf_counter()
+        self.first_byte: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.bytes = 0
+        self.chunks = 0
+        self.digest = hashlib.sha256()
+
+    def feed(self, chunk: bytes) -> None:
+        if self.first_byte is None:
+            self.first_byte = perf_counter()
+        self.bytes += len(chunk)
+        self.chunks += 1
+        self.digest.update(chunk)
+
+    def finish(self) -> None:
+        if self.finished is not None:
+            return
+        self.finished = perf_counter()
+        ECHO_BYTES.inc(self.bytes, mode=self.mode)
+        ECHO_DURATION.observe(self.finished - self.started, mode=self.mode)
+        if self.first_byte is not None:
+            ECHO_FIRST_BYTE.observe(self.first_byte - self.started, mode=self.mode)
+
+    def to_dict(self) -> Dict[str, Any]:
+        end = self.finished if self.finished is not None else perf_counter()
+        duration = end - self.started
+        return {
+            "bytes": self.bytes,
+            "chunks": self.chunks,
+            "first_byte_ms": round((self.first_byte - self.started) * 1000, 3) if self.first_byte else None,
+            "duration_ms": round(duration * 1000, 3),
+            "throughput_bytes_per_s": round(self.bytes / duration, 1) if duration > 0 else None,
+            "sha256": self.digest.hexdigest(),
+        }
+
+
+def read_body(stream: IO[bytes], chunk_size: int, max_bytes: int, meter: EchoMeter) -> Iterator[bytes]:
+    """Yield the request body in chunks of at most ``chunk_size`` bytes.
+
+    Memory stays bounded by one chunk whatever the body size; ``BodyTooLarge``
+    is raised as soon as more than ``max_bytes`` have been read, which also
+    covers chunked uploads that announce no length.
+    """
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        if meter.bytes + len(chunk) > max_bytes:
+            raise BodyTooLarge(max_bytes)
+        meter.feed(chunk)
+        yield chunk
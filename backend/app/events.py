@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from .config import EventsSection, MongoSection, PostgresSection, Settings
+from .metrics import EVENT_FLUSH, EVENTS_BUFFERED, EVENTS_DROPPED, EVENTS_WRITTEN
+
+logger = logging.getLogger(__name__)
+
+HEALTH = "health"
+JOB = "job"
+BREAKER = "breaker"
+EVENT_KINDS = (HEALTH, JOB, BREAKER)
+
+# Health entry fields kept in the event's ``data``.
+_HEALTH_FIELDS = ("latency_ms", "connect_ms", "error")
+
+
+def _event(kind: str, source: str, status: Optional[str], data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "at": datetime.now(timezone.utc),
+        "kind": kind,
+        "source": source,
+        "status": status,
+        "data": data or {},
+    }
+
+
+class MemoryEventStore:
+    """Keeps the newest ``retention`` events in process; not durable, used
+    when no database is configured and in tests."""
+
+    def __init__(self, retention: int):
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=retention)
+        self._lock = threading.Lock()
+
+    def write(self, batch: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._events.extend(batch)
+
+    def query(
+        self,
+        since: Optional[datetime],
+        until: Optional[datetime],
+        kind: Optional[str],
+        source: Optional[str],
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            events = list(self._events)
+        found = []
+        for event in reversed(events):
+            if (since and event["at"] < since) or (until and event["at"] >= until):
+                continue
+            if (kind and event["kind"] != kind) or (source and event["source"] != source):
+                continue
+            found.append(event)
+            if len(found) >= limit:
+                break
+        return found
+
+    def close(self) -> None:
+        pass
+
+
+class MongoEventStore:
+    """Events in ``MONGO_DB``/``MONGO_COLLECTION``, written with one
+    unordered ``insert_many`` per batch.
+
+    ``at`` is indexed on its own and after ``kind`` and ``source`` so time
+    range queries stay index scans; with ``ttl`` the ``at`` index is a TTL
+    index and MongoDB expires old events itself.
+    """
+
+    def __init__(self, config: MongoSection, ttl: float = 0.0, timeout: float = 5.0):
+        from pymongo import ASCENDING, DESCENDING, MongoClient
+
+        if not config.database:
+            raise ValueError("EVENT_LOG=mongo requires MONGO_DB")
+        timeout_ms = int(timeout * 1000)
+        self._client = MongoClient(
+            host=config.host,
+            port=config.port,
+            username=config.user,
+            password=config.password,
+            maxPoolSize=2,
+            tz_aware=True,
+            serverSelectionTimeoutMS=timeout_ms,
+            connectTimeoutMS=timeout_ms,
+            socketTimeoutMS=timeout_ms,
+        )
+        self._collection = self._client[config.database][config.collection]
+        self._ttl = ttl
+        self._indexes = [
+            ([("kind", ASCENDING), ("at", DESCENDING)], {}),
+            ([("source", ASCENDING), ("at", DESCENDING)], {}),
+            ([("at", ASCENDING)], {"expireAfterSeconds": int(ttl)} if ttl > 0 else {}),
+        ]
+        self._indexed = False
+
+    def _ensure_indexes(self) -> None:
+        # Deferred to the first write so a database outage at startup does
+        # not stop the app from booting.
+        if self._indexed:
+            return
+        for keys, options in self._indexes:
+            self._collection.create_index(keys, **options)
+        self._indexed = True
+
+    def write(self, batch: List[Dict[str, Any]]) -> None:
+        self._ensure_indexes()
+        # insert_many adds ``_id`` to the documents it is given.
+        self._collection.insert_many([dict(event) for event in batch], ordered=False)
+
+    def query(
+        self,
+        since: Optional[datetime],
+        until: Optional[datetime],
+        kind: Optional[str],
+        source: Optional[str],
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        criteria: Dict[str, Any] = {}
+        if since or until:
+            criteria["at"] = {}
+            if since:
+                criteria["at"]["$gte"] = since
+            if until:
+                criteria["at"]["$lt"] = until
+        if kind:
+            criteria["kind"] = kind
+        if source:
+            criteria["source"] = source
+        cursor = self._collection.find(criteria, {"_id": 0}).sort("at", -1).limit(limit)
+        return list(cursor)
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class PostgresEventStore:
+    """Events in a PostgreSQL table, written with one ``COPY ... FROM STDIN``
+    per batch. The table and its time range indexes are created on first
+    write."""
+
+    COLUMNS = ("at", "kind", "source", "status", "data")
+
+    def __init__(self, config: PostgresSection, table: str, timeout: float = 5.0):
+        from psycopg2.pool import ThreadedConnectionPool
+
+        from .database import green_psycopg2
+
+        green_psycopg2()
+        dsn = config.dsn or config.build_dsn()
+        if not dsn:
+            raise ValueError("EVENT_LOG=postgres requires POSTGRES_DSN or POSTGRES_* settings")
+        if not table.replace("_", "").isalnum():
+            raise ValueError(f"Invalid EVENT_TABLE '{table}'")
+        self.table = table
+        self._pool = ThreadedConnectionPool(0, 2, dsn=dsn, connect_timeout=max(int(timeout), 1))
+        self._created = False
+
+    def _run(self, action: Callable[[Any], Any]) -> Any:
+        conn = self._pool.getconn()
+        healthy = False
+        try:
+            with conn:
+                with conn.cursor() as cursor:
+                    result = action(cursor)
+            healthy = True
+            return result
+        finally:
+            self._pool.putconn(conn, close=not healthy)
+
+    def _ensure_table(self, cursor: Any) -> None:
+        if self._created:
+            return
+        table = self.table
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "at timestamptz NOT NULL, kind text NOT NULL, source text NOT NULL, status text, data jsonb)"
+        )
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {table}_at_idx ON {table} (at DESC)")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {table}_kind_at_idx ON {table} (kind, at DESC)")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {table}_source_at_idx ON {table} (source, at DESC)")
+        self._created = True
+
+    def write(self, batch: List[Dict[str, Any]]) -> None:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for event in batch:
+            writer.writerow(
+                [event["at"].isoformat(), event["kind"], event["source"], event["status"], json.dumps(event["data"], default=str)]
+            )
+        buffer.seek(0)
+
+        def copy(cursor: Any) -> None:
+            self._ensure_table(cursor)
+            cursor.copy_expert(f"COPY {self.table} ({', '.join(self.COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+        self._run(copy)
+
+    def query(
+        self,
+        since: Optional[datetime],
+        until: Optional[datetime],
+        kind: Optional[str],
+        source: Optional[str],
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        clauses, params = [], []
+        for clause, value in (("at >= %s", since), ("at < %s", until), ("kind = %s", kind), ("source = %s", source)):
+            if value:
+                clauses.append(clause)
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        def select(cursor: Any) -> List[Any]:
+            self._ensure_table(cursor)
+            cursor.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM {self.table} {where} ORDER BY at DESC LIMIT %s",
+                params + [limit],
+            )
+            return cursor.fetchall()
+
+        return [dict(zip(self.COLUMNS, row)) for row in self._run(select)]
+
+    def close(self) -> None:
+        self._pool.closeall()
+
+
+class EventLog:
+    """Batching writer in front of an event store.
+
+    ``append`` only adds to a bounded in-memory buffer and never blocks or
+    touches the network, so callers on request and probe paths pay nothing
+    for persistence. A background writer flushes the buffer in batches of up
+    to ``batch_size`` every ``flush_interval`` seconds, or as soon as a full
+    batch is waiting. When the buffer is full new events are dropped and
+    counted; a failed write puts the batch back if there is room and drops
+    it otherwise.
+    """
+
+    def __init__(self, store: Any, config: EventsSection):
+        self.store = store
+        self.config = config
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._breakers: Dict[str, str] = {}
+        EVENTS_BUFFERED.set(0)
+
+    def append(self, kind: str, source: str, status: Optional[str] = None, data: Optional[Dict[str, Any]] = None) -> bool:
+        """Buffer one event; returns False when it was dropped."""
+        with self._lock:
+            if len(self._buffer) >= self.config.buffer_size:
+                EVENTS_DROPPED.inc(reason="full")
+                return False
+            self._buffer.append(_event(kind, source, status, data))
+            size = len(self._buffer)
+        EVENTS_BUFFERED.set(size)
+        if size >= self.config.batch_size:
+            self._wake.set()
+        return True
+
+    def record_health(self, name: str, entry: Dict[str, Any]) -> None:
+        """Log a health sample, plus a breaker event when the connector's
+        circuit changed state since its previous sample."""
+        self.append(HEALTH, name, entry.get("status"), {key: entry[key] for key in _HEALTH_FIELDS if key in entry})
+        breaker = entry.get("breaker")
+        if not breaker:
+            return
+        previous = self._breakers.get(name)
+        self._breakers[name] = breaker["state"]
+        if previous is not None and previous != breaker["state"]:
+            self.append(BREAKER, name, breaker["state"], {"previous": previous, **breaker})
+
+    def record_job(self, job: Dict[str, Any]) -> None:
+        data = {key: job.get(key) for key in ("type", "stage", "progress", "error")}
+        self.append(JOB, job["id"], job.get("status"), data)
+
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def flush(self) -> int:
+        """Write one batch; returns the number of events written."""
+        with self._flush_lock:
+            with self._lock:
+                batch = [self._buffer.popleft() for _ in range(min(len(self._buffer), self.config.batch_size))]
+            if not batch:
+                return 0
+            start = perf_counter()
+            try:
+                self.store.write(batch)
+            except Exception as exc:
+                logger.warning("Event log write of %d events failed: %s", len(batch), exc)
+                with self._lock:
+                    room = self.config.buffer_size - len(self._buffer)
+                    if room >= len(batch):
+                        self._buffer.extendleft(reversed(batch))
+                    else:
+                        EVENTS_DROPPED.inc(len(batch), reason="write_error")
+                    EVENTS_BUFFERED.set(len(self._buffer))
+                return 0
+            EVENT_FLUSH.observe(perf_counter() - start)
+            EVENTS_WRITTEN.inc(len(batch))
+            EVENTS_BUFFERED.set(len(self._buffer))
+            return len(batch)
+
+    def flush_all(self) -> int:
+        written = 0
+        while True:
+            count = self.flush()
+            written += count
+            if count < self.config.batch_size:
+                return written
+
+    def query(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        kind: Optional[str] = None,
+        source: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Stored events, newest first. Events still in the buffer are not
+        included until the writer flushes them."""
+        return self.store.query(since, until, kind, source, limit)
+
+    def start(self, spawn: Callable[..., Any]) -> None:
+        if self._running:
+            return
+        self._running = True
+
+        def _writer():  # pragma: no cover - exercised via runtime
+            while self._running:
+                self._wake.wait(self.config.flush_interval)
+                self._wake.clear()
+                self.flush_all()
+
+        spawn(_writer)
+
+    def stop(self) -> None:
+        self._running = False
+        self._wake.set()
+        try:
+            self.flush_all()
+        finally:
+            self.store.close()
+
+
+def build_event_log(settings: Settings) -> Optional[EventLog]:
+    """Return the event log for ``EVENT_LOG``, or None when it is disabled."""
+    config = settings.events
+    backend = config.backend
+    if backend == "none":
+        return None
+    if backend == "auto":
+        backend = "mongo" if settings.mongo.host and settings.mongo.port and settings.mongo.database else "memory"
+    if backend == "memory":
+        store: Any = MemoryEventStore(config.retention)
+    elif backend == "mongo":
+        store = MongoEventStore(settings.mongo, ttl=config.ttl, timeout=settings.probe.timeout)
+    elif backend == "postgres":
+        store = PostgresEventStore(settings.postgres, config.table, timeout=settings.probe.timeout)
+    else:
+        raise ValueError(f"Unknown EVENT_LOG '{config.backend}' (none, auto, memory, mongo, postgres)")
+    return EventLog(store, config)
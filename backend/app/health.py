@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+from concurrent.futures import Future, wait
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from .admission import AdmissionController
+from .config import ProbeSection
+from .database import DatabaseRegistry, timeout_entry
+
+
+# The fields that version a snapshot, plus the breaker state. Everything else
+# in an entry (``checked_at``, timings, deep probe stats) is a per-sample
+# measurement that differs on every check and would bump the version each time.
+VERSIONED_FIELDS = ("status", "error", "message", "role")
+
+
+def _fingerprint(entry: Dict[str, Any]) -> Tuple[str, ...]:
+    breaker = entry.get("breaker") or {}
+    return tuple(repr(entry.get(key)) for key in VERSIONED_FIELDS) + (repr(breaker.get("state")),)
+
+
+def pending_entry() -> Dict[str, Any]:
+    return {
+        "status": "pending",
+        "message": "Waiting for the first sample",
+        "checked_at": None,
+    }
+
+
+@dataclass
+class Snapshot:
+    entry: Dict[str, Any]
+    taken_at: float
+    expires_in: Optional[float] = None
+
+    def age(self, now: float) -> float:
+        return now - self.taken_at
+
+
+class HealthCache:
+    """Serves connector health from recent snapshots instead of live checks.
+
+    A snapshot younger than the connector's TTL is returned as is. Once it is
+    older, but still inside the stale window, it is returned flagged
+    ``stale`` while a refresh runs in the background. Past the stale window
+    (or on first use) callers wait for a fresh check. Concurrent callers share
+    the registry's in-flight check, so N requests cost at most one probe per
+    connector. Every entry carries ``age_ms``, the snapshot age when served.
+
+    When a ``HealthSampler`` drives the cache it is switched to ``passive``
+    mode: reads never trigger a check and only return what the sampler last
+    published, flagged ``stale`` once the sampler is overdue.
+
+    Snapshots are versioned: ``version`` increases whenever a connector's
+    entry changes state (``VERSIONED_FIELDS`` or its breaker state), which lets
+    broadcasters send only the entries that changed since the sequence a
+    client last saw. Measurements alone, such as a new latency, do not count.
+    """
+
+    def __init__(self, registry: DatabaseRegistry, probe: ProbeSection):
+        self.registry = registry
+        self.probe = probe
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._refreshing: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+        self.version = 0
+        self.passive = False
+        # Called with (name, entry) for every result checked in this process
+        # (not for entries mirrored from another one), e.g. the event log.
+        self.on_sample: Optional[Callable[[str, Dict[str, Any]], None]] = None
+        # Caps how many requests wait on live checks at once; requests served
+        # from snapshots never touch it.
+        self.admission: Optional[AdmissionController] = None
+
+    def _put(self, name: str, snapshot: Snapshot, version: Optional[int] = None) -> None:
+        # Caller holds ``self._lock``.
+        previous = self._snapshots.get(name)
+        self._snapshots[name] = snapshot
+        if version is not None:
+            self._versions[name] = version
+            self.version = max(self.version, version)
+        elif previous is None or _fingerprint(previous.entry) != _fingerprint(snapshot.entry):
+            self.version += 1
+            self._versions[name] = self.version
+
+    def publish(
+        self,
+        name: str,
+        entry: Dict[str, Any],
+        expires_in: Optional[float] = None,
+        age: float = 0.0,
+        version: Optional[int] = None,
+    ) -> None:
+        """Store a sampled entry. ``age`` and ``version`` are set when the
+        entry is mirrored from another process, so ages stay relative to the
+        original check and sequence numbers match the publishing process."""
+        with self._lock:
+            self._put(name, Snapshot(entry=entry, taken_at=monotonic() - age, expires_in=expires_in), version)
+        if version is None:
+            self._sampled(name, entry)
+
+    def advance(self, version: int) -> None:
+        """Continue numbering from at least ``version``, e.g. the highest one
+        other processes have already seen from a previous leader."""
+        with self._lock:
+            self.version = max(self.version, version)
+
+    def _sampled(self, name: str, entry: Dict[str, Any]) -> None:
+        if self.on_sample is not None:
+            self.on_sample(name, entry)
+
+    def export(self) -> Dict[str, Dict[str, Any]]:
+        """Raw snapshots for mirroring to other processes."""
+        with self._lock:
+            return {
+                name: {
+                    "entry": snapshot.entry,
+                    "taken_at": snapshot.taken_at,
+                    "expires_in": snapshot.expires_in,
+                    "version": self._versions.get(name, 0),
+                }
+                for name, snapshot in self._snapshots.items()
+            }
+
+    def _store(self, name: str, future: Future) -> None:
+        entry = future.result()
+        with self._lock:
+            if self._refreshing.get(name) is future:
+                del self._refreshing[name]
+            self._put(name, Snapshot(entry=entry, taken_at=monotonic()))
+        self._sampled(name, entry)
+
+    def _refresh(self, name: str) -> Future:
+        future = self.registry.submit(name)
+        with self._lock:
+            known = self._refreshing.get(name) is future
+            self._refreshing[name] = future
+        if not known:
+            future.add_done_callback(lambda done: self._store(name, done))
+        return future
+
+    def _serve(self, snapshot: Snapshot, now: float, stale: bool) -> Dict[str, Any]:
+        entry = {**snapshot.entry, "age_ms": round(snapshot.age(now) * 1000, 2)}
+        if stale:
+            entry["stale"] = True
+        return entry
+
+    def _collect(self, names: Iterable[str], gated: bool = False) -> Dict[str, Dict[str, Any]]:
+        now = monotonic()
+        served: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, Future] = {}
+        for name in names:
+            snapshot = self._snapshots.get(name)
+            if self.passive:
+                if snapshot is None:
+                    served[name] = pending_entry()
+                else:
+                    overdue = snapshot.expires_in is not None and snapshot.age(now) > snapshot.expires_in
+                    served[name] = self._serve(snapshot, now, stale=overdue)
+                continue
+            ttl = self.probe.ttl_for(name)
+            age = snapshot.age(now) if snapshot else None
+            if snapshot is not None and age < ttl:
+                served[name] = self._serve(snapshot, now, stale=False)
+            elif snapshot is not None and age < ttl + self.probe.stale_ttl:
+                self._refresh(name)
+                served[name] = self._serve(snapshot, now, stale=True)
+            else:
+                pending[name] = self._refresh(name)
+
+        if pending:
+            deadline = self.registry.report_deadline
+            if self.admission is None or not gated:
+                wait(pending.values(), timeout=deadline)
+            else:
+                with self.admission.waiting(pending):
+                    wait(pending.values(), timeout=deadline)
+            for name, future in pending.items():
+                if not future.done():
+                    served[name] = timeout_entry(deadline, name)
+                    continue
+                # The done callback may not have run yet on this thread, so
+                # serve the result directly rather than re-reading the cache.
+                served[name] = {**future.result(), "age_ms": 0.0}
+        return served
+
+    def status_for(self, name: str, gated: bool = False) -> Dict[str, Any]:
+        """``gated`` requests go through admission control when they have to
+        wait on a live check, and may raise ``Overloaded``."""
+        if name not in self.registry.names():
+            raise KeyError(f"Unknown database connector '{name}'")
+        return self._collect([name], gated)[name]
+
+    def report(self, gated: bool = False, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Entries for ``names`` (every connector by default); only those
+        connectors are checked, concurrently, when their snapshots are too old.
+        Raises ``KeyError`` for an unknown name."""
+        known = self.registry.names()
+        if names is None:
+            names = known
+        else:
+            names = list(dict.fromkeys(names))
+            unknown = [name for name in names if name not in known]
+            if unknown:
+                raise KeyError(f"Unknown database connector(s) {', '.join(map(repr, unknown))}")
+        served = self._collect(names, gated)
+        return {name: served[name] for name in names}
+
+    def changes_since(self, seq: int) -> Tuple[int, Dict[str, Any]]:
+        """Return the current version and the entries that changed after ``seq``."""
+        now = monotonic()
+        with self._lock:
+            changed = {
+                name: self._serve(self._snapshots[name], now, stale=False)
+                for name, version in self._versions.items()
+                if version > seq and name in self._snapshots
+            }
+            return self.version, changed
+
+    def snapshot(self, gated: bool = False, names: Optional[Iterable[str]] = None) -> Tuple[int, Dict[str, Any]]:
+        """Return a version together with a report (of every connector by
+        default). The version is read first, so it never claims more than the
+        report shows. When checks land while the report is collected (such as
+        the ones it waited on), it is collected once more from the snapshots
+        they stored, so the version matches them."""
+        version = self.version
+        report = self.report(gated, names)
+        if self.version != version:
+            version = self.version
+            report = self.report(gated, names)
+        return version, report
+
+    def summary(self, gated: bool = False, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        version, report = self.snapshot(gated, names)
+        counters = {"ok": 0, "error": 0, "skipped": 0, "timeout": 0, "pending": 0}
+        for entry in report.values():
+            counters[entry["status"]] += 1
+        return {"version": version, "report": report, "counters": counters}
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        with self._lock:
+            if name is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(name, None)
+
+
+class HealthSampler:
+    """Probes every connector on its own schedule and publishes into the cache.
+
+    Each connector is checked every ``interval_for(name)`` seconds, randomly
+    spread by ``jitter`` so connectors (and replicas) do not probe in
+    lock-step. Failed or timed-out checks back off exponentially up to
+    ``max_backoff``. Results are published to the ``HealthCache``, which the
+    sampler switches to passive mode so request handlers only read memory.
+    """
+
+    def __init__(self, registry: DatabaseRegistry, cache: HealthCache, probe: ProbeSection):
+        self.registry = registry
+        self.cache = cache
+        self.probe = probe
+        self._failures: Dict[str, int] = {}
+        self._next_due: Dict[str, float] = {}
+        self._inflight: Dict[str, float] = {}
+        self._hanging: Set[str] = set()
+        self._lock = threading.Lock()
+        self._running = False
+
+    def next_delay(self, name: str) -> float:
+        interval = self.probe.interval_for(name)
+        failures = self._failures.get(name, 0)
+        if failures:
+            interval = min(interval * (2 ** failures), max(self.probe.max_backoff, interval))
+        spread = interval * self.probe.jitter
+        return max(interval + random.uniform(-spread, spread), 0.0)
+
+    def _finish(self, name: str, future: Future) -> None:
+        entry = future.result()
+        with self._lock:
+            if entry.get("status") in {"error", "timeout"}:
+                self._failures[name] = self._failures.get(name, 0) + 1
+            else:
+                self._failures.pop(name, None)
+            delay = self.next_delay(name)
+            self._inflight.pop(name, None)
+            self._hanging.discard(name)
+            self._next_due[name] = monotonic() + delay
+        self.cache.publish(name, entry, expires_in=delay + self.registry.report_deadline)
+
+    def tick(self) -> float:
+        """Start the checks that are due and return how long to sleep."""
+        now = monotonic()
+        deadline = self.registry.report_deadline
+        for name in self.registry.names():
+            with self._lock:
+                started = self._inflight.get(name)
+                if started is not None:
+                    if now - started > deadline and name not in self._hanging:
+                        # Surface a hanging check now rather than when the
+                        # driver finally gives up.
+                        self._hanging.add(name)
+                        self.cache.publish(name, timeout_entry(deadline, name))
+                    continue
+                if self._next_due.get(name, 0.0) > now:
+                    continue
+                self._inflight[name] = now
+            future = self.registry.submit(name)
+            future.add_done_callback(lambda done, name=name: self._finish(name, done))
+        with self._lock:
+            upcoming = [due for name, due in self._next_due.items() if name not in self._inflight]
+        return min([due - monotonic() for due in upcoming] + [1.0])
+
+    def start(self, spawn: Callable[..., Any], sleep: Callable[[float], Any]) -> None:
+        if self._running:
+            return
+        self._running = True
+        self.cache.passive = True
+
+        def _loop():  # pragma: no cover - exercised via runtime
+            while self._running:
+                sleep(max(self.tick(), 0.05))
+
+        spawn(_loop)
+
+    async def run_async(self) -> None:
+        """Sampling loop for the ASGI server; ``tick`` runs on the event loop,
+        where ``AsyncDatabaseRegistry.submit`` schedules its checks."""
+        self._running = True
+        self.cache.passive = True
+        while self._running:
+            await asyncio.sleep(max(self.tick(), 0.05))
+
+    def stop(self) -> None:
+        self._running = False
+        self.cache.passive = False
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import math
+import threading
+from array import array
+from time import time
+from typing import Any, Dict, Iterable, List, Optional
+
+# Log-linear buckets in milliseconds: each bucket is 5% wider than the one
+# before it, from 10µs up to two minutes, so any percentile read from the
+# histogram is within 5% of the true value.
+_BUCKET_MIN_MS = 0.01
+_BUCKET_GROWTH = 1.05
+_BUCKET_COUNT = int(math.ceil(math.log(120_000 / _BUCKET_MIN_MS) / math.log(_BUCKET_GROWTH))) + 1
+_LOG_GROWTH = math.log(_BUCKET_GROWTH)
+
+
+def bucket_index(value_ms: float) -> int:
+    if value_ms <= _BUCKET_MIN_MS:
+        return 0
+    index = int(math.log(value_ms / _BUCKET_MIN_MS) / _LOG_GROWTH) + 1
+    return min(index, _BUCKET_COUNT - 1)
+
+
+def bucket_upper_bound(index: int) -> float:
+    return _BUCKET_MIN_MS * (_BUCKET_GROWTH ** index)
+
+
+class LatencyHistory:
+    """Fixed-memory latency history for one connector.
+
+    Two structures are kept, both preallocated ``array`` buffers that never
+    grow:
+
+    * a ring of the last ``capacity`` raw samples (timestamp, latency, ok);
+    * a ring of ``slots`` histograms, each covering ``slot_seconds`` of wall
+      time, which are merged on demand to answer percentile queries over any
+      window up to ``slots * slot_seconds``.
+    """
+
+    def __init__(self, capacity: int = 512, slot_seconds: float = 60.0, slots: int = 60):
+        self.capacity = capacity
+        self.slot_seconds = slot_seconds
+        self.slots = slots
+        self._times = array("d", [0.0] * capacity)
+        self._latencies = array("d", [0.0] * capacity)
+        self._ok = array("b", [0] * capacity)
+        self._cursor = 0
+        self._size = 0
+        self._counts = array("I", [0] * (slots * _BUCKET_COUNT))
+        self._slot_epoch = array("q", [-1] * slots)
+        self._slot_errors = array("I", [0] * slots)
+        self._slot_max = array("d", [0.0] * slots)
+        self._zero_slot = array("I", [0] * _BUCKET_COUNT)
+        self._lock = threading.Lock()
+
+    @property
+    def max_window(self) -> float:
+        return self.slot_seconds * self.slots
+
+    def _slot_for(self, epoch: int) -> int:
+        slot = epoch % self.slots
+        if self._slot_epoch[slot] != epoch:
+            offset = slot * _BUCKET_COUNT
+            self._counts[offset:offset + _BUCKET_COUNT] = self._zero_slot
+            self._slot_epoch[slot] = epoch
+            self._slot_errors[slot] = 0
+            self._slot_max[slot] = 0.0
+        return slot
+
+    def record(self, latency_ms: Optional[float], ok: bool = True, at: Optional[float] = None) -> None:
+        at = time() if at is None else at
+        with self._lock:
+            self._times[self._cursor] = at
+            self._latencies[self._cursor] = latency_ms if latency_ms is not None else float("nan")
+            self._ok[self._cursor] = 1 if ok else 0
+            self._cursor = (self._cursor + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+            slot = self._slot_for(int(at // self.slot_seconds))
+            if not ok or latency_ms is None:
+                self._slot_errors[slot] += 1
+                return
+            self._counts[slot * _BUCKET_COUNT + bucket_index(latency_ms)] += 1
+            if latency_ms > self._slot_max[slot]:
+                self._slot_max[slot] = latency_ms
+
+    def samples(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return the newest raw samples, oldest first."""
+        with self._lock:
+            count = self._size if limit is None else min(limit, self._size)
+            start = (self._cursor - count) % self.capacity
+            rows = []
+            for step in range(count):
+                index = (start + step) % self.capacity
+                latency = self._latencies[index]
+                rows.append({
+                    "at": self._times[index],
+                    "latency_ms": None if math.isnan(latency) else latency,
+                    "ok": bool(self._ok[index]),
+                })
+        return rows
+
+    def stats(self, window_seconds: float, now: Optional[float] = None) -> Dict[str, Any]:
+        """Percentiles over the histogram slots covering the last ``window_seconds``."""
+        now = time() if now is None else now
+        current = int(now // self.slot_seconds)
+        span = max(1, min(self.slots, int(math.ceil(window_seconds / self.slot_seconds))))
+        merged = [0] * _BUCKET_COUNT
+        errors = 0
+        peak = 0.0
+        with self._lock:
+            for epoch in range(current - span + 1, current + 1):
+                slot = epoch % self.slots
+                if self._slot_epoch[slot] != epoch:
+                    continue
+                offset = slot * _BUCKET_COUNT
+                for index, value in enumerate(self._counts[offset:offset + _BUCKET_COUNT]):
+                    if value:
+                        merged[index] += value
+                errors += self._slot_errors[slot]
+                peak = max(peak, self._slot_max[slot])
+
+        total = sum(merged)
+        result: Dict[str, Any] = {
+            "window_s": window_seconds,
+            "count": total,
+            "errors": errors,
+            "max": round(peak, 2) if total else None,
+        }
+        for label, quantile in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+            result[label] = _percentile(merged, total, quantile, peak)
+        return result
+
+    def windows(self, windows: Iterable[float], now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        return {f"{window:g}": self.stats(window, now=now) for window in windows}
+
+
+def _percentile(counts: List[int], total: int, quantile: float, peak: float) -> Optional[float]:
+    if not total:
+        return None
+    rank = max(1, int(math.ceil(quantile * total)))
+    seen = 0
+    for index, value in enumerate(counts):
+        seen += value
+        if seen >= rank:
+            return round(min(bucket_upper_bound(index), peak), 2)
+    return round(peak, 2)
@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+
+from .config import JobsSection
+from .rooms import JOBS_UPDATE_ROOM, job_room
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED = frozenset({SUCCEEDED, FAILED})
+
+# Stages reported by the built-in simulated deployment job.
+DEFAULT_STAGES = ("checkout", "build", "test", "deploy")
+
+# Worker back-off after a backend error, doubled per consecutive error.
+RETRY_DELAY = 0.5
+MAX_RETRY_DELAY = 30.0
+
+Notify = Callable[[str, Dict[str, Any], List[str]], Any]
+
+# Capacity check, job record, index entry and enqueue in one atomic step, so
+# concurrent submitters (on any replica) cannot push past ``queue_size``.
+_PUSH_LUA = """
+if redis.call('LLEN', KEYS[1]) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('SET', KEYS[3], ARGV[3], 'EX', tonumber(ARGV[4]))
+redis.call('ZADD', KEYS[2], ARGV[5], ARGV[2])
+redis.call('ZREMRANGEBYRANK', KEYS[2], 0, -tonumber(ARGV[6]) - 1)
+redis.call('LPUSH', KEYS[1], ARGV[2])
+return 1
+"""
+
+
+class QueueFull(Exception):
+    """Raised when the job queue is at capacity and cannot accept more work."""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class Job:
+    id: str
+    type: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    status: str = QUEUED
+    created_at: str = field(default_factory=_now)
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    stage: Optional[str] = None
+    progress: float = 0.0
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        return cls(**data)
+
+
+class MemoryJobBackend:
+    """Single-process backend: a bounded ``queue.Queue`` plus a job table that
+    keeps the newest ``retention`` jobs. Only finished jobs are evicted, so
+    queued and running ones stay loadable even when the table is over."""
+
+    def __init__(self, queue_size: int, retention: int):
+        self._queue: "queue.Queue[str]" = queue.Queue(maxsize=queue_size)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._retention = retention
+        self._lock = threading.Lock()
+
+    def push(self, job: Job) -> None:
+        self.save(job)
+        try:
+            self._queue.put_nowait(job.id)
+        except queue.Full:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            raise QueueFull("Job queue is full") from None
+
+    def pop(self, timeout: float) -> Optional[str]:
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def save(self, job: Job) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+            self._jobs.move_to_end(job.id)
+            excess = len(self._jobs) - self._retention
+            if excess > 0:
+                finished = (job_id for job_id, kept in self._jobs.items() if kept.status in FINISHED)
+                for job_id in list(islice(finished, excess)):
+                    del self._jobs[job_id]
+
+    def load(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def recent(self, limit: int) -> List[Job]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return list(reversed(jobs))[:limit]
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+
+class RedisJobBackend:
+    """Shared backend so several replicas can pull from one queue.
+
+    Job ids are pushed onto a Redis list and popped with ``BRPOP``; job state
+    lives in one JSON string per job with a TTL, and a capped sorted set
+    indexes recent jobs for listing. Pushing is one script call, so the
+    capacity check cannot race other submitters.
+    """
+
+    def __init__(self, url: str, prefix: str, queue_size: int, retention: int, ttl: int = 86400):
+        import redis
+
+        self._client = redis.from_url(url, socket_timeout=5)
+        self._queue_key = f"{prefix}:jobs:queue"
+        self._index_key = f"{prefix}:jobs:index"
+        self._prefix = prefix
+        self._queue_size = queue_size
+        self._retention = retention
+        self._ttl = ttl
+        self._push = self._client.register_script(_PUSH_LUA)
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self._prefix}:jobs:{job_id}"
+
+    def push(self, job: Job) -> None:
+        created = datetime.fromisoformat(job.created_at).timestamp()
+        pushed = self._push(
+            keys=[self._queue_key, self._index_key, self._job_key(job.id)],
+            args=[self._queue_size, job.id, json.dumps(job.to_dict()), self._ttl, created, self._retention],
+        )
+        if not pushed:
+            raise QueueFull("Job queue is full")
+
+    def pop(self, timeout: float) -> Optional[str]:
+        item = self._client.brpop(self._queue_key, timeout=max(int(timeout), 1))
+        if not item:
+            return None
+        return item[1].decode() if isinstance(item[1], bytes) else item[1]
+
+    def save(self, job: Job) -> None:
+        created = datetime.fromisoformat(job.created_at).timestamp()
+        pipe = self._client.pipeline(transaction=False)
+        pipe.set(self._job_key(job.id), json.dumps(job.to_dict()), ex=self._ttl)
+        pipe.zadd(self._index_key, {job.id: created})
+        pipe.zremrangebyrank(self._index_key, 0, -self._retention - 1)
+        pipe.execute()
+
+    def load(self, job_id: str) -> Optional[Job]:
+        raw = self._client.get(self._job_key(job_id))
+        return Job.from_dict(json.loads(raw)) if raw else None
+
+    def recent(self, limit: int) -> List[Job]:
+        ids = self._client.zrevrange(self._index_key, 0, limit - 1)
+        if not ids:
+            return []
+        raws = self._client.mget([self._job_key(job_id.decode()) for job_id in ids])
+        return [Job.from_dict(json.loads(raw)) for raw in raws if raw]
+
+    def depth(self) -> int:
+        return int(self._client.llen(self._queue_key))
+
+
+def simulate_deployment(job: Job, report: Callable[[str, float], None], sleep: Callable[[float], Any], step: float) -> None:
+    """Built-in handler: walk through ``DEFAULT_STAGES`` (or ``payload["stages"]``).
+
+    ``payload["fail_at"]`` names a stage that should fail, which is handy for
+    exercising failure paths from the dashboard.
+    """
+    stages = job.payload.get("stages") or DEFAULT_STAGES
+    for index, stage in enumerate(stages):
+        report(stage, index / len(stages))
+        sleep(step)
+        if job.payload.get("fail_at") == stage:
+            raise RuntimeError(f"Stage '{stage}' failed")
+    report(stages[-1], 1.0)
+
+
+class JobQueue:
+    """Bounded job queue with a pool of workers.
+
+    ``submit`` raises ``QueueFull`` instead of growing without limit, so the
+    API can answer 429. Workers run on whatever ``spawn`` provides (Socket.IO
+    background tasks in the app) and report every state change through
+    ``notify`` as ``jobs:update`` events addressed to the job's room and the
+    ``jobs:update`` event room. With an ``events`` log, every status or stage
+    change is also appended there.
+    """
+
+    def __init__(self, config: JobsSection, backend: Any, notify: Notify, events: Any = None):
+        self.config = config
+        self.backend = backend
+        self.notify = notify
+        self.events = events
+        self._running = False
+
+    def submit(self, job_type: str, payload: Dict[str, Any]) -> Job:
+        job = Job(id=str(uuid4()), type=job_type, payload=payload)
+        self.backend.push(job)
+        if self.events is not None:
+            self.events.record_job(job.to_dict())
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.backend.load(job_id)
+
+    def recent(self, limit: int = 50, status: Optional[str] = None) -> List[Job]:
+        jobs = self.backend.recent(self.config.retention if status else limit)
+        if status:
+            jobs = [job for job in jobs if job.status == status]
+        return jobs[:limit]
+
+    def depth(self) -> int:
+        return self.backend.depth()
+
+    def _update(self, job: Job, **changes: Any) -> None:
+        transition = any(getattr(job, key) != changes[key] for key in ("status", "stage") if key in changes)
+        for key, value in changes.items():
+            setattr(job, key, value)
+        self.backend.save(job)
+        data = job.to_dict()
+        if transition and self.events is not None:
+            self.events.record_job(data)
+        self.notify("jobs:update", data, [job_room(job.id), JOBS_UPDATE_ROOM])
+
+    def run(self, job: Job, sleep: Callable[[float], Any]) -> None:
+        self._update(job, status=RUNNING, started_at=_now())
+
+        def report(stage: str, progress: float) -> None:
+            self._update(job, stage=stage, progress=round(progress, 3))
+
+        try:
+            simulate_deployment(job, report, sleep, self.config.step_seconds)
+        except Exception as exc:
+            self._update(job, status=FAILED, error=str(exc), finished_at=_now())
+        else:
+            self._update(job, status=SUCCEEDED, progress=1.0, finished_at=_now())
+
+    def work_once(self, sleep: Callable[[float], Any], timeout: float = 1.0) -> bool:
+        """Run the next job, if one arrives within ``timeout``.
+
+        A popped job that fails on a backend error is marked failed (when the
+        backend lets it) before the error propagates.
+        """
+        job_id = self.backend.pop(timeout)
+        if job_id is None:
+            return False
+        try:
+            job = self.backend.load(job_id)
+            if job is not None:
+                self.run(job, sleep)
+        except Exception as exc:
+            self._abandon(job_id, exc)
+            raise
+        return True
+
+    def _abandon(self, job_id: str, exc: Exception) -> None:
+        try:
+            job = self.backend.load(job_id)
+            if job is not None and job.status not in FINISHED:
+                self._update(job, status=FAILED, error=f"Job backend error: {exc}", finished_at=_now())
+        except Exception:
+            logger.warning("Could not mark job %s as failed", job_id, exc_info=True)
+
+    def work(self, sleep: Callable[[float], Any]) -> None:
+        """Worker loop: runs jobs until ``stop()``, backing off after backend
+        errors instead of dying on them."""
+        errors = 0
+        while self._running:
+            try:
+                self.work_once(sleep)
+            except Exception:
+                errors += 1
+                delay = min(RETRY_DELAY * (2 ** (errors - 1)), MAX_RETRY_DELAY)
+                logger.exception("Job worker error, retrying in %.1fs", delay)
+                sleep(delay)
+            else:
+                errors = 0
+
+    def start(self, spawn: Callable[..., Any], sleep: Callable[[float], Any]) -> None:
+        if self._running:
+            return
+        self._running = True
+        for _ in range(self.config.workers):
+            spawn(self.work, sleep)
+
+    def stop(self) -> None:
+        self._running = False
+
+
+def build_backend(config: JobsSection, redis_url: Optional[str], prefix: str) -> Any:
+    if config.backend == "redis" and redis_url:
+        return RedisJobBackend(redis_url, prefix, config.queue_size, config.retention)
+    return MemoryJobBackend(config.queue_size, config.retention)
@@ -0,0 +1,111 @@
+"""Socket.IO message queue attached after startup.
+
+The server starts with python-socketio's in-process client manager and
+serves immediately. ``MessageQueueUpgrade`` pings Redis in the background
+and, once it answers, swaps in a Redis manager that takes over the connected
+clients and their rooms, so an unreachable or slow Redis (e.g. a DNS timeout
+during a rollout) never delays readiness.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Callable
+
+from .metrics import MESSAGE_QUEUE_CONNECTED
+from .rooms import Broadcaster
+
+logger = logging.getLogger(__name__)
+
+
+def install_manager(server: Any, manager: Any) -> None:
+    """Replace ``server``'s client manager with ``manager`` in place.
+
+    Room membership, sid mappings and pending callbacks move over as they
+    are, so clients that connected before the switch stay addressable. Works
+    for both ``socketio.Server`` and ``socketio.AsyncServer``; with eventlet
+    or on the event loop nothing runs between the assignments.
+
+    python-socketio has no public API for this, so the manager attributes
+    are copied directly. They match python-socketio 5.17, which
+    requirements.txt pins; check them again when upgrading it.
+    """
+    previous = server.manager
+    manager.rooms = previous.rooms
+    manager.eio_to_sid = previous.eio_to_sid
+    manager.callbacks = previous.callbacks
+    manager.pending_disconnect = previous.pending_disconnect
+    manager.set_server(server)
+    manager.initialize()
+    server.manager = manager
+    server.manager_initialized = True
+
+
+class MessageQueueUpgrade:
+    """Waits for Redis and then moves the Socket.IO server onto a Redis
+    message queue.
+
+    Retries back off from ``retry`` to ``max_retry`` seconds. The
+    broadcaster is switched to ``shared`` at the same moment, since from then
+    on room subscribers may be connected to other replicas.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        broadcaster: Broadcaster,
+        retry: float = 1.0,
+        max_retry: float = 60.0,
+        timeout: float = 1.0,
+    ):
+        self.url = url
+        self.broadcaster = broadcaster
+        self.retry = retry
+        self.max_retry = max_retry
+        self.timeout = timeout
+        self.connected = False
+        MESSAGE_QUEUE_CONNECTED.set(0)
+
+    def reachable(self) -> bool:
+        import redis
+
+        try:
+            redis.from_url(self.url, socket_timeout=self.timeout, socket_connect_timeout=self.timeout).ping()
+        except Exception as exc:
+            logger.warning("Redis message queue not reachable yet: %s", exc)
+            return False
+        return True
+
+    async def reachable_async(self) -> bool:
+        from redis import asyncio as aioredis
+
+        client = aioredis.from_url(self.url, socket_timeout=self.timeout, socket_connect_timeout=self.timeout)
+        try:
+            await client.ping()
+        except Exception as exc:
+            logger.warning("Redis message queue not reachable yet: %s", exc)
+            return False
+        finally:
+            await client.aclose()
+        return True
+
+    def _install(self, server: Any, manager: Any) -> None:
+        install_manager(server, manager)
+        self.broadcaster.shared = True
+        self.connected = True
+        MESSAGE_QUEUE_CONNECTED.set(1)
+        logger.info("Socket.IO message queue connected")
+
+    def run(self, server: Any, make_manager: Callable[[], Any], sleep: Callable[[float], Any]) -> None:
+        delay = self.retry
+        while not self.reachable():
+            sleep(delay)
+            delay = min(delay * 2, self.max_retry)
+        self._install(server, make_manager())
+
+    async def run_async(self, server: Any, make_manager: Callable[[], Any]) -> None:
+        delay = self.retry
+        while not await self.reachable_async():
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_retry)
+        self._install(server, make_manager())
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence, Tuple, TypeVar
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return self.header() + self.samples()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Iterable[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket..., overflow, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            row[index] += 1
+            row[-1] += value
+
+    def count(self, **labels: str) -> int:
+        row = self._values.get(self._key(labels))
+        return int(sum(row[:-1])) if row else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(row)) for key, row in self._values.items()]
+        lines = []
+        for key, row in items:
+            cumulative = 0.0
+            for bound, value in zip(self.buckets + (float("inf"),), row[:-1]):
+                cumulative += value
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {_format_value(cumulative)}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(row[-1])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(cumulative)}")
+        return lines
+
+
+MetricT = TypeVar("MetricT", bound=_Metric)
+
+
+class MetricsRegistry:
+    """Metrics are updated in place by the code paths they describe; a scrape
+    only formats the current values and never triggers a probe."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: MetricT) -> MetricT:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+PROBE_LATENCY = REGISTRY.register(
+    Histogram("health_probe_latency_seconds", "Round-trip latency of successful connector probes.", ["connector"])
+)
+PROBE_OUTCOMES = REGISTRY.register(
+    Counter("health_probe_total", "Connector probe outcomes (ok, error, skipped, timeout, open).", ["connector", "status"])
+)
+BREAKER_STATE = REGISTRY.register(
+    Gauge("health_breaker_state", "Connector circuit breaker state (0 closed, 1 half-open, 2 open).", ["connector"])
+)
+BREAKER_TRIPS = REGISTRY.register(Counter("health_breaker_trips_total", "Times a connector circuit breaker opened.", ["connector"]))
+CONNECTOR_STATS = REGISTRY.register(
+    Gauge("health_connector_stat", "Server-side statistics collected by connector deep probes.", ["connector", "stat"])
+)
+SAMPLER_LEADER = REGISTRY.register(Gauge("health_sampler_leader", "1 when this process is the elected health sampler."))
+HTTP_LATENCY = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Latency of API requests by route.",
+        ["method", "route", "status"],
+    )
+)
+ECHO_BYTES = REGISTRY.register(Counter("echo_bytes_total", "Request body bytes received by /api/echo.", ["mode"]))
+ECHO_FIRST_BYTE = REGISTRY.register(
+    Histogram("echo_first_byte_seconds", "Time from request start to the first /api/echo body byte.", ["mode"])
+)
+ECHO_DURATION = REGISTRY.register(
+    Histogram("echo_duration_seconds", "Time to receive (and in stream mode send back) an /api/echo body.", ["mode"])
+)
+EVENTS_BUFFERED = REGISTRY.register(Gauge("event_log_buffered", "Events waiting in the event log buffer."))
+EVENTS_WRITTEN = REGISTRY.register(Counter("event_log_written_total", "Events written to the event log store."))
+EVENTS_DROPPED = REGISTRY.register(
+    Counter("event_log_dropped_total", "Events dropped by the event log (full buffer or failed write).", ["reason"])
+)
+EVENT_FLUSH = REGISTRY.register(Histogram("event_log_flush_seconds", "Time to write one event log batch."))
+HUB_LAG = REGISTRY.register(
+    Histogram("event_loop_lag_seconds", "How late the hub-lag monitor woke up relative to its schedule.")
+)
+HUB_BLOCKED = REGISTRY.register(
+    Counter("event_loop_blocked_total", "Times a single task held the event loop past the block threshold.")
+)
+ADMISSION_WAITING = REGISTRY.register(
+    Gauge("admission_waiting_requests", "Requests waiting on a connector's live check.", ["connector"])
+)
+ADMISSION_QUEUE_WAIT = REGISTRY.register(
+    Histogram("admission_queue_wait_seconds", "Time requests spent queued for a live-check slot.", ["connector"])
+)
+ADMISSION_SHED = REGISTRY.register(
+    Counter(
+        "admission_shed_total",
+        "Requests turned away by admission control (queue_full, queue_timeout or rate_limited).",
+        ["reason", "target"],
+    )
+)
+SOCKET_CLIENTS = REGISTRY.register(Gauge("socketio_connected_clients", "Currently connected Socket.IO clients."))
+SOCKET_CLIENTS.set(0)
+MESSAGE_QUEUE_CONNECTED = REGISTRY.register(
+    Gauge("socketio_message_queue_connected", "1 once the Socket.IO server is attached to the Redis message queue.")
+)
+SOCKET_EMITS = REGISTRY.register(Counter("socketio_emits_total", "Socket.IO emit calls made by the server (a broadcast counts once).", ["event"]))
+SOCKET_EMITS_SKIPPED = REGISTRY.register(
+    Counter("socketio_emits_skipped_total", "Room emits skipped because no client had subscribed.", ["event"])
+)
@@ -0,0 +1,174 @@
+"""Event loop lag monitor and blocking-call watchdog.
+
+Everything in a process shares one eventlet hub (or one asyncio loop in ASGI
+mode), so a single call that blocks, such as a C driver waiting on a socket,
+delays every connected client. ``HubMonitor`` makes that visible. A
+background task asks to wake every ``interval`` seconds and records how late
+it woke. A native OS thread, which keeps running while the hub is stuck,
+grabs the stack of the code holding the hub once a wake-up is
+``block_threshold`` overdue.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+import math
+import sys
+import traceback
+from collections import deque
+from time import monotonic
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from .config import MonitorSection
+from .metrics import HUB_BLOCKED, HUB_LAG
+
+logger = logging.getLogger(__name__)
+
+
+def _native(module: str) -> Any:
+    """``module`` as it was before eventlet monkey-patched it."""
+    if "eventlet" in sys.modules:
+        from eventlet import patcher
+
+        return patcher.original(module)
+    return importlib.import_module(module)
+
+
+def _percentile(ordered: List[float], q: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[max(math.ceil(q * len(ordered)) - 1, 0)]
+
+
+class HubMonitor:
+    """Records event loop lag and reports code that blocks the loop.
+
+    The watchdog thread never touches locks, logging or metrics, since under
+    eventlet those are green and must not be used from another OS thread. It
+    only stores the captured stack. The monitor task logs it when the hub
+    frees up, together with how long the stall lasted.
+    """
+
+    def __init__(self, config: MonitorSection):
+        self.config = config
+        self.blocked = 0
+        self._lags: Deque[float] = deque(maxlen=max(config.window, 1))
+        self._due: Optional[float] = None
+        self._captured: Optional[float] = None
+        self._stack: Optional[str] = None
+        self._hub_thread: Optional[int] = None
+        self._logged_at = -math.inf
+        self._suppressed = 0
+        self._running = False
+        self._summary: Optional[Dict[str, Any]] = None
+        self._summary_at = -math.inf
+
+    def _sleeping(self) -> float:
+        start = monotonic()
+        self._due = start + self.config.interval
+        return start
+
+    def _woke(self, start: float) -> None:
+        lag = max(monotonic() - start - self.config.interval, 0.0)
+        self._lags.append(lag)
+        HUB_LAG.observe(lag)
+        stack, self._stack = self._stack, None
+        if stack is not None:
+            self._report(lag, stack)
+
+    def _report(self, lag: float, stack: str) -> None:
+        self.blocked += 1
+        HUB_BLOCKED.inc()
+        now = monotonic()
+        if now - self._logged_at < self.config.log_interval:
+            self._suppressed += 1
+            return
+        logger.warning(
+            "Event loop blocked for %.0f ms (%d earlier stalls not logged). Blocking code:\n%s",
+            lag * 1000,
+            self._suppressed,
+            stack,
+        )
+        self._logged_at = now
+        self._suppressed = 0
+
+    def watch_once(self) -> bool:
+        """Capture the hub thread's stack if the monitor task is overdue.
+
+        Runs on the watchdog thread; each overdue wake-up is captured once.
+        """
+        due = self._due
+        if due is None or due == self._captured or monotonic() - due < self.config.block_threshold:
+            return False
+        self._captured = due
+        frame = sys._current_frames().get(self._hub_thread)
+        self._stack = "".join(traceback.format_stack(frame)) if frame is not None else "<stack unavailable>"
+        return True
+
+    def _watch(self) -> None:  # pragma: no cover - exercised via runtime
+        sleep = _native("time").sleep
+        step = max(self.config.block_threshold / 2, 0.005)
+        while self._running:
+            sleep(step)
+            self.watch_once()
+
+    def _start_watchdog(self) -> None:
+        self._hub_thread = _native("threading").get_ident()
+        watchdog = _native("threading").Thread(target=self._watch, name="hub-watchdog", daemon=True)
+        watchdog.start()
+
+    def run(self, sleep: Callable[[float], Any]) -> None:
+        self._start_watchdog()
+        while self._running:
+            start = self._sleeping()
+            sleep(self.config.interval)
+            self._woke(start)
+
+    async def run_async(self) -> None:
+        self._running = True
+        self._start_watchdog()
+        while self._running:
+            start = self._sleeping()
+            await asyncio.sleep(self.config.interval)
+            self._woke(start)
+
+    def start(self, spawn: Callable[..., Any], sleep: Callable[[float], Any]) -> None:
+        if self._running:
+            return
+        self._running = True
+        spawn(self.run, sleep)
+
+    def stop(self) -> None:
+        self._running = False
+
+    def summary(self) -> Dict[str, Any]:
+        """Lag percentiles over the last ``window`` wake-ups, in milliseconds.
+
+        The result is reused for ``summary_interval`` seconds, so the health
+        payload (and its ETag) does not change on every poll.
+        """
+        now = monotonic()
+        if self._summary is not None and now - self._summary_at < self.config.summary_interval:
+            return self._summary
+        self._summary = self._summarize()
+        self._summary_at = now
+        return self._summary
+
+    def _summarize(self) -> Dict[str, Any]:
+        ordered = sorted(self._lags)
+
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 3) if value is not None else None
+
+        return {
+            "interval_ms": self.config.interval * 1000,
+            "samples": len(ordered),
+            "lag_ms": {
+                "p50": ms(_percentile(ordered, 0.5)),
+                "p95": ms(_percentile(ordered, 0.95)),
+                "p99": ms(_percentile(ordered, 0.99)),
+                "max": ms(ordered[-1] if ordered else None),
+            },
+            "blocked": self.blocked,
+        }
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+from uuid import UUID
+
+from .metrics import SOCKET_EMITS, SOCKET_EMITS_SKIPPED
+
+# Room names are "<kind>:<value>": one room per connector, per job id, or per
+# event type (every message of that event, e.g. "event:jobs:update").
+ROOM_KINDS = ("connector", "job", "event")
+
+HEALTH_ROOM = "event:health:update"
+JOBS_CREATED_ROOM = "event:jobs:created"
+JOBS_UPDATE_ROOM = "event:jobs:update"
+# The event rooms something is broadcast to.
+EVENT_ROOMS = frozenset({HEALTH_ROOM, JOBS_CREATED_ROOM, JOBS_UPDATE_ROOM})
+
+# Rooms one client may be in at once; further joins are refused.
+MAX_ROOMS_PER_CLIENT = 64
+
+
+def connector_room(name: str) -> str:
+    return f"connector:{name}"
+
+
+def job_room(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+def _job_id(value: str) -> bool:
+    try:
+        return str(UUID(value)) == value
+    except ValueError:
+        return False
+
+
+def valid_room(room: Any, connectors: Iterable[str] = ()) -> bool:
+    """True for a room something is published to: an event in
+    ``EVENT_ROOMS``, one of ``connectors``, or a job id."""
+    if not isinstance(room, str):
+        return False
+    kind, _, value = room.partition(":")
+    if kind == "event":
+        return room in EVENT_ROOMS
+    if kind == "connector":
+        return value in connectors
+    if kind == "job":
+        return _job_id(value)
+    return False
+
+
+class RoomDirectory:
+    """Per-process subscriber counts for Socket.IO rooms.
+
+    Socket.IO removes a client from its rooms on disconnect by itself; the
+    directory mirrors membership so broadcasters can ask "is anyone
+    listening?" in O(1) before building and encoding a payload. A client
+    can be in at most ``max_rooms`` rooms.
+    """
+
+    def __init__(self, max_rooms: int = MAX_ROOMS_PER_CLIENT):
+        self.max_rooms = max_rooms
+        self._members: Dict[str, Set[str]] = {}
+        self._rooms_by_sid: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def join(self, sid: str, room: str) -> bool:
+        """Record ``sid`` in ``room``; False when it is already at ``max_rooms``."""
+        with self._lock:
+            rooms = self._rooms_by_sid.setdefault(sid, set())
+            if room not in rooms and len(rooms) >= self.max_rooms:
+                return False
+            rooms.add(room)
+            self._members.setdefault(room, set()).add(sid)
+            return True
+
+    def leave(self, sid: str, room: str) -> None:
+        with self._lock:
+            self._discard(sid, room)
+            rooms = self._rooms_by_sid.get(sid)
+            if rooms is not None:
+                rooms.discard(room)
+                if not rooms:
+                    del self._rooms_by_sid[sid]
+
+    def drop(self, sid: str) -> None:
+        with self._lock:
+            for room in self._rooms_by_sid.pop(sid, set()):
+                self._discard(sid, room)
+
+    def _discard(self, sid: str, room: str) -> None:
+        members = self._members.get(room)
+        if members is None:
+            return
+        members.discard(sid)
+        if not members:
+            del self._members[room]
+
+    def count(self, room: str) -> int:
+        members = self._members.get(room)
+        return len(members) if members else 0
+
+    def rooms_of(self, sid: str) -> List[str]:
+        return sorted(self._rooms_by_sid.get(sid, ()))
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {room: len(members) for room, members in self._members.items()}
+
+
+class Broadcaster:
+    """Room-addressed emits that skip rooms nobody on this server listens to.
+
+    With a Socket.IO message queue, subscribers may be connected to other
+    replicas that this process cannot see, so ``shared=True`` disables the
+    empty-room shortcut and every room-addressed emit is forwarded.
+    """
+
+    def __init__(self, socketio: Any, directory: Optional[RoomDirectory] = None, shared: bool = False):
+        self.socketio = socketio
+        self.directory = directory or RoomDirectory()
+        self.shared = shared
+
+    def has_subscribers(self, room: str) -> bool:
+        return self.shared or self.directory.count(room) > 0
+
+    def emit(self, event: str, payload: Any, room: str, skip_sid: Optional[str] = None) -> bool:
+        if not self.has_subscribers(room):
+            SOCKET_EMITS_SKIPPED.inc(event=event)
+            return False
+        self.socketio.emit(event, payload, to=room, skip_sid=skip_sid)
+        SOCKET_EMITS.inc(event=event)
+        return True
+
+    def emit_many(self, event: str, payload: Any, rooms: Iterable[str]) -> bool:
+        """Emit one message to several rooms; a client in more than one of
+        them receives it once."""
+        targets = [room for room in rooms if self.has_subscribers(room)]
+        if not targets:
+            SOCKET_EMITS_SKIPPED.inc(event=event)
+            return False
+        self.socketio.emit(event, payload, to=targets)
+        SOCKET_EMITS.inc(event=event)
+        return True
@@ -1,12 +1,36 @@
 from __future__ import annotations
 
+import math
 from datetime import datetime, timezone
-from typing import Any, Dict
-from uuid import uuid4
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional
 
-from flask import Blueprint, Response, current_app, jsonify, request
+from flask import Blueprint, Response, current_app, g, jsonify, request, stream_with_context
+
+from werkzeug.wsgi import get_input_stream
+
+from .admission import Overloaded
+from .conditional import conditional_response
+from .echo import ECHO_MODES, BodyTooLarge, EchoMeter, NonStandardJSON, parse_json, read_body
+from .events import EVENT_KINDS
+from .jobs import QueueFull
+from .metrics import CONTENT_TYPE, HTTP_LATENCY, REGISTRY
+from .rooms import JOBS_CREATED_ROOM
 
 api_bp = Blueprint("api", __name__, url_prefix="/api")
+metrics_bp = Blueprint("metrics", __name__)
+
+# Health changes at any time, so clients revalidate on every poll (and get a
+# 304 while nothing changed). The config only changes with a redeploy.
+HEALTH_CACHE_CONTROL = "no-cache"
+CONFIG_CACHE_CONTROL = "max-age=60, must-revalidate"
+
+# Endpoints that can wait on live connector checks; admission control and
+# per-client rate limits apply to these only.
+PROBE_ENDPOINTS = frozenset({"api.health", "api.db_status", "api.db_status_batch"})
+
+# Each history window is a separate pass over the stored slots.
+MAX_HISTORY_WINDOWS = 8
 
 
 def _settings():
@@ -17,67 +41,366 @@ def _registry():
     return current_app.config["db_registry"]
 
 
-def _socketio():
-    return current_app.extensions.get("socketio")
+def _health():
+    return current_app.config["health_cache"]
+
+
+def _broadcaster():
+    return current_app.config.get("broadcaster")
+
+
+def _client_key() -> str:
+    header = _settings().admission.client_header
+    value = request.headers.get(header, "") if header else ""
+    # Proxies append to X-Forwarded-For; the first entry is the client.
+    return value.split(",")[0].strip() or request.remote_addr or "unknown"
+
+
+def _split(value: Optional[str]) -> Optional[List[str]]:
+    """Comma separated query value as a list; None when absent or empty."""
+    if value is None:
+        return None
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    return items or None
+
+
+def _unknown_connectors(names: Optional[List[str]]) -> Optional[str]:
+    known = _registry().names()
+    unknown = [name for name in names or [] if name not in known]
+    if not unknown:
+        return None
+    return f"Unknown data source{'s' if len(unknown) > 1 else ''} {', '.join(repr(name) for name in unknown)}"
+
+
+def _project(report: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Keep only ``fields`` of each entry, so nothing else is serialized."""
+    if fields is None:
+        return report
+    return {name: {key: entry[key] for key in fields if key in entry} for name, entry in report.items()}
+
+
+@api_bp.before_request
+def _start_timer() -> None:
+    g.request_started = perf_counter()
+
+
+@api_bp.before_request
+def _rate_limit() -> None:
+    admission = current_app.config.get("admission")
+    if admission is not None and request.endpoint in PROBE_ENDPOINTS:
+        admission.admit(_client_key(), request.endpoint)
+
+
+@api_bp.errorhandler(Overloaded)
+def _overloaded(exc: Overloaded):
+    response = jsonify({"error": str(exc)})
+    response.headers["Retry-After"] = str(max(math.ceil(exc.retry_after), 1))
+    return response, exc.status
+
+
+@api_bp.after_request
+def _record_latency(response: Response) -> Response:
+    started = g.pop("request_started", None)
+    if started is not None:
+        rule = request.url_rule.rule if request.url_rule else "unmatched"
+        HTTP_LATENCY.observe(
+            perf_counter() - started,
+            method=request.method,
+            route=rule,
+            status=str(response.status_code),
+        )
+    return response
+
+
+@metrics_bp.get("/metrics")
+def metrics_view() -> Response:
+    return Response(REGISTRY.render(), mimetype=None, content_type=CONTENT_TYPE)
 
 
 @api_bp.get("/health")
 def health() -> Response:
-    registry = _registry()
-    report = registry.summary()
-    payload = {
-        "service": _settings().app.name,
-        "version": _settings().app.version,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+    names = _split(request.args.get("connectors"))
+    fields = _split(request.args.get("fields"))
+    error = _unknown_connectors(names)
+    if error:
+        return jsonify({"error": error}), 400
+
+    report = _health().summary(gated=True, names=names)
+    databases = _project(report["report"], fields)
+    selective = names is not None or fields is not None
+    # Narrow consumers (e.g. load balancer checks) only get what they asked for.
+    monitor = None if selective else current_app.config.get("hub_monitor")
+    event_loop = monitor.summary() if monitor is not None else None
+    # The ETag follows the snapshot version, not the body: latencies and ages
+    # differ on every sample and would defeat revalidation. Stale flags and
+    # pending or timed-out checks are not versioned, so they are added here.
+    content = {
+        "version": report["version"],
+        "selection": [names, fields],
         "counters": report["counters"],
-        "databases": report["report"],
+        "stale": sorted(name for name, entry in report["report"].items() if entry.get("stale")),
+        "event_loop": event_loop,
     }
-    return jsonify(payload)
+
+    def render() -> bytes:
+        payload = {
+            "service": _settings().app.name,
+            "version": _settings().app.version,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "counters": report["counters"],
+            "databases": databases,
+        }
+        if event_loop is not None:
+            payload["event_loop"] = event_loop
+        return jsonify(payload).get_data()
+
+    route = "health"
+    if selective:
+        route = f"health?connectors={','.join(names or [])}&fields={','.join(fields or [])}"
+    representation = current_app.config["representations"].get(route, content, render)
+    return conditional_response(representation, HEALTH_CACHE_CONTROL)
 
 
 @api_bp.get("/config")
 def config_view() -> Response:
-    return jsonify(_settings().safe_export())
+    exported = _settings().safe_export()
+    representation = current_app.config["representations"].get(
+        "config", exported, lambda: jsonify(exported).get_data()
+    )
+    return conditional_response(representation, CONFIG_CACHE_CONTROL)
 
 
 @api_bp.get("/db/<string:name>/status")
 def db_status(name: str) -> Response:
-    registry = _registry()
     try:
-        status = registry.status_for(name)
+        status = _health().status_for(name, gated=True)
     except KeyError:
         return jsonify({"error": f"Unknown data source '{name}'"}), 404
     return jsonify({"name": name, **status})
 
 
+@api_bp.post("/db/status")
+def db_status_batch() -> Response:
+    payload = request.get_json(silent=True)
+    if payload is None:
+        payload = {}
+    if not isinstance(payload, dict):
+        return jsonify({"error": "Body must be a JSON object"}), 400
+    selection = {}
+    for key in ("connectors", "fields"):
+        value = payload.get(key)
+        if value is not None and not (isinstance(value, list) and all(isinstance(item, str) for item in value)):
+            return jsonify({"error": f"{key} must be a list of names"}), 400
+        selection[key] = value or None
+    error = _unknown_connectors(selection["connectors"])
+    if error:
+        return jsonify({"error": error}), 400
+
+    report = _health().summary(gated=True, names=selection["connectors"])
+    return jsonify(
+        {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "counters": report["counters"],
+            "databases": _project(report["report"], selection["fields"]),
+        }
+    )
+
+
+@api_bp.get("/db/<string:name>/history")
+def db_history(name: str) -> Response:
+    try:
+        history = _registry().history_for(name)
+    except KeyError:
+        return jsonify({"error": f"Unknown data source '{name}'"}), 404
+
+    windows = _settings().probe.history_windows
+    raw_windows = request.args.get("windows")
+    if raw_windows:
+        try:
+            windows = [float(item) for item in raw_windows.split(",") if item.strip()]
+            valid = all(math.isfinite(window) and window > 0 for window in windows)
+        except ValueError:
+            valid = False
+        if not valid or len(set(windows)) != len(windows) or len(windows) > MAX_HISTORY_WINDOWS:
+            return jsonify(
+                {
+                    "error": "windows must be a comma separated list of at most "
+                    f"{MAX_HISTORY_WINDOWS} distinct positive seconds"
+                }
+            ), 400
+    limit = request.args.get("samples", default=0, type=int)
+    return jsonify(
+        {
+            "name": name,
+            "max_window_s": history.max_window,
+            "windows": history.windows(windows),
+            "samples": history.samples(limit) if limit > 0 else [],
+        }
+    )
+
+
+def _jobs():
+    return current_app.config["job_queue"]
+
+
 @api_bp.post("/jobs")
 def create_job() -> Response:
     payload: Dict[str, Any] = request.get_json(silent=True) or {}
-    job_id = str(uuid4())
     job_type = payload.get("type", "deploy:smoke-test")
-    job = {
-        "id": job_id,
-        "type": job_type,
-        "status": "queued",
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "payload": payload.get("data", {}),
-    }
+    try:
+        job = _jobs().submit(job_type, payload.get("data", {}))
+    except QueueFull:
+        response = jsonify({"error": "Job queue is full, retry later"})
+        response.headers["Retry-After"] = "1"
+        return response, 429
+
+    broadcaster = _broadcaster()
+    if broadcaster:
+        # Only clients subscribed to the jobs:created event room receive it.
+        broadcaster.emit("jobs:created", job.to_dict(), JOBS_CREATED_ROOM)
+    return jsonify(job.to_dict()), 202
+
 
-    socketio = _socketio()
-    if socketio:
-        # Broadcast to all connected clients (no `to`/`room` means send to
-        # everyone). The `broadcast` keyword is not supported by the
-        # python-socketio server and would raise TypeError.
-        socketio.emit("jobs:created", job)
-    return jsonify(job), 202
+@api_bp.get("/jobs")
+def list_jobs() -> Response:
+    queue = _jobs()
+    limit = min(max(request.args.get("limit", default=50, type=int), 1), 500)
+    jobs = queue.recent(limit=limit, status=request.args.get("status"))
+    return jsonify({"jobs": [job.to_dict() for job in jobs], "queued": queue.depth()})
+
+
+@api_bp.get("/jobs/<string:job_id>")
+def job_status(job_id: str) -> Response:
+    job = _jobs().get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown job '{job_id}'"}), 404
+    return jsonify(job.to_dict())
+
+
+def _parse_time(value: str) -> datetime:
+    """ISO-8601 timestamp (UTC when no offset is given) or epoch seconds."""
+    try:
+        parsed = datetime.fromtimestamp(float(value), tz=timezone.utc)
+    except ValueError:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+@api_bp.get("/events")
+def list_events() -> Response:
+    event_log = current_app.config.get("event_log")
+    if event_log is None:
+        return jsonify({"error": "Event log is disabled (EVENT_LOG=none)"}), 404
+    bounds = {}
+    for key in ("since", "until"):
+        raw = request.args.get(key)
+        if raw:
+            try:
+                bounds[key] = _parse_time(raw)
+            except ValueError:
+                return jsonify({"error": f"{key} must be an ISO-8601 timestamp or epoch seconds"}), 400
+    kind = request.args.get("kind")
+    if kind and kind not in EVENT_KINDS:
+        return jsonify({"error": f"kind must be one of {', '.join(EVENT_KINDS)}"}), 400
+    limit = min(max(request.args.get("limit", default=100, type=int), 1), 1000)
+    events = event_log.query(
+        since=bounds.get("since"),
+        until=bounds.get("until"),
+        kind=kind,
+        source=request.args.get("source"),
+        limit=limit,
+    )
+    return jsonify({"events": events, "count": len(events), "pending": event_log.pending()})
+
+
+def _body_stream():
+    """The request body stream, including chunked uploads.
+
+    Werkzeug hands out an empty stream for bodies without a Content-Length
+    unless the server sets ``wsgi.input_terminated``; eventlet's server does
+    not, but its ``wsgi.input`` already decodes chunked transfer encoding and
+    ends at the last chunk, so it is read directly in that case.
+    """
+    if request.content_length is None and "chunked" in request.headers.get("Transfer-Encoding", "").lower():
+        return get_input_stream(request.environ, safe_fallback=False)
+    return request.stream
+
+
+def _too_large(limit: int) -> Response:
+    response = jsonify({"error": f"Request body exceeds {limit} bytes"})
+    response.status_code = 413
+    return response
 
 
 @api_bp.post("/echo")
 def echo() -> Response:
-    body = request.get_json(silent=True) or {}
+    """Echo the request body.
+
+    ``?mode=json`` (default) parses a JSON body and returns it under
+    ``received``. ``?mode=stream`` pipes the raw body back chunk by chunk
+    without parsing; ``?mode=summary`` reads it the same way and returns only
+    byte counts and timings. All modes read at most ``ECHO_MAX_BYTES``, with
+    memory bounded by ``ECHO_CHUNK_BYTES`` in the streaming modes.
+    """
+    config = _settings().app
+    mode = request.args.get("mode", "json")
+    if mode not in ECHO_MODES:
+        return jsonify({"error": f"mode must be one of {', '.join(ECHO_MODES)}"}), 400
+    limit = config.echo_max_bytes
+    if request.content_length is not None and request.content_length > limit:
+        return _too_large(limit)
+
+    meter = EchoMeter(mode)
     metadata = {
         "method": request.method,
         "path": request.path,
         "headers": {k: v for k, v in request.headers.items() if k.lower().startswith("x-")},
     }
+    if mode == "stream":
+        chunks = read_body(_body_stream(), config.echo_chunk_bytes, limit, meter)
+        try:
+            # Read ahead one chunk so an empty or oversized first chunk still
+            # gets a proper status before the response starts.
+            first = next(chunks, b"")
+        except BodyTooLarge:
+            return _too_large(limit)
+
+        def generate() -> Iterator[bytes]:
+            try:
+                if first:
+                    yield first
+                # Past this point the status is sent; a body that outgrows
+                # the limit ends the response early instead.
+                yield from chunks
+            except BodyTooLarge:
+                current_app.logger.warning("Streaming echo cut off at %s bytes", limit)
+            finally:
+                meter.finish()
+
+        response = Response(
+            stream_with_context(generate()),
+            mimetype=request.mimetype or "application/octet-stream",
+        )
+        response.headers["X-Echo-Max-Bytes"] = str(limit)
+        return response
+
+    try:
+        raw = b"".join(read_body(_body_stream(), config.echo_chunk_bytes, limit, meter))
+    except BodyTooLarge:
+        return _too_large(limit)
+    finally:
+        meter.finish()
+    metadata.update(meter.to_dict())
+    if mode == "summary":
+        return jsonify({"metadata": metadata})
+
+    body: Any = {}
+    if raw and request.is_json:
+        try:
+            body = parse_json(raw) or {}
+        except NonStandardJSON as exc:
+            return jsonify({"error": str(exc)}), 400
+        except ValueError:
+            # Same leniency as request.get_json(silent=True).
+            body = {}
     return jsonify({"received": body, "metadata": metadata})
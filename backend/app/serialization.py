@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict
+from uuid import UUID
+
+from flask.json.provider import JSONProvider
+
+
+def _default(value: Any) -> Any:
+    """Fallback for types the encoders do not handle natively."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class JSONSerializer:
+    """Stdlib encoder, always available.
+
+    Serializers expose the module-style ``dumps``/``loads`` pair that
+    python-socketio and python-engineio accept as ``json=`` (extra keyword
+    arguments such as ``separators`` are ignored: output is always compact)
+    plus ``dumps_bytes`` for HTTP responses.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any, sort_keys: bool = False, **kwargs: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys, default=_default)
+
+    def dumps_bytes(self, obj: Any, sort_keys: bool = False) -> bytes:
+        return self.dumps(obj, sort_keys=sort_keys).encode()
+
+    def loads(self, data: Any, **kwargs: Any) -> Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer(JSONSerializer):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS
+        self._sorted = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+
+    def dumps_bytes(self, obj: Any, sort_keys: bool = False) -> bytes:
+        try:
+            return self._orjson.dumps(obj, default=_default, option=self._sorted if sort_keys else self._options)
+        except self._orjson.JSONEncodeError:
+            # orjson only handles 64-bit integers; stdlib json takes any
+            # size (and still raises for types neither can encode).
+            return JSONSerializer.dumps(self, obj, sort_keys=sort_keys).encode()
+
+    def dumps(self, obj: Any, sort_keys: bool = False, **kwargs: Any) -> str:
+        return self.dumps_bytes(obj, sort_keys).decode()
+
+    def loads(self, data: Any, **kwargs: Any) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgspecSerializer(JSONSerializer):
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._encoder = msgspec.json.Encoder(enc_hook=_default)
+        self._sorted = msgspec.json.Encoder(enc_hook=_default, order="sorted")
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps_bytes(self, obj: Any, sort_keys: bool = False) -> bytes:
+        return (self._sorted if sort_keys else self._encoder).encode(obj)
+
+    def dumps(self, obj: Any, sort_keys: bool = False, **kwargs: Any) -> str:
+        return self.dumps_bytes(obj, sort_keys).decode()
+
+    def loads(self, data: Any, **kwargs: Any) -> Any:
+        return self._decoder.decode(data)
+
+
+SERIALIZERS: Dict[str, Callable[[], JSONSerializer]] = {
+    "orjson": OrjsonSerializer,
+    "msgspec": MsgspecSerializer,
+    "json": JSONSerializer,
+}
+
+
+def get_serializer(name: str = "auto") -> JSONSerializer:
+    """Return the serializer called ``name``; ``auto`` picks the first of
+    orjson, msgspec and stdlib json that can be imported."""
+    if name != "auto":
+        if name not in SERIALIZERS:
+            raise ValueError(f"Unknown JSON serializer '{name}' (auto, {', '.join(SERIALIZERS)})")
+        return SERIALIZERS[name]()
+    for factory in SERIALIZERS.values():
+        try:
+            return factory()
+        except ImportError:
+            continue
+    return JSONSerializer()  # pragma: no cover - stdlib is always last
+
+
+class SerializerJSONProvider(JSONProvider):
+    """Flask JSON provider backed by a ``JSONSerializer``.
+
+    Keys are sorted like Flask's default provider, so response bodies stay
+    byte-for-byte stable for a given payload.
+    """
+
+    serializer: JSONSerializer = JSONSerializer()
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self.serializer.dumps(obj, sort_keys=True)
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return self.serializer.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = self.serializer.dumps_bytes(obj, sort_keys=True) + b"\n"
+        return self._app.response_class(body, mimetype="application/json")
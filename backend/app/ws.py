@@ -1,20 +1,99 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable, Dict, List, Optional
 
-from flask_socketio import SocketIO, emit
+from flask import request
+from flask_socketio import SocketIO, emit, join_room, leave_room
 
 from .config import Settings
-from .database import DatabaseRegistry
+from .health import HealthCache
+from .metrics import SOCKET_CLIENTS, SOCKET_EMITS
+from .rooms import (
+    HEALTH_ROOM,
+    JOBS_UPDATE_ROOM,
+    Broadcaster,
+    connector_room,
+    job_room,
+    valid_room,
+)
 
 _health_task_started = False
 
 
-def register_socketio_handlers(socketio: SocketIO, registry: DatabaseRegistry, settings: Settings) -> None:
+def _emit(event: str, payload: Any) -> None:
+    SOCKET_EMITS.inc(event=event)
+    emit(event, payload)
+
+
+def health_message(seq: int, databases: Dict[str, Any], base: Optional[int] = None) -> Dict[str, Any]:
+    """Build a ``health:update`` payload.
+
+    A full snapshot has ``full: true`` and every connector. A patch has
+    ``full: false``, only the connectors that changed, and ``base``: the
+    sequence it applies on top of. A client whose last seen ``seq`` is lower
+    than ``base`` has missed a patch and should emit ``health:resync``.
+    """
+    message: Dict[str, Any] = {
+        "seq": seq,
+        "full": base is None,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "databases": databases,
+    }
+    if base is not None:
+        message["base"] = base
+    return message
+
+
+INVALID_JOB_ROOM = {"error": 'jobs:subscribe and jobs:unsubscribe expect {"id": "<job id>"}'}
+
+
+def _requested_rooms(data: Any, connectors: List[str]) -> List[str]:
+    rooms = (data or {}).get("rooms") if isinstance(data, dict) else data
+    if isinstance(rooms, str):
+        rooms = [rooms]
+    if not isinstance(rooms, list):
+        return []
+    return [room for room in rooms if valid_room(room, connectors)]
+
+
+def _requested_job_room(data: Any) -> Optional[str]:
+    if not isinstance(data, dict):
+        return None
+    room = job_room(data.get("id"))
+    return room if valid_room(room) else None
+
+
+def register_socketio_handlers(
+    socketio: SocketIO,
+    health: HealthCache,
+    broadcaster: Broadcaster,
+    settings: Settings,
+) -> None:
+    directory = broadcaster.directory
+
+    def _push_snapshot(connector: Optional[str] = None) -> None:
+        seq, report = health.snapshot(names=None if connector is None else [connector])
+        _emit("health:update", health_message(seq, report))
+
+    def _join(room: str) -> None:
+        if not directory.join(request.sid, room):
+            return
+        join_room(room)
+        # Give new health subscribers a baseline for the patches that follow.
+        if room == HEALTH_ROOM:
+            _push_snapshot()
+        elif room.startswith("connector:"):
+            _push_snapshot(room.partition(":")[2])
+
+    def _leave(room: str) -> None:
+        leave_room(room)
+        directory.leave(request.sid, room)
+
     @socketio.on("connect")
     def handle_connect():  # pragma: no cover - exercised via runtime
-        emit(
+        SOCKET_CLIENTS.inc()
+        _emit(
             "system",
             {
                 "message": "Connected to auto-deployment lab",
@@ -23,40 +102,125 @@ def register_socketio_handlers(socketio: SocketIO, registry: DatabaseRegistry, s
                 "timestamp": datetime.now(timezone.utc).isoformat(),
             },
         )
-        emit("health:update", registry.report())
+
+    @socketio.on("disconnect")
+    def handle_disconnect():  # pragma: no cover - exercised via runtime
+        SOCKET_CLIENTS.dec()
+        directory.drop(request.sid)
+
+    @socketio.on("subscribe")
+    def subscribe(data: Any):  # pragma: no cover - exercised via runtime
+        for room in _requested_rooms(data, health.registry.names()):
+            _join(room)
+        return {"rooms": directory.rooms_of(request.sid)}
+
+    @socketio.on("unsubscribe")
+    def unsubscribe(data: Any):  # pragma: no cover - exercised via runtime
+        for room in _requested_rooms(data, health.registry.names()):
+            _leave(room)
+        return {"rooms": directory.rooms_of(request.sid)}
 
     @socketio.on("health:request")
     def push_health():  # pragma: no cover - exercised via runtime
-        emit("health:update", registry.report())
+        _push_snapshot()
+
+    @socketio.on("health:resync")
+    def resync_health():  # pragma: no cover - exercised via runtime
+        _push_snapshot()
+
+    @socketio.on("jobs:subscribe")
+    def subscribe_job(data: Any):  # pragma: no cover - exercised via runtime
+        room = _requested_job_room(data)
+        if room is None:
+            return INVALID_JOB_ROOM
+        _join(room)
+        return {"rooms": directory.rooms_of(request.sid)}
+
+    @socketio.on("jobs:unsubscribe")
+    def unsubscribe_job(data: Any):  # pragma: no cover - exercised via runtime
+        room = _requested_job_room(data)
+        if room is None:
+            return INVALID_JOB_ROOM
+        _leave(room)
+        return {"rooms": directory.rooms_of(request.sid)}
 
     @socketio.on("jobs:simulate")
     def simulate_job(data: Any):  # pragma: no cover - exercised via runtime
-        emit(
-            "jobs:update",
-            {
-                "stage": data.get("stage", "deploy"),
-                "status": data.get("status", "running"),
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            }
-            # broadcast=True,
-        )
+        update = {
+            "stage": data.get("stage", "deploy"),
+            "status": data.get("status", "running"),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+        _emit("jobs:update", update)
+        # Other watchers of the jobs:update event see it too; the sender
+        # already has its copy.
+        broadcaster.emit("jobs:update", update, JOBS_UPDATE_ROOM, skip_sid=request.sid)
+
+
+def next_health_patch(
+    health: HealthCache,
+    last_seq: int,
+    connector: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """Return the patch to broadcast after ``last_seq``, or None when unchanged.
+
+    With ``connector`` set the patch only carries that connector's entry and
+    is None unless that entry changed.
+    """
+    seq, changes = health.changes_since(last_seq)
+    if connector is not None:
+        changes = {connector: changes[connector]} if connector in changes else {}
+        if not changes:
+            return None
+    if seq == last_seq:
+        return None
+    return health_message(seq, changes, base=last_seq)
+
+
+def broadcast_health(health: HealthCache, broadcaster: Broadcaster, last_sent: Dict[str, int]) -> None:
+    """Send pending patches to the health event room and each connector room.
+
+    ``last_sent`` maps room to the last sequence sent there; rooms without
+    subscribers are skipped without building a payload.
+    """
+    # Refreshes expired snapshots when no sampler is running; a no-op read
+    # otherwise.
+    health.report()
+    targets = {HEALTH_ROOM: None}
+    targets.update({connector_room(name): name for name in health.registry.names()})
+    for room, connector in targets.items():
+        if not broadcaster.has_subscribers(room):
+            continue
+        patch = next_health_patch(health, last_sent.get(room, 0), connector)
+        if patch is None:
+            continue
+        broadcaster.emit("health:update", patch, room)
+        last_sent[room] = patch["seq"]
+
 
+def start_health_push(
+    socketio: SocketIO,
+    health: HealthCache,
+    broadcaster: Broadcaster,
+    settings: Settings,
+    active: Optional[Callable[[], bool]] = None,
+) -> None:
+    """Start the ``health:update`` broadcast loop.
 
-def start_health_push(socketio: SocketIO, registry: DatabaseRegistry, settings: Settings) -> None:
+    ``active`` lets a multi-worker deployment restrict broadcasting to the
+    elected leader when a message queue already delivers its patches to the
+    clients of every worker.
+    """
     global _health_task_started
     if _health_task_started:
         return
 
     def _loop():  # pragma: no cover - exercised via runtime
+        last_sent: Dict[str, int] = {}
         while True:
             socketio.sleep(settings.app.broadcast_interval)
-            socketio.emit(
-                "health:update",
-                {
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                    "databases": registry.report(),
-        },
-            )
+            if active is None or active():
+                broadcast_health(health, broadcaster, last_sent)
 
     _health_task_started = True
     socketio.start_background_task(_loop)
@@ -0,0 +1 @@
+"""Offline benchmarks for the backend; run them from the ``backend`` directory."""
@@ -0,0 +1,197 @@
+"""Load benchmark for the REST and Socket.IO paths.
+
+Runs entirely in-process: the app comes from ``create_app(Settings.for_testing())``
+with stand-in connectors whose latency and failure rate are configurable, HTTP
+traffic goes through Flask's test client and Socket.IO traffic through
+Flask-SocketIO test clients. Results are printed (or written) as JSON so runs
+can be compared between releases::
+
+    python -m benchmarks.load --requests 2000 --concurrency 32 --clients 200
+"""
+
+from __future__ import annotations
+
+# Patch before anything imports threading or concurrent.futures, as main.py
+# does; locks created before patching deadlock once green threads use them.
+import eventlet
+
+eventlet.monkey_patch()
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from app import create_app
+from app.config import Settings
+from app.database import BaseConnector
+from app.rooms import HEALTH_ROOM
+from app.ws import broadcast_health
+
+
+class StubConnector(BaseConnector):
+    """Connector that sleeps instead of talking to a database."""
+
+    def __init__(self, name: str, latency_ms: float, failure_rate: float, seed: Optional[int] = None):
+        super().__init__(name)
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+
+    def configured(self) -> bool:
+        return True
+
+    def ping(self) -> Dict[str, Any]:
+        time.sleep(self.latency_ms / 1000)
+        if self._random.random() < self.failure_rate:
+            raise ConnectionError("simulated failure")
+        return {"latency_ms": self.latency_ms, "connect_ms": 0.0}
+
+
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(values)
+
+    def pick(quantile: float) -> float:
+        return round(ordered[max(0, math.ceil(quantile * len(ordered)) - 1)], 3)
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1], 3)}
+
+
+def build_app(args: argparse.Namespace):
+    settings = Settings.for_testing()
+    settings.probe.cache_ttl = args.cache_ttl
+    settings.jobs.queue_size = max(args.requests, 1)
+    app, socketio = create_app(settings)
+    registry = app.config["db_registry"]
+    for index, name in enumerate(registry.names()):
+        registry.register(StubConnector(name, args.latency_ms, args.failure_rate, seed=index), name)
+    return app, socketio
+
+
+def drive_http(app, method: str, path: str, body: Any, total: int, concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    def one(_: int) -> None:
+        client = app.test_client()
+        call: Callable[..., Any] = getattr(client, method)
+        start = time.perf_counter()
+        response = call(path, json=body) if body is not None else call(path)
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+            key = str(response.status_code)
+            statuses[key] = statuses.get(key, 0) + 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    wall = time.perf_counter() - start
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "wall_s": round(wall, 3),
+        "req_per_s": round(total / wall, 1) if wall else None,
+        "latency_ms": percentiles(latencies),
+        "status_codes": statuses,
+    }
+
+
+def drive_broadcasts(app, socketio, clients: int, rounds: int) -> Dict[str, Any]:
+    health = app.config["health_cache"]
+    broadcaster = app.config["broadcaster"]
+    sockets = [socketio.test_client(app) for _ in range(clients)]
+    for client in sockets:
+        client.emit("subscribe", {"rooms": [HEALTH_ROOM]})
+        client.get_received()
+
+    names = health.registry.names()
+    last_sent: Dict[str, int] = {}
+    fanout_ms: List[float] = []
+    delivered = 0
+    for round_number in range(rounds):
+        # Flip one connector between ok and error so every round changes
+        # state and produces a patch; new measurements alone would not.
+        name = names[round_number % len(names)]
+        current = health.export().get(name, {}).get("entry", {})
+        if current.get("status") == "error":
+            entry = {"status": "ok", "latency_ms": float(round_number)}
+        else:
+            entry = {"status": "error", "error": f"simulated outage {round_number}"}
+        health.publish(name, entry)
+        start = time.perf_counter()
+        broadcast_health(health, broadcaster, last_sent)
+        fanout_ms.append((time.perf_counter() - start) * 1000)
+        for client in sockets:
+            delivered += sum(1 for packet in client.get_received() if packet["name"] == "health:update")
+
+    for client in sockets:
+        client.disconnect()
+    return {
+        "clients": clients,
+        "rounds": rounds,
+        "delivered": delivered,
+        "expected": clients * rounds,
+        # Test clients receive synchronously, so the time to finish one
+        # broadcast is the lag of the last recipient.
+        "delivery_lag_ms": percentiles(fanout_ms),
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    app, socketio = build_app(args)
+    results: Dict[str, Any] = {
+        "meta": {
+            "python": platform.python_version(),
+            "started_at": time.time(),
+            "latency_ms": args.latency_ms,
+            "failure_rate": args.failure_rate,
+            "cache_ttl": args.cache_ttl,
+        },
+        "http": {
+            "health": drive_http(app, "get", "/api/health", None, args.requests, args.concurrency),
+            "echo": drive_http(app, "post", "/api/echo", {"hello": "world", "n": list(range(20))}, args.requests, args.concurrency),
+            "jobs": drive_http(app, "post", "/api/jobs", {"type": "deploy:bench"}, args.requests, args.concurrency),
+        },
+    }
+    if args.clients:
+        results["socketio"] = drive_broadcasts(app, socketio, args.clients, args.rounds)
+    return results
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000, help="requests per HTTP endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--clients", type=int, default=100, help="concurrent Socket.IO clients (0 to skip)")
+    parser.add_argument("--rounds", type=int, default=20, help="health broadcasts to send")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="stand-in connector latency")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="stand-in connector failure probability")
+    parser.add_argument("--cache-ttl", type=float, default=5.0, help="health snapshot TTL in seconds")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    results = run(args)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""Micro-benchmark for the JSON serializers on health payloads.
+
+Encodes and decodes a full ``health:update`` snapshot and a latency history
+response with every serializer that can be imported (stdlib json, orjson,
+msgspec), and compares encoding a broadcast once against encoding it once
+per recipient::
+
+    python -m benchmarks.serialization --connectors 12 --clients 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from app.serialization import SERIALIZERS, JSONSerializer
+from app.ws import health_message
+
+
+def health_payload(connectors: int) -> Dict[str, Any]:
+    """A full ``health:update`` message shaped like the sampler's output."""
+    now = datetime.now(timezone.utc).isoformat()
+    databases = {}
+    for index in range(connectors):
+        databases[f"connector-{index}"] = {
+            "status": "ok" if index % 5 else "error",
+            "checked_at": now,
+            "latency_ms": 1.25 + index,
+            "connect_ms": 0.04,
+            "age_ms": 812.5,
+            "role": "master",
+            "connected_slaves": 2,
+            "database": "deployments",
+            "error": None if index % 5 else "connection refused",
+            "breaker": {"state": "closed", "failures": 0, "trips": index % 3, "retry_at": None},
+        }
+    return health_message(42, databases)
+
+
+def history_payload(samples: int) -> Dict[str, Any]:
+    start = time.time()
+    stats = {"window_s": 300.0, "count": samples, "errors": 1, "p50": 1.2, "p95": 3.4, "p99": 7.9, "max": 12.0}
+    return {
+        "connector": "postgres",
+        "windows": {"60": stats, "300": stats, "3600": stats},
+        "samples": [{"at": start + i, "latency_ms": 1.0 + (i % 7) / 3, "ok": i % 50 != 0} for i in range(samples)],
+    }
+
+
+def best_of(repeat: int, number: int, func: Callable[[], Any]) -> float:
+    """Best per-call time in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return round(best * 1e6, 3)
+
+
+def available() -> Dict[str, JSONSerializer]:
+    found = {}
+    for name, factory in SERIALIZERS.items():
+        try:
+            found[name] = factory()
+        except ImportError:
+            continue
+    return found
+
+
+def measure(serializer: JSONSerializer, payload: Any, args: argparse.Namespace) -> Dict[str, Any]:
+    encoded = serializer.dumps(payload)
+    return {
+        "bytes": len(encoded.encode()),
+        "dumps_us": best_of(args.repeat, args.number, lambda: serializer.dumps(payload)),
+        "loads_us": best_of(args.repeat, args.number, lambda: serializer.loads(encoded)),
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    payloads = {"health": health_payload(args.connectors), "history": history_payload(args.samples)}
+    serializers = available()
+    results: Dict[str, Any] = {
+        "meta": {
+            "python": platform.python_version(),
+            "serializers": list(serializers),
+            "connectors": args.connectors,
+            "samples": args.samples,
+            "clients": args.clients,
+        },
+        "payloads": {},
+        "broadcast": {},
+    }
+    for label, payload in payloads.items():
+        rows = {name: measure(serializer, payload, args) for name, serializer in serializers.items()}
+        baseline = rows["json"]["dumps_us"]
+        for row in rows.values():
+            row["dumps_speedup"] = round(baseline / row["dumps_us"], 2) if row["dumps_us"] else None
+        results["payloads"][label] = rows
+
+    # What a broadcast costs to encode when every recipient gets its own
+    # encode versus one encode shared by all recipients (what the Socket.IO
+    # manager does for room emits).
+    health = payloads["health"]
+    for name, serializer in serializers.items():
+        once = best_of(args.repeat, args.number, lambda: serializer.dumps(health))
+        results["broadcast"][name] = {
+            "per_client_us": round(once * args.clients, 3),
+            "encode_once_us": once,
+        }
+    return results
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connectors", type=int, default=12, help="connectors in the health payload")
+    parser.add_argument("--samples", type=int, default=200, help="raw samples in the history payload")
+    parser.add_argument("--clients", type=int, default=200, help="recipients of one broadcast")
+    parser.add_argument("--number", type=int, default=500, help="calls per timing run")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs; the best is reported")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    results = run(args)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
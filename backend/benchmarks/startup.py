@@ -0,0 +1,138 @@
+"""Startup and import-time report.
+
+Starts a fresh interpreter under ``python -X importtime`` that imports the
+app and builds it the way ``main.py`` does, then reports the import and
+app-factory wall time, the packages that cost the most to import and which
+database drivers ended up loaded::
+
+    python -m benchmarks.startup --runs 5 --top 15
+    python -m benchmarks.startup --env POSTGRES_DSN=host=db --env REDIS_URL=redis://cache:6379/0
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+# Driver packages a connector imports only when it is configured.
+DRIVERS = ("pymongo", "psycopg2", "redis", "motor", "asyncpg")
+
+_CHILD = """
+import json, os, sys, time
+start = time.perf_counter()
+if os.environ.get("SERVER_MODE") == "asgi":
+    from app.asgi import create_asgi_app as factory
+else:
+    from app import create_app as factory
+imported = time.perf_counter()
+factory()
+created = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "create_ms": (created - imported) * 1000,
+    "drivers": sorted(name for name in %r if name in sys.modules),
+}))
+sys.stdout.flush()
+os._exit(0)
+""" % (DRIVERS,)
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Rows of ``-X importtime`` output as ``{module, self_us, cumulative_us, depth}``."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append(
+            {
+                "module": name.strip(),
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": (len(name) - len(name.lstrip())) // 2,
+            }
+        )
+    return rows
+
+
+def by_package(rows: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Self import time in milliseconds summed per top-level package."""
+    totals: Dict[str, float] = {}
+    for row in rows:
+        package = row["module"].split(".")[0]
+        totals[package] = totals.get(package, 0.0) + row["self_us"] / 1000
+    return totals
+
+
+def run_once(env: Dict[str, str]) -> Dict[str, Any]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD],
+        cwd=BACKEND,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    if result.returncode != 0 or not result.stdout.strip():
+        raise RuntimeError(f"Startup run failed:\n{result.stderr[-2000:]}")
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["importtime"] = parse_importtime(result.stderr)
+    return timings
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    env = {**os.environ, "ENABLE_BACKGROUND_TASKS": "false", "SERVER_MODE": args.mode}
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    for item in args.env:
+        key, _, value = item.partition("=")
+        env[key] = value
+    runs = [run_once(env) for _ in range(args.runs)]
+    rows = runs[-1]["importtime"]
+    packages = sorted(by_package(rows).items(), key=lambda item: item[1], reverse=True)
+    return {
+        "meta": {"python": platform.python_version(), "mode": args.mode, "runs": args.runs},
+        "import_ms": round(statistics.median(run["import_ms"] for run in runs), 1),
+        "create_app_ms": round(statistics.median(run["create_ms"] for run in runs), 1),
+        "modules_imported": len(rows),
+        "drivers_loaded": runs[-1]["drivers"],
+        "packages_ms": {name: round(ms, 1) for name, ms in packages[: args.top]},
+        "slowest_modules": [
+            {"module": row["module"], "self_ms": round(row["self_us"] / 1000, 1)}
+            for row in sorted(rows, key=lambda row: row["self_us"], reverse=True)[: args.top]
+        ],
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters to start; medians are reported")
+    parser.add_argument("--top", type=int, default=15, help="packages and modules to list")
+    parser.add_argument("--mode", choices=("eventlet", "asgi"), default="eventlet", help="SERVER_MODE to start")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="extra environment")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    results = run(args)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,27 +1,12 @@
 from __future__ import annotations
 
-import socket
-orig_gethostbyname = socket.gethostbyname
-orig_getaddrinfo = socket.getaddrinfo
-orig_gethostbyaddr = socket.gethostbyaddr
-orig_gethostbyname_ex = socket.gethostbyname_ex
-
-import eventlet
-eventlet.monkey_patch()
-
-# Restore original socket DNS functions to avoid greendns timeouts
-socket.gethostbyname = orig_gethostbyname
-socket.getaddrinfo = orig_getaddrinfo
-socket.gethostbyaddr = orig_gethostbyaddr
-socket.gethostbyname_ex = orig_gethostbyname_ex
-
+import os
 from pathlib import Path
 
-from app import create_app
-
 # Load .env automatically for local development (works with docker/docker-compose,
 # or when you want to avoid `export`-ing keys manually). This is a dev helper and
 # will silently no-op if python-dotenv is not installed or no .env file is found.
+# It runs first so SERVER_MODE from .env decides whether to monkey-patch.
 try:
     from dotenv import load_dotenv
 
@@ -31,12 +16,49 @@ try:
 except Exception:
     pass
 
-app, socketio = create_app()
+SERVER_MODE = os.environ.get("SERVER_MODE", "eventlet").strip().lower()
 
+if SERVER_MODE == "asgi":
+    # ``app`` is an ASGI application here, e.g. for
+    # ``gunicorn -k uvicorn.workers.UvicornWorker main:app``.
+    from app.asgi import create_asgi_app
+    from app.config import Settings
 
-def run_app():
+    settings = Settings.from_env()
+    app = create_asgi_app(settings)
+    socketio = None
+else:
+    # eventlet only skips its green resolver for "yes"; the blocking
+    # resolver is restored below either way.
+    os.environ.setdefault("EVENTLET_NO_GREENDNS", "yes")
+
+    import socket
+    orig_gethostbyname = socket.gethostbyname
+    orig_getaddrinfo = socket.getaddrinfo
+    orig_gethostbyaddr = socket.gethostbyaddr
+    orig_gethostbyname_ex = socket.gethostbyname_ex
+
+    import eventlet
+    eventlet.monkey_patch(psycopg=False)
+
+    # Restore original socket DNS functions to avoid greendns timeouts
+    socket.gethostbyname = orig_gethostbyname
+    socket.getaddrinfo = orig_getaddrinfo
+    socket.gethostbyaddr = orig_gethostbyaddr
+    socket.gethostbyname_ex = orig_gethostbyname_ex
+
+    from app import create_app
+
+    app, socketio = create_app()
     settings = app.config["settings"]
+
+def run_app():
     try:
+        if socketio is None:
+            import uvicorn
+
+            uvicorn.run(app, host=settings.app.host, port=settings.app.port)
+            return
         socketio.run(
             app,
             host=settings.app.host,
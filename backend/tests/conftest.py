@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, Optional
+
+import pytest
+
+from app.config import Settings
+from app.database import BaseConnector, DatabaseRegistry, _close_registries
+
+
+class StubConnector(BaseConnector):
+    """A connector that needs no server: it counts its checks, optionally
+    blocks on ``wait`` (e.g. a barrier) or sleeps ``delay`` seconds, and fails
+    while ``healthy`` is false. Extra keyword arguments are returned as fields
+    of the entry."""
+
+    def __init__(self, label: str, delay: float = 0.0, wait: Optional[Callable[[], object]] = None, breaker=None, **fields):
+        super().__init__(label, breaker=breaker)
+        self.delay = delay
+        self.wait = wait
+        self.fields = fields
+        self.healthy = True
+        self.calls = 0
+
+    def configured(self) -> bool:
+        return True
+
+    def ping(self):
+        self.calls += 1
+        if self.wait is not None:
+            self.wait()
+        if self.delay:
+            time.sleep(self.delay)
+        if not self.healthy:
+            raise ConnectionError("connection refused")
+        return {"latency_ms": 1.0, **self.fields}
+
+
+def stub_registry(*connectors: BaseConnector, settings: Optional[Settings] = None) -> DatabaseRegistry:
+    """A registry holding only ``connectors`` instead of the built-in ones."""
+    registry = DatabaseRegistry(settings or Settings.for_testing())
+    for name in registry.names():
+        registry.unregister(name)
+    for connector in connectors:
+        registry.register(connector)
+    return registry
+
+
+def wait_for(predicate: Callable[[], bool], timeout: float = 1.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.fixture(autouse=True)
+def close_registries():
+    """Close every registry a test leaves open, shutting down its probe threads."""
+    yield
+    _close_registries()
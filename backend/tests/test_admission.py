@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from app import create_app
+from app.admission import AdmissionController, MemoryRateLimiter, Overloaded, RedisRateLimiter
+from app.config import AdmissionSection, Settings
+from app.metrics import ADMISSION_QUEUE_WAIT, ADMISSION_SHED
+
+from .conftest import StubConnector
+
+
+def test_gate_queues_briefly_then_sheds():
+    admission = AdmissionController(AdmissionSection(max_inflight=1, queue_size=1, queue_timeout=0.1), retry_after=2)
+    full = ADMISSION_SHED.value(reason="queue_full", target="pg")
+    timed_out = ADMISSION_SHED.value(reason="queue_timeout", target="pg")
+    waits = ADMISSION_QUEUE_WAIT.count(connector="pg")
+
+    errors = []
+
+    def hold(seconds):
+        try:
+            with admission.waiting(["pg"]):
+                time.sleep(seconds)
+        except Overloaded as exc:
+            errors.append(exc)
+
+    holder = threading.Thread(target=hold, args=(0.3,))
+    queued = threading.Thread(target=hold, args=(0,))
+    holder.start()
+    time.sleep(0.02)
+    queued.start()
+    time.sleep(0.02)
+    with pytest.raises(Overloaded) as shed:
+        with admission.waiting(["pg"]):
+            pass
+    queued.join()
+    holder.join()
+    assert len(errors) == 1
+
+    assert shed.value.status == 503 and shed.value.retry_after == 2
+    assert ADMISSION_SHED.value(reason="queue_full", target="pg") == full + 1
+    assert ADMISSION_SHED.value(reason="queue_timeout", target="pg") == timed_out + 1
+    assert ADMISSION_QUEUE_WAIT.count(connector="pg") == waits + 1
+    # Slots are released: the next caller gets straight in.
+    with admission.waiting(["pg"]):
+        pass
+
+
+def test_requests_waiting_on_a_live_check_are_shed_with_503():
+    settings = Settings.for_testing()
+    settings.admission = AdmissionSection(max_inflight=1, queue_size=0)
+    app, _ = create_app(settings)
+    app.config["db_registry"].register(StubConnector("slow", 0.3))
+
+    responses = []
+
+    def get():
+        response = app.test_client().get("/api/db/slow/status")
+        responses.append(response)
+        return response
+
+    threads = [threading.Thread(target=get) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(response.status_code for response in responses) == [200, 503, 503]
+    shed = next(response for response in responses if response.status_code == 503)
+    assert shed.headers["Retry-After"] == "2"
+    # Once the snapshot is cached, requests no longer wait and are admitted.
+    assert get().status_code == 200
+
+
+def test_per_client_rate_limit():
+    settings = Settings.for_testing()
+    settings.admission = AdmissionSection(rate=1.0, burst=2, client_header="X-Forwarded-For")
+    app, _ = create_app(settings)
+    client = app.test_client()
+
+    def health(forwarded):
+        return client.get("/api/health", headers={"X-Forwarded-For": forwarded})
+
+    assert [health("10.0.0.1, 10.1.1.1").status_code for _ in range(2)] == [200, 200]
+    limited = health("10.0.0.1")
+    assert limited.status_code == 429 and limited.headers["Retry-After"] == "1"
+    assert health("10.0.0.2").status_code == 200
+    # Endpoints that never wait on probes are not limited.
+    assert client.get("/api/config", headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 200
+
+
+def test_rate_limiters_refill_and_fail_open():
+    limiter = MemoryRateLimiter(rate=100.0, burst=1, max_clients=1)
+    assert limiter.take("a") == 0
+    assert 0 < limiter.take("a") <= 0.01
+    time.sleep(0.02)
+    assert limiter.take("a") == 0
+    limiter.take("b")  # evicts "a"
+    assert limiter.take("a") == 0
+
+    unreachable = RedisRateLimiter("redis://127.0.0.1:1/0", "test", rate=1.0, burst=1, timeout=0.1)
+    assert unreachable.take("a") == 0
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.async_database import asyncpg_params
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+# Runs in a fresh interpreter: the test process itself is monkey-patched by
+# eventlet, which the ASGI mode must not be.
+SCRIPT = r'''
+import asyncio, json, sys
+
+from app.asgi import create_asgi_app
+from app.config import Settings
+
+
+async def request(app, path):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": [(b"host", b"test")],
+        "client": ("127.0.0.1", 1), "server": ("test", 80),
+    }
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    status = next(m["status"] for m in sent if m["type"] == "http.response.start")
+    body = b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+    return status, json.loads(body)
+
+
+async def main():
+    app = create_asgi_app(Settings.for_testing())
+    lifespan = asyncio.Queue()
+    started = asyncio.Event()
+
+    async def send(message):
+        if message["type"] == "lifespan.startup.complete":
+            started.set()
+
+    await lifespan.put({"type": "lifespan.startup"})
+    task = asyncio.create_task(app({"type": "lifespan", "asgi": {"version": "3.0"}}, lifespan.get, send))
+    await asyncio.wait_for(started.wait(), 5)
+    await asyncio.sleep(0.2)
+    health = await request(app, "/api/health")
+    config = await request(app, "/api/config")
+    await lifespan.put({"type": "lifespan.shutdown"})
+    await asyncio.wait_for(task, 5)
+    patched = "eventlet.patcher" in sys.modules
+    print(json.dumps({"health": health, "config": config, "patched": patched}))
+
+
+asyncio.run(main())
+'''
+
+
+def test_asgi_mode_serves_rest_contract_without_monkey_patching():
+    env = {**os.environ, "SERVER_MODE": "asgi"}
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT], cwd=BACKEND, env=env, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    output = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert output["patched"] is False
+    status, health = output["health"]
+    assert status == 200
+    assert set(health["databases"]) == {"mongo", "redis", "postgres"}
+    assert all(entry["status"] == "skipped" for entry in health["databases"].values())
+    assert output["config"][0] == 200
+
+
+def test_asyncpg_params_accepts_libpq_dsn():
+    assert asyncpg_params("postgresql://u:p@db/app") == {"dsn": "postgresql://u:p@db/app"}
+    assert asyncpg_params("host=db port=5432 user=u password=p dbname=app") == {
+        "host": "db",
+        "port": "5432",
+        "user": "u",
+        "password": "p",
+        "database": "app",
+    }
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from benchmarks.load import parse_args, run
+
+
+def test_load_benchmark_smoke():
+    # More rounds than connectors, so connectors are published more than once.
+    results = run(parse_args(["--requests", "5", "--concurrency", "2", "--clients", "3", "--rounds", "10"]))
+
+    assert results["http"]["health"]["status_codes"] == {"200": 5}
+    assert results["http"]["jobs"]["status_codes"] == {"202": 5}
+    assert results["http"]["echo"]["latency_ms"]["p50"] is not None
+    assert results["socketio"]["delivered"] == results["socketio"]["expected"] == 30
+
+
+def test_serialization_benchmark_smoke():
+    from benchmarks.serialization import parse_args as parse_serialization_args
+    from benchmarks.serialization import run as run_serialization
+
+    results = run_serialization(parse_serialization_args(["--number", "2", "--repeat", "1", "--clients", "10"]))
+
+    assert "json" in results["payloads"]["health"]
+    assert results["payloads"]["health"]["json"]["dumps_speedup"] == 1.0
+    assert results["broadcast"]["json"]["encode_once_us"] > 0
+
+
+def test_startup_benchmark_smoke():
+    from benchmarks.startup import parse_args as parse_startup_args
+    from benchmarks.startup import run as run_startup
+
+    results = run_startup(parse_startup_args(["--runs", "1", "--top", "5"]))
+
+    # Drivers are imported when their connector first connects.
+    assert "pymongo" not in results["drivers_loaded"]
+    assert "psycopg2" not in results["drivers_loaded"]
+    assert results["import_ms"] > 0 and results["create_app_ms"] > 0
+    assert len(results["slowest_modules"]) == 5
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from app.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from app.metrics import BREAKER_STATE
+
+from .conftest import StubConnector
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FlakyConnector(StubConnector):
+    """Starts unhealthy and records the breaker gauge seen by each check."""
+
+    def __init__(self, breaker: CircuitBreaker):
+        super().__init__("flaky", breaker=breaker)
+        self.healthy = False
+        self.gauge_levels = []
+
+    def ping(self):
+        self.gauge_levels.append(BREAKER_STATE.value(connector=self.label))
+        return super().ping()
+
+
+def test_open_circuit_short_circuits_checks():
+    clock = Clock()
+    connector = FlakyConnector(CircuitBreaker(threshold=2, reset=5.0, jitter=0.0, clock=clock))
+
+    for _ in range(2):
+        assert connector.status()["status"] == "error"
+    entry = connector.status()
+
+    assert connector.calls == 2
+    assert entry["error"] == "connection refused"
+    assert entry["breaker"]["state"] == OPEN
+    assert entry["breaker"]["trips"] == 1
+    assert entry["breaker"]["retry_at"] is not None
+
+
+def test_half_open_trial_closes_or_reopens_with_backoff():
+    clock = Clock()
+    breaker = CircuitBreaker(threshold=1, reset=5.0, max_reset=12.0, jitter=0.0, clock=clock)
+    connector = FlakyConnector(breaker)
+
+    connector.status()
+    assert breaker.state == OPEN
+
+    clock.now += 5.0
+    connector.status()  # half-open trial fails, reset doubles to 10s
+    assert connector.calls == 2 and breaker.state == OPEN and breaker.trips == 2
+    assert connector.gauge_levels[-1] == 1  # half-open reported during the trial
+    assert BREAKER_STATE.value(connector="flaky") == 2
+    clock.now += 9.0
+    connector.status()
+    assert connector.calls == 2
+
+    clock.now += 1.0
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow()  # only one trial call at a time
+    breaker.record_failure("still down")
+    clock.now += 12.0  # capped at max_reset
+    connector.healthy = True
+    entry = connector.status()
+    assert entry["status"] == "ok"
+    assert entry["breaker"] == {"state": CLOSED, "failures": 0, "trips": 3, "retry_at": None}
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from app.cluster import FileHealthStore, FileLeaderLock, HealthCoordinator
+from app.config import Settings
+from app.health import HealthCache, HealthSampler
+
+from .conftest import StubConnector, stub_registry, wait_for
+
+
+def _worker(tmp_path):
+    settings = Settings.for_testing()
+    connector = StubConnector("a")
+    registry = stub_registry(connector, settings=settings)
+    cache = HealthCache(registry, settings.probe)
+    cache.passive = True
+    sampler = HealthSampler(registry, cache, settings.probe)
+    lock = FileLeaderLock(str(tmp_path / "leader.lock"))
+    store = FileHealthStore(str(tmp_path / "health.json"))
+    return HealthCoordinator(lock, store, sampler, poll_interval=0.1), connector
+
+
+def test_only_the_leader_samples_and_followers_mirror(tmp_path):
+    leader, leader_probe = _worker(tmp_path)
+    follower, follower_probe = _worker(tmp_path)
+
+    leader.step()
+    follower.step()
+    assert leader.is_leader and not follower.is_leader
+
+    assert wait_for(lambda: leader.cache.status_for("a")["status"] == "ok")
+    leader.step()
+    follower.step()
+
+    entry = follower.cache.status_for("a")
+    assert entry["status"] == "ok"
+    assert entry["age_ms"] >= 0
+    assert follower.cache.version == leader.cache.version
+    assert leader_probe.calls == 1
+    assert follower_probe.calls == 0
+
+
+def test_follower_takes_over_when_the_leader_stops(tmp_path):
+    leader, _ = _worker(tmp_path)
+    follower, follower_probe = _worker(tmp_path)
+    leader.step()
+    follower.step()
+
+    leader.stop()
+    follower.step()
+
+    assert follower.is_leader
+    assert wait_for(lambda: follower_probe.calls == 1)
+
+
+def test_cold_leader_numbers_on_from_the_followers_versions(tmp_path):
+    old, _ = _worker(tmp_path)
+    follower, _ = _worker(tmp_path)
+    old.step()
+    for _ in range(2):
+        old.cache.publish("a", {"status": "ok"})
+        old.cache.publish("a", {"status": "error", "error": "refused"})
+    old.step()
+    follower.step()
+    seen = follower.cache.version
+    assert seen == old.cache.version >= 4
+
+    old.stop()
+    cold, _ = _worker(tmp_path)
+    cold.step()
+    assert cold.is_leader
+    assert wait_for(lambda: cold.cache.status_for("a")["status"] == "ok")
+    cold.step()
+    follower.step()
+
+    version, changes = follower.cache.changes_since(seen)
+    assert version > seen
+    assert changes["a"]["status"] == "ok"
@@ -74,6 +74,20 @@ def test_create_app_with_message_queue(monkeypatch):
     assert app is not None
 
 
+def test_message_queue_upgrade_waits_for_background_tasks(monkeypatch):
+    import app as app_module
+    from app.config import RedisSection, Settings
+
+    started = []
+    monkeypatch.setattr(app_module.socketio, "start_background_task", lambda target, *args: started.append(target))
+    settings = Settings.for_testing()
+    settings.redis = RedisSection(url="redis://localhost:6379/0", channel="auto-deploy")
+
+    app, _ = app_module.create_app(settings)
+    assert app.config["message_queue"] is not None
+    assert started == []
+
+
 def test_create_app_disables_message_queue_when_unavailable(monkeypatch):
     from app import create_app
     from app.config import Settings, RedisSection
@@ -97,3 +111,31 @@ def test_create_app_disables_message_queue_when_unavailable(monkeypatch):
 
     app, socketio = create_app(settings)
     assert app is not None
+
+
+def test_message_queue_is_attached_after_startup():
+    import socketio as _socketio
+
+    from app import create_app
+    from app.config import Settings
+    from app.message_queue import MessageQueueUpgrade
+    from app.rooms import HEALTH_ROOM
+
+    settings = Settings.for_testing()
+    app, socketio = create_app(settings)
+    broadcaster = app.config["broadcaster"]
+    client = socketio.test_client(app)
+    client.emit("subscribe", {"rooms": [HEALTH_ROOM]}, callback=True)
+    client.get_received()
+
+    class QueueManager(_socketio.Manager):
+        """In-process stand-in for the Redis manager."""
+
+    upgrade = MessageQueueUpgrade("redis://unused", broadcaster)
+    upgrade.reachable = lambda: True
+    upgrade.run(socketio.server, QueueManager, lambda _: None)
+
+    assert isinstance(socketio.server.manager, QueueManager)
+    assert broadcaster.shared and upgrade.connected
+    broadcaster.emit("health:patch", {"seq": 1}, room=HEALTH_ROOM)
+    assert [message["name"] for message in client.get_received()] == ["health:patch"]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app import database
+from app.config import Settings
+from app.database import BaseConnector, DatabaseRegistry, PostgresConnector, RedisConnector
+
+
+class EchoConnector(BaseConnector):
+    name = "echo"
+
+    def __init__(self, config, **options):
+        super().__init__(**options)
+        self.config = config
+
+    def configured(self) -> bool:
+        return True
+
+    def ping(self):
+        return {"latency_ms": 0.1, "target": self.config["target"]}
+
+
+class FakeEntryPoint:
+    name = "echo"
+
+    def load(self):
+        return EchoConnector
+
+
+def test_connectors_from_env(monkeypatch):
+    monkeypatch.setenv(
+        "CONNECTORS",
+        json.dumps(
+            [
+                {"name": "pg-replica-1", "type": "postgres", "dsn": "host=replica-1", "interval": 30},
+                {"name": "cache-b", "type": "redis", "url": "redis://cache-b:6379/0", "pool_size": 8},
+            ]
+        ),
+    )
+    settings = Settings.from_env()
+    assert settings.probe.interval_for("pg-replica-1") == 30
+
+    registry = DatabaseRegistry(settings)
+    assert registry.names()[-2:] == ["pg-replica-1", "cache-b"]
+    replica = registry._connector("pg-replica-1")
+    assert isinstance(replica, PostgresConnector)
+    assert replica.label == "pg-replica-1"
+    assert replica.config.dsn == "host=replica-1"
+    cache = registry._connector("cache-b")
+    assert isinstance(cache, RedisConnector)
+    assert cache.pool_size == 8
+    assert cache.history is not registry._connector("redis").history
+    assert settings.safe_export()["connectors"][0] == {"name": "pg-replica-1", "type": "postgres"}
+
+
+def test_entry_point_connector_types(monkeypatch):
+    monkeypatch.setattr(database, "entry_points", lambda group: [FakeEntryPoint()])
+    monkeypatch.setenv("CONNECTORS", json.dumps([{"name": "edge", "type": "echo", "target": "edge-1"}]))
+
+    registry = DatabaseRegistry(Settings.from_env())
+    entry = registry.status_for("edge")
+    assert entry["status"] == "ok"
+    assert entry["target"] == "edge-1"
+
+
+def test_unknown_connector_type_is_rejected(monkeypatch):
+    monkeypatch.setenv("CONNECTORS", json.dumps([{"name": "x", "type": "cassandra"}]))
+    with pytest.raises(ValueError, match="unknown type 'cassandra'"):
+        DatabaseRegistry(Settings.from_env())
@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+from app import database
+import pymongo
+from pymongo.errors import OperationFailure
+
+from app.config import MongoSection, PostgresSection, RedisSection
+from app.database import MongoConnector, PostgresConnector, RedisConnector
+from app.metrics import REGISTRY
+
+
+SERVER_STATUS = {
+    "uptime": 100.0,
+    "connections": {"current": 7, "available": 800},
+    "opcounters": {"insert": 10, "query": 40, "update": 0, "delete": 0, "getmore": 0, "command": 50},
+    "mem": {"resident": 120},
+    "wiredTiger": {"cache": {"maximum bytes configured": 1000, "bytes currently in the cache": 250}},
+}
+
+
+class FakeAdmin:
+    def __init__(self, client):
+        self.client = client
+
+    def command(self, name, *args, **kwargs):
+        if self.client.fail:
+            raise ConnectionError("server went away")
+        self.client.commands += 1
+        self.client.names.append(name)
+        if name == "serverStatus":
+            status = dict(SERVER_STATUS, uptime=SERVER_STATUS["uptime"] + 10 * self.client.names.count(name))
+            status["opcounters"] = {"query": 100 + 500 * self.client.names.count(name)}
+            return status
+        if name == "replSetGetStatus":
+            raise OperationFailure("not running with --replSet", code=76)
+        if name == "collStats":
+            return {"count": 3, "size": 300, "storageSize": 4096, "nindexes": 1, "totalIndexSize": 4096}
+        return {"ok": 1}
+
+
+class FakeMongoClient:
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.commands = 0
+        self.closed = False
+        self.fail = False
+        self.names = []
+        self.admin = FakeAdmin(self)
+        FakeMongoClient.instances.append(self)
+
+    def __getitem__(self, database):
+        return self.admin
+
+    def close(self):
+        self.closed = True
+
+
+def _mongo_connector(monkeypatch, **deep):
+    FakeMongoClient.instances = []
+    monkeypatch.setattr(pymongo, "MongoClient", FakeMongoClient)
+    config = MongoSection(
+        host="mongo", port=27017, user=None, password=None, database="db", collection="events", **deep
+    )
+    return MongoConnector(config, pool_size=3, timeout=1.0)
+
+
+def test_mongo_client_is_reused_across_checks(monkeypatch):
+    connector = _mongo_connector(monkeypatch)
+
+    first = connector.status()
+    second = connector.status()
+
+    assert first["status"] == second["status"] == "ok"
+    assert len(FakeMongoClient.instances) == 1
+    client = FakeMongoClient.instances[0]
+    assert client.kwargs["maxPoolSize"] == 3
+    # one warm-up ping when the pool is created, then one per check
+    assert client.commands == 3
+    assert "connect_ms" in first and "latency_ms" in first
+
+
+def test_failed_check_recycles_pool(monkeypatch):
+    connector = _mongo_connector(monkeypatch)
+    connector.status()
+    broken = FakeMongoClient.instances[0]
+    broken.fail = True
+
+    result = connector.status()
+    assert result["status"] == "error"
+    assert broken.closed
+
+    assert connector.status()["status"] == "ok"
+    assert len(FakeMongoClient.instances) == 2
+
+
+def test_mongo_deep_probe_collects_server_and_collection_stats(monkeypatch):
+    clock = [500.0]
+    monkeypatch.setattr(database, "monotonic", lambda: clock[0])
+    connector = _mongo_connector(monkeypatch, deep_probe=True, deep_interval=60)
+
+    stats = connector.status()["stats"]
+    client = FakeMongoClient.instances[0]
+    assert client.names == ["ping", "ping", "serverStatus", "replSetGetStatus", "collStats"]
+    assert stats["connections"] == 7
+    assert stats["cache_fill_ratio"] == 0.25
+    assert stats["replica_set"] is None
+    assert stats["documents"] == 3
+    assert stats["ops_per_sec"] is None  # needs two samples
+
+    clock[0] += 10
+    connector.status()
+    assert client.names[5:] == ["ping"]  # not due yet
+
+    clock[0] += 60
+    stats = connector.status()["stats"]
+    # 500 more operations over 10s of server uptime
+    assert stats["ops_per_sec"] == 50.0
+
+
+class FakeRedisPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def ping(self):
+        self.commands.append("PING")
+
+    def info(self, section):
+        self.commands.append(f"INFO {section}")
+
+    def execute(self, raise_on_error=True):
+        self.client.round_trips.append(self.commands)
+        replies = {
+            "PING": True,
+            "INFO replication": {
+                "role": "master",
+                "connected_slaves": 1,
+                "master_repl_offset": 1500,
+                "slave0": {"ip": "10.0.0.2", "port": 6379, "state": "online", "offset": 1200, "lag": 1},
+            },
+            "INFO memory": {"used_memory": 2048, "maxmemory": 0, "mem_fragmentation_ratio": 1.42},
+            "INFO clients": {"connected_clients": 5, "blocked_clients": 0},
+            "INFO stats": {"instantaneous_ops_per_sec": 320, "keyspace_hits": 90, "keyspace_misses": 10, "evicted_keys": 0},
+        }
+        return [replies[command] for command in self.commands]
+
+
+class FakeConnectionPool:
+    def get_connection(self, name):
+        return object()
+
+    def release(self, connection):
+        pass
+
+
+class FakeRedis:
+    def __init__(self):
+        self.connection_pool = FakeConnectionPool()
+        self.round_trips = []
+
+    def pipeline(self, transaction=True):
+        assert transaction is False
+        return FakeRedisPipeline(self)
+
+
+def test_redis_probe_is_one_pipelined_round_trip(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(database, "monotonic", lambda: clock[0])
+    connector = RedisConnector(RedisSection(url="redis://cache:6379/0", channel="c", deep_probe=True, deep_interval=15))
+    connector._pool = client = FakeRedis()
+
+    entry = connector.status()
+    assert client.round_trips == [["PING", "INFO replication", "INFO memory", "INFO clients", "INFO stats"]]
+    assert entry["role"] == "master"
+    stats = entry["stats"]
+    assert stats["ops_per_sec"] == 320
+    assert stats["mem_fragmentation_ratio"] == 1.42
+    assert stats["keyspace_hit_ratio"] == 0.9
+    assert stats["replica_lag_seconds"] == 1
+    assert stats["replica_lag_bytes"] == 300
+
+    clock[0] += 5
+    connector.status()
+    assert client.round_trips[1] == ["PING", "INFO replication"]
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.connection = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.connection.statements.append(sql.split("(")[0].split()[0:2])
+        if sql.startswith("EXECUTE") and self.connection.stats_error:
+            raise RuntimeError("permission denied for pg_stat_replication")
+        self._last = sql
+
+    def fetchone(self):
+        if self._last.startswith("EXECUTE"):
+            return (12, 3, 1, 100, 0, 0.9931, False, 2, 4096.0, 0.25)
+        return (1,)
+
+
+class FakePgConnection:
+    def __init__(self):
+        self.autocommit = False
+        self.statements = []
+        self.stats_error = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+class FakePgPool:
+    def __init__(self):
+        self.conn = FakePgConnection()
+        self.closed_conns = 0
+
+    def getconn(self):
+        return self.conn
+
+    def putconn(self, conn, close=False):
+        if close:
+            self.closed_conns += 1
+            self.conn = FakePgConnection()
+
+
+def _postgres_connector(**config):
+    section = PostgresSection(
+        dsn="host=db", host="db", port=5432, user="u", password="p", database="app", **config
+    )
+    connector = PostgresConnector(section)
+    connector._pool = FakePgPool()
+    return connector
+
+
+def test_postgres_deep_probe_is_off_by_default():
+    connector = _postgres_connector()
+    entry = connector.status()
+    assert entry["status"] == "ok"
+    assert "stats" not in entry
+    assert connector._pool.conn.statements == [["SELECT", "1"]]
+
+
+def test_postgres_deep_probe_prepares_once_and_is_rate_limited(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(database, "monotonic", lambda: clock[0])
+    connector = _postgres_connector(deep_probe=True, deep_interval=60)
+    conn = connector._pool.conn
+
+    first = connector.status()
+    assert first["stats"]["connections"] == 12
+    assert first["stats"]["cache_hit_ratio"] == 0.9931
+    assert first["stats"]["replication_lag_bytes"] == 4096.0
+    assert first["stats"]["age_s"] == 0
+    assert conn.statements == [["SELECT", "1"], ["PREPARE", "health_deep_stats"], ["EXECUTE", "health_deep_stats"]]
+
+    clock[0] += 30
+    second = connector.status()
+    assert second["stats"]["age_s"] == 30
+    assert conn.statements[3:] == [["SELECT", "1"]]
+
+    clock[0] += 30
+    connector.status()
+    # Due again: executed on the already-prepared connection.
+    assert conn.statements[4:] == [["SELECT", "1"], ["EXECUTE", "health_deep_stats"]]
+    assert REGISTRY.render().count('health_connector_stat{connector="postgres",stat="connections"} 12') == 1
+
+
+def test_postgres_deep_probe_failure_keeps_liveness_ok():
+    connector = _postgres_connector(deep_probe=True)
+    connector._pool.conn.stats_error = True
+
+    entry = connector.status()
+    assert entry["status"] == "ok"
+    assert "permission denied" in entry["stats"]["error"]
+    assert connector._pool.closed_conns == 1
+    assert connector.breaker.state == "closed"
+
+
+def test_hanging_postgres_probe_does_not_block_the_hub():
+    import socket
+
+    import eventlet
+    import pytest
+    from psycopg2 import OperationalError
+
+    from app import create_app
+    from app.config import Settings
+
+    # Accepts TCP connections (the kernel backlog does) but never answers
+    # libpq's startup packet.
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+    port = server.getsockname()[1]
+
+    section = PostgresSection(
+        dsn=f"host=127.0.0.1 port={port}", host="127.0.0.1", port=port, user="u", password="p", database="app"
+    )
+    connector = PostgresConnector(section, timeout=1)
+    app, _ = create_app(Settings.for_testing())
+    client = app.test_client()
+    try:
+        probe = eventlet.spawn(connector.ping)
+        eventlet.sleep(0)
+        served = 0
+        while not probe.dead:
+            assert client.get("/api/config").status_code == 200
+            served += 1
+            eventlet.sleep(0.01)
+        # The probe gave up after connect_timeout instead of hanging, and
+        # requests were served the whole time.
+        with pytest.raises(OperationalError, match="did not respond"):
+            probe.wait()
+        assert served > 20
+    finally:
+        server.close()
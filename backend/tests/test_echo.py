@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+
+from app import create_app
+from app.config import Settings
+
+
+def _client(max_bytes=1024 * 1024, chunk_bytes=4096):
+    settings = Settings.for_testing()
+    settings.app.echo_max_bytes = max_bytes
+    settings.app.echo_chunk_bytes = chunk_bytes
+    app, _ = create_app(settings)
+    return app.test_client()
+
+
+def _chunked(body: bytes):
+    # No Content-Length: the server has to read until the stream ends.
+    return {
+        "input_stream": io.BytesIO(body),
+        "headers": {"Transfer-Encoding": "chunked"},
+        "environ_overrides": {"wsgi.input_terminated": True},
+    }
+
+
+def test_stream_mode_pipes_the_raw_body_back():
+    body = os.urandom(300_000)
+    response = _client().post("/api/echo?mode=stream", data=body, content_type="application/octet-stream")
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.get_data() == body
+
+
+def test_summary_mode_reports_bytes_and_timings_for_chunked_uploads():
+    body = os.urandom(50_000)
+    response = _client().post("/api/echo?mode=summary", **_chunked(body))
+
+    metadata = response.get_json()["metadata"]
+    assert metadata["bytes"] == 50_000
+    assert metadata["chunks"] == 13
+    assert metadata["sha256"] == hashlib.sha256(body).hexdigest()
+    assert metadata["first_byte_ms"] is not None
+    assert metadata["throughput_bytes_per_s"] > 0
+
+
+def test_bodies_over_the_limit_are_rejected():
+    client = _client(max_bytes=10_000)
+
+    assert client.post("/api/echo?mode=stream", data=b"x" * 10_001).status_code == 413
+    assert client.post("/api/echo?mode=summary", **_chunked(b"x" * 20_000)).status_code == 413
+    assert client.post("/api/echo", json={"blob": "x" * 20_000}).status_code == 413
+    assert client.post("/api/echo?mode=xml", data=b"").status_code == 400
+
+
+def test_json_mode_echoes_numbers_unchanged():
+    client = _client()
+    wide = b'{"n": 123456789012345678901234567890}'
+    response = client.post("/api/echo", data=wide, content_type="application/json")
+    assert response.status_code == 200
+    assert b'"n":123456789012345678901234567890' in response.data
+    assert json.loads(response.data)["received"] == {"n": 123456789012345678901234567890}
+
+    response = client.post("/api/echo", data=b'{"n": NaN}', content_type="application/json")
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "NaN is not valid JSON"
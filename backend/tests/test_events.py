@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from app import create_app
+from app.config import EventsSection, Settings
+from app.events import EventLog, MemoryEventStore
+from app.metrics import EVENTS_DROPPED
+
+
+class FlakyStore(MemoryEventStore):
+    def __init__(self):
+        super().__init__(retention=100)
+        self.fail = False
+        self.writes = []
+
+    def write(self, batch):
+        if self.fail:
+            raise ConnectionError("store unavailable")
+        self.writes.append(len(batch))
+        super().write(batch)
+
+
+def test_buffer_is_bounded_and_flushed_in_batches():
+    store = FlakyStore()
+    log = EventLog(store, EventsSection(buffer_size=5, batch_size=3))
+    dropped = EVENTS_DROPPED.value(reason="full")
+
+    accepted = [log.append("job", f"job-{i}", "queued") for i in range(6)]
+    assert accepted == [True] * 5 + [False]
+    assert EVENTS_DROPPED.value(reason="full") == dropped + 1
+
+    assert log.flush() == 3
+    assert log.flush_all() == 2
+    assert store.writes == [3, 2]
+    newest = log.query(limit=2)
+    assert [event["source"] for event in newest] == ["job-4", "job-3"]
+
+
+def test_failed_write_requeues_then_drops_when_full():
+    store = FlakyStore()
+    log = EventLog(store, EventsSection(buffer_size=4, batch_size=2))
+    for _ in range(3):
+        log.append("health", "redis", "ok")
+    store.fail = True
+    assert log.flush() == 0
+    assert log.pending() == 3  # batch put back in front
+
+    # Events keep arriving while the failing write is in flight; once the
+    # buffer has no room for the batch it is dropped instead.
+    original = store.write
+
+    def write_while_busy(batch):
+        while log.append("health", "redis", "ok"):
+            pass
+        original(batch)
+
+    store.write = write_while_busy
+    dropped = EVENTS_DROPPED.value(reason="write_error")
+    assert log.flush() == 0
+    assert EVENTS_DROPPED.value(reason="write_error") == dropped + 2
+    assert log.pending() == 4
+
+    store.write = original
+    store.fail = False
+    assert log.flush_all() == 4
+
+
+def test_breaker_transitions_are_logged():
+    log = EventLog(MemoryEventStore(retention=10), EventsSection())
+    closed = {"state": "closed", "failures": 0, "trips": 0, "retry_at": None}
+    opened = {"state": "open", "failures": 3, "trips": 1, "retry_at": "soon"}
+    log.record_health("postgres", {"status": "ok", "latency_ms": 1.5, "breaker": closed})
+    log.record_health("postgres", {"status": "error", "error": "refused", "breaker": opened})
+    log.flush_all()
+
+    breaker = log.query(kind="breaker")
+    assert len(breaker) == 1
+    assert breaker[0]["status"] == "open"
+    assert breaker[0]["data"]["previous"] == "closed"
+    health = log.query(kind="health", source="postgres")
+    assert [event["status"] for event in health] == ["error", "ok"]
+    assert health[1]["data"] == {"latency_ms": 1.5}
+
+
+def test_events_endpoint_returns_health_and_job_events():
+    settings = Settings.for_testing()
+    settings.events = EventsSection(backend="memory")
+    app, _ = create_app(settings)
+    client = app.test_client()
+
+    client.get("/api/health")
+    job = client.post("/api/jobs", json={}).get_json()
+    app.config["job_queue"].work_once(sleep=lambda _: None, timeout=0.1)
+    app.config["event_log"].flush_all()
+
+    jobs = client.get(f"/api/events?kind=job&source={job['id']}").get_json()
+    statuses = [event["status"] for event in reversed(jobs["events"])]
+    assert statuses[0] == "queued" and statuses[1] == "running" and statuses[-1] == "succeeded"
+    # progress-only updates are not transitions
+    assert len(statuses) == 2 + 4 + 1
+
+    health = client.get("/api/events?kind=health").get_json()
+    assert {event["source"] for event in health["events"]} == {"mongo", "redis", "postgres"}
+
+    future = (datetime.now(timezone.utc) + timedelta(minutes=1)).isoformat()
+    assert client.get("/api/events", query_string={"since": future}).get_json()["count"] == 0
+    assert client.get("/api/events?since=yesterday").status_code == 400
+    assert client.get("/api/events?kind=nope").status_code == 400
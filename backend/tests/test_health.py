@@ -3,6 +3,8 @@ from __future__ import annotations
 from app import create_app
 from app.config import Settings
 
+from .conftest import StubConnector
+
 
 def test_health_endpoint_structure(monkeypatch):
     settings = Settings.for_testing()
@@ -33,3 +35,76 @@ def test_echo_round_trip():
     payload = response.get_json()
     assert payload["received"] == body
     assert payload["metadata"]["headers"]["X-Test"] == "true"
+
+
+def test_health_and_config_support_conditional_get():
+    settings = Settings.for_testing()
+    app, _ = create_app(settings)
+    health = app.config["health_cache"]
+    health.passive = True
+    health.publish("redis", {"status": "ok", "latency_ms": 1.0, "checked_at": "t1"})
+    client = app.test_client()
+
+    first = client.get("/api/health")
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "no-cache"
+    assert "Last-Modified" in first.headers and "Age" in first.headers
+
+    # A new sample with only new measurements: same version, same tag, empty 304.
+    health.publish("redis", {"status": "ok", "latency_ms": 7.5, "checked_at": "t2"})
+    cached = client.get("/api/health", headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.data == b""
+    assert client.get("/api/health").data == first.data
+    by_date = client.get("/api/health", headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert by_date.status_code == 304
+
+    health.publish("redis", {"status": "error", "error": "refused", "checked_at": "t3"})
+    changed = client.get("/api/health", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.get_json()["databases"]["redis"]["status"] == "error"
+    assert changed.headers["ETag"] != etag
+    assert changed.headers["Last-Modified"] != first.headers["Last-Modified"]
+    stale = client.get("/api/health", headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert stale.status_code == 200
+
+    config = client.get("/api/config")
+    assert config.headers["Cache-Control"] == "max-age=60, must-revalidate"
+    again = client.get("/api/config", headers={"If-None-Match": config.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_selective_health_and_batch_status_probe_only_requested_connectors():
+    import threading
+
+    # The barrier only opens with both checks in flight; checked one after
+    # the other, they would break it and report errors.
+    barrier = threading.Barrier(2)
+    both = lambda: barrier.wait(timeout=1.0)  # noqa: E731
+    app, _ = create_app(Settings.for_testing())
+    registry = app.config["db_registry"]
+    connectors = {name: StubConnector(name, wait=wait, host="db") for name, wait in (("a", both), ("b", both), ("c", None))}
+    for connector in connectors.values():
+        registry.register(connector)
+    client = app.test_client()
+
+    narrow = client.get("/api/health?connectors=a,b&fields=status,latency_ms")
+    payload = narrow.get_json()
+    assert payload["databases"] == {
+        "a": {"status": "ok", "latency_ms": 1.0},
+        "b": {"status": "ok", "latency_ms": 1.0},
+    }
+    assert payload["counters"]["ok"] == 2 and "event_loop" not in payload
+    assert [connectors[name].calls for name in "abc"] == [1, 1, 0]
+    revalidated = client.get(narrow.request.full_path, headers={"If-None-Match": narrow.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+    batch = client.post("/api/db/status", json={"connectors": ["c"], "fields": ["status", "host"]})
+    assert batch.get_json()["databases"] == {"c": {"status": "ok", "host": "db"}}
+    assert connectors["c"].calls == 1
+
+    assert client.get("/api/health?connectors=a,nope").status_code == 400
+    unknown = client.post("/api/db/status", json={"connectors": ["x", "y"]})
+    assert unknown.get_json()["error"] == "Unknown data sources 'x', 'y'"
+    assert client.post("/api/db/status", json={"connectors": "a"}).status_code == 400
+    full = client.post("/api/db/status").get_json()
+    assert set(full["databases"]) == {"mongo", "redis", "postgres", "a", "b", "c"}
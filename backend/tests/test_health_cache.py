@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import ProbeSection
+from app.health import HealthCache, HealthSampler
+
+from .conftest import StubConnector, stub_registry, wait_for
+
+
+def _cache(ttl=60.0, stale=60.0, delay=0.0, **ttls):
+    connectors = {name: StubConnector(name, delay) for name in ("a", "b")}
+    registry = stub_registry(*connectors.values())
+    probe = ProbeSection(cache_ttl=ttl, stale_ttl=stale, connector_ttls=ttls, report_deadline=2.0)
+    return HealthCache(registry, probe), connectors
+
+
+def test_fresh_snapshot_is_served_without_probing():
+    cache, connectors = _cache()
+    cache.report()
+    second = cache.report()
+
+    assert connectors["a"].calls == 1
+    assert second["a"]["status"] == "ok"
+    assert second["a"]["age_ms"] >= 0
+
+
+def test_concurrent_callers_share_one_check():
+    cache, connectors = _cache(delay=0.2)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: cache.status_for("a"), range(8)))
+
+    assert all(result["status"] == "ok" for result in results)
+    assert connectors["a"].calls == 1
+
+
+def test_expired_snapshot_is_served_stale_while_refreshing():
+    cache, connectors = _cache(ttl=60.0, a=0.0)
+    cache.report()
+
+    entry = cache.status_for("a")
+    assert entry["stale"] is True
+    assert cache.status_for("b").get("stale") is None
+
+    assert wait_for(lambda: connectors["a"].calls == 2)
+
+
+def test_sampler_publishes_and_reads_do_not_probe():
+    cache, connectors = _cache()
+    sampler = HealthSampler(cache.registry, cache, cache.probe)
+    cache.passive = True
+
+    assert cache.status_for("a")["status"] == "pending"
+    sampler.tick()
+    assert wait_for(lambda: cache.status_for("a")["status"] == "ok")
+
+    for _ in range(5):
+        cache.report()
+    assert connectors["a"].calls == 1
+    # nothing is due again until the interval has passed
+    assert sampler.tick() > 0
+    assert connectors["a"].calls == 1
+
+
+def test_sampler_backs_off_failing_connectors():
+    cache, _ = _cache()
+    probe = ProbeSection(interval=2.0, jitter=0.0, max_backoff=10.0)
+    sampler = HealthSampler(cache.registry, cache, probe)
+
+    assert sampler.next_delay("a") == 2.0
+    sampler._failures["a"] = 2
+    assert sampler.next_delay("a") == 8.0
+    sampler._failures["a"] = 5
+    assert sampler.next_delay("a") == 10.0
+
+
+def test_versions_only_advance_on_meaningful_changes():
+    cache, _ = _cache()
+    cache.publish("a", {"status": "ok", "checked_at": "t1"})
+    cache.publish("b", {"status": "ok", "checked_at": "t1"})
+    seq = cache.version
+
+    cache.publish("a", {"status": "ok", "checked_at": "t2"})
+    assert cache.changes_since(seq) == (seq, {})
+
+    cache.publish("b", {"status": "error", "checked_at": "t3"})
+    version, changes = cache.changes_since(seq)
+    assert version == seq + 1
+    assert list(changes) == ["b"]
+    assert changes["b"]["status"] == "error"
+
+
+def test_new_measurements_alone_do_not_bump_the_version():
+    cache, _ = _cache()
+    healthy = {"status": "ok", "checked_at": "t1", "breaker": {"state": "closed", "failures": 0}}
+    cache.publish("a", {**healthy, "latency_ms": 1.2, "connect_ms": 0.4, "stats": {"age_s": 0.1}})
+    seq = cache.version
+
+    cache.publish("a", {**healthy, "checked_at": "t2", "latency_ms": 7.9, "connect_ms": 3.0, "stats": {"age_s": 5.1}})
+    assert cache.version == seq
+    assert cache.changes_since(seq) == (seq, {})
+
+    cache.publish("a", {**healthy, "breaker": {"state": "half_open", "failures": 3}})
+    assert cache.version == seq + 1
+
+
+def test_health_patch_is_skipped_when_nothing_changed():
+    from app.ws import next_health_patch
+
+    cache, _ = _cache()
+    cache.passive = True
+    cache.publish("a", {"status": "ok"})
+    first = next_health_patch(cache, 0)
+    assert first["full"] is False and first["base"] == 0
+    assert set(first["databases"]) == {"a"}
+    assert next_health_patch(cache, first["seq"]) is None
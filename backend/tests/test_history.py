@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from app import create_app
+from app.config import Settings
+from app.history import LatencyHistory
+
+
+def test_ring_buffer_keeps_last_samples():
+    history = LatencyHistory(capacity=3)
+    for latency in (1.0, 2.0, 3.0, 4.0):
+        history.record(latency, at=1000.0)
+    history.record(None, ok=False, at=1000.0)
+
+    samples = history.samples()
+    assert [sample["latency_ms"] for sample in samples] == [3.0, 4.0, None]
+    assert samples[-1]["ok"] is False
+
+
+def test_window_percentiles_from_histogram():
+    history = LatencyHistory(slot_seconds=10, slots=6)
+    now = 10_000.0
+    for latency in range(1, 101):
+        history.record(float(latency), at=now)
+    # an old slot outside the 10s window must not leak into the result
+    history.record(5000.0, at=now - 30)
+
+    stats = history.stats(10, now=now)
+    assert stats["count"] == 100
+    assert stats["max"] == 100.0
+    assert abs(stats["p50"] - 50) <= 50 * 0.05 + 1
+    assert abs(stats["p99"] - 99) <= 99 * 0.05 + 1
+
+    assert history.stats(60, now=now)["max"] == 5000.0
+
+
+def test_history_endpoint():
+    app, _ = create_app(Settings.for_testing())
+    client = app.test_client()
+
+    response = client.get("/api/db/redis/history?windows=60,300&samples=5")
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert set(payload["windows"]) == {"60", "300"}
+    assert client.get("/api/db/unknown/history").status_code == 404
+    too_many = ",".join(str(seconds) for seconds in range(1, 10))
+    for windows in ("inf", "nan", "-5", "0", "60,abc", "60,300,60", "60,60.0", too_many):
+        rejected = client.get(f"/api/db/redis/history?windows={windows}")
+        assert rejected.status_code == 400, windows
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import threading
+import time
+
+import pytest
+
 from app import create_app
-from app.config import Settings
+from app.config import JobsSection, Settings
+from app.jobs import RETRY_DELAY, JobQueue, MemoryJobBackend
 
 
 def test_create_job_endpoint():
@@ -15,3 +21,118 @@ def test_create_job_endpoint():
     assert "id" in payload
     assert payload["type"] == "deploy:test"
     assert payload["status"] == "queued"
+
+
+def test_job_status_and_listing():
+    settings = Settings.for_testing()
+    app, _ = create_app(settings)
+    client = app.test_client()
+
+    created = client.post("/api/jobs", json={"type": "deploy:test"}).get_json()
+    fetched = client.get(f"/api/jobs/{created['id']}")
+    assert fetched.status_code == 200
+    assert fetched.get_json()["status"] == "queued"
+
+    listing = client.get("/api/jobs").get_json()
+    assert listing["jobs"][0]["id"] == created["id"]
+    assert listing["queued"] == 1
+    assert client.get("/api/jobs/does-not-exist").status_code == 404
+
+
+def test_full_queue_returns_429():
+    settings = Settings.for_testing()
+    settings.jobs = JobsSection(queue_size=2)
+    app, _ = create_app(settings)
+    client = app.test_client()
+
+    assert client.post("/api/jobs", json={}).status_code == 202
+    assert client.post("/api/jobs", json={}).status_code == 202
+    response = client.post("/api/jobs", json={})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_worker_runs_job_and_streams_progress():
+    events = []
+    queue = JobQueue(
+        JobsSection(step_seconds=0.0),
+        MemoryJobBackend(queue_size=5, retention=5),
+        lambda event, payload, rooms: events.append((event, payload["status"], rooms[0])),
+    )
+    ok = queue.submit("deploy:test", {})
+    broken = queue.submit("deploy:test", {"fail_at": "build"})
+
+    assert queue.work_once(sleep=lambda _: None, timeout=0.1)
+    assert queue.work_once(sleep=lambda _: None, timeout=0.1)
+
+    assert queue.get(ok.id).status == "succeeded"
+    assert queue.get(ok.id).progress == 1.0
+    failed = queue.get(broken.id)
+    assert failed.status == "failed"
+    assert "build" in failed.error
+    assert ("jobs:update", "running", f"job:{ok.id}") in events
+
+
+def test_retention_only_evicts_finished_jobs():
+    queue = JobQueue(JobsSection(step_seconds=0.0), MemoryJobBackend(queue_size=5, retention=1), lambda *_: None)
+    first = queue.submit("deploy:test", {})
+    second = queue.submit("deploy:test", {})
+    third = queue.submit("deploy:test", {})
+    assert all(queue.get(job.id) is not None for job in (first, second, third))
+
+    assert queue.work_once(sleep=lambda _: None, timeout=0.1)
+    assert queue.get(first.id) is None  # finished, so it made room
+    assert queue.get(third.id).status == "queued"
+    assert queue.work_once(sleep=lambda _: None, timeout=0.1)
+    assert queue.work_once(sleep=lambda _: None, timeout=0.1)
+    assert queue.get(second.id) is None
+    assert queue.get(third.id).status == "succeeded"
+
+
+class FlakyBackend(MemoryJobBackend):
+    """Fails the first ``failures`` pops, like a Redis blip."""
+
+    def __init__(self, failures: int):
+        super().__init__(queue_size=5, retention=5)
+        self.failures = failures
+
+    def pop(self, timeout):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Connection reset by peer")
+        return super().pop(timeout)
+
+
+def test_worker_survives_backend_errors():
+    queue = JobQueue(JobsSection(workers=1, step_seconds=0.0), FlakyBackend(failures=1), lambda *_: None)
+    job = queue.submit("deploy:test", {})
+    naps = []
+
+    def sleep(seconds):
+        naps.append(seconds)
+        time.sleep(0)
+
+    queue.start(lambda target, *args: threading.Thread(target=target, args=args, daemon=True).start(), sleep)
+    try:
+        deadline = time.monotonic() + 2.0
+        while queue.get(job.id).status != "succeeded" and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        queue.stop()
+    assert queue.get(job.id).status == "succeeded"
+    assert naps[0] == RETRY_DELAY  # backed off once after the failed pop
+
+
+def test_job_is_marked_failed_when_the_backend_fails_mid_run():
+    class BrokenSaves(MemoryJobBackend):
+        def save(self, job):
+            if job.status == "running":
+                raise ConnectionError("Connection reset by peer")
+            super().save(job)
+
+    queue = JobQueue(JobsSection(step_seconds=0.0), BrokenSaves(queue_size=5, retention=5), lambda *_: None)
+    job = queue.submit("deploy:test", {})
+    with pytest.raises(ConnectionError):
+        queue.work_once(sleep=lambda _: None, timeout=0.1)
+    failed = queue.get(job.id)
+    assert failed.status == "failed" and "Connection reset" in failed.error
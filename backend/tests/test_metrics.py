@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from app import create_app
+from app.config import Settings
+from app.metrics import Counter, Histogram
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("demo_seconds", "Demo.", ["route"], buckets=(0.1, 1.0))
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.5, route="/a")
+    histogram.observe(5, route="/a")
+
+    lines = histogram.render()
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{route="/a"} 3' in lines
+
+
+def test_counter_labels_are_escaped():
+    counter = Counter("demo_total", "Demo.", ["reason"])
+    counter.inc(reason='say "hi"')
+    assert counter.render()[-1] == 'demo_total{reason="say \\"hi\\""} 1'
+
+
+def test_metrics_endpoint_reports_probes_and_requests():
+    app, _ = create_app(Settings.for_testing())
+    client = app.test_client()
+    client.get("/api/health")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain")
+    body = response.get_data(as_text=True)
+    assert 'health_probe_total{connector="redis",status="skipped"}' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/health",status="200"}' in body
+    assert "# TYPE socketio_connected_clients gauge" in body
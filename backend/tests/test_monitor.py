@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import logging
+
+import eventlet
+from eventlet import patcher
+
+from app import create_app
+from app.config import MonitorSection, Settings
+from app.metrics import HUB_BLOCKED
+from app.monitor import HubMonitor
+
+blocking_sleep = patcher.original("time").sleep
+
+
+def blocking_driver_call(seconds):
+    # Stands in for a C extension waiting on a socket without yielding.
+    blocking_sleep(seconds)
+
+
+def test_watchdog_logs_the_blocking_stack_with_rate_limiting(caplog):
+    monitor = HubMonitor(MonitorSection(interval=0.01, window=100, block_threshold=0.05, log_interval=60))
+    blocked = HUB_BLOCKED.value()
+    monitor.start(eventlet.spawn, eventlet.sleep)
+    try:
+        eventlet.sleep(0.1)
+        with caplog.at_level(logging.WARNING, logger="app.monitor"):
+            blocking_driver_call(0.25)
+            eventlet.sleep(0.05)
+            blocking_driver_call(0.25)
+            eventlet.sleep(0.05)
+    finally:
+        monitor.stop()
+
+    assert monitor.blocked == 2
+    assert HUB_BLOCKED.value() == blocked + 2
+    # The second stall is counted but not logged again.
+    assert len(caplog.records) == 1
+    assert "blocking_driver_call" in caplog.records[0].getMessage()
+
+    summary = monitor.summary()
+    assert summary["samples"] > 5
+    assert summary["lag_ms"]["max"] >= 200
+    assert summary["lag_ms"]["p50"] < summary["lag_ms"]["max"]
+
+
+def test_health_payload_includes_event_loop_lag():
+    settings = Settings.for_testing()
+    app, _ = create_app(settings)
+    assert "event_loop" not in app.test_client().get("/api/health").get_json()
+
+    monitor = HubMonitor(settings.monitor)
+    monitor._lags.extend([0.001, 0.002, 0.004, 0.1])
+    app.config["hub_monitor"] = monitor
+    loop = app.test_client().get("/api/health").get_json()["event_loop"]
+    assert loop["samples"] == 4
+    assert loop["lag_ms"] == {"p50": 2.0, "p95": 100.0, "p99": 100.0, "max": 100.0}
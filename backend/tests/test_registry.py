@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import gc
+import threading
+import weakref
+
+import pytest
+
+from app.database import _REGISTRIES, _close_registries
+
+from .conftest import StubConnector, stub_registry
+
+
+def _registry(**waits):
+    connectors = {name: StubConnector(name, wait=wait) for name, wait in waits.items()}
+    return stub_registry(*connectors.values()), connectors
+
+
+def test_report_runs_checks_concurrently():
+    # Checks run one after another would break the barrier instead.
+    barrier = threading.Barrier(3)
+    everyone = lambda: barrier.wait(timeout=1.0)  # noqa: E731
+    registry, connectors = _registry(a=everyone, b=everyone, c=everyone)
+
+    report = registry.report()
+
+    assert {entry["status"] for entry in report.values()} == {"ok"}
+    assert [connectors[name].calls for name in "abc"] == [1, 1, 1]
+
+
+def test_slow_connector_times_out_without_blocking_others():
+    release = threading.Event()
+    registry, connectors = _registry(fast=lambda: None, slow=lambda: release.wait(5.0))
+
+    try:
+        summary = registry.summary(deadline=0.2)
+
+        assert summary["report"]["fast"]["status"] == "ok"
+        assert summary["report"]["slow"]["status"] == "timeout"
+        assert summary["counters"]["timeout"] == 1
+
+        # a second report joins the still-running check instead of starting one
+        registry.report(deadline=0.05)
+        assert connectors["slow"].calls == 1
+    finally:
+        release.set()
+
+
+def test_exit_hook_closes_live_registries_without_keeping_them_alive():
+    registry, _ = _registry(a=lambda: None)
+    assert registry in _REGISTRIES
+
+    _close_registries()
+    with pytest.raises(RuntimeError):
+        registry.submit("a")
+
+    dropped = weakref.ref(registry)
+    del registry
+    gc.collect()
+    assert dropped() is None
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from uuid import uuid4
+
+from app import create_app
+from app.config import Settings
+from app.rooms import HEALTH_ROOM, JOBS_CREATED_ROOM, RoomDirectory, job_room, valid_room
+from app.ws import broadcast_health
+
+
+def _events(client, name):
+    return [packet["args"][0] for packet in client.get_received() if packet["name"] == name]
+
+
+def test_room_directory_counts_and_drop():
+    directory = RoomDirectory()
+    directory.join("a", "job:1")
+    directory.join("b", "job:1")
+    directory.join("a", HEALTH_ROOM)
+    assert directory.count("job:1") == 2
+
+    directory.drop("a")
+    assert directory.count("job:1") == 1
+    assert directory.count(HEALTH_ROOM) == 0
+
+
+def test_rooms_are_validated_and_capped_per_client():
+    assert valid_room("connector:redis", ["redis", "mongo"])
+    assert not valid_room("connector:nope", ["redis", "mongo"])
+    assert valid_room(HEALTH_ROOM)
+    assert not valid_room("event:anything")
+    assert valid_room(job_room(str(uuid4())))
+    assert not valid_room("job:whatever")
+    assert not valid_room("lobby")
+
+    directory = RoomDirectory(max_rooms=2)
+    assert directory.join("a", "job:1") and directory.join("a", "job:2")
+    assert not directory.join("a", "job:3")
+    assert directory.join("a", "job:2")  # already a member
+    assert directory.rooms_of("a") == ["job:1", "job:2"] and directory.count("job:3") == 0
+
+
+def test_emits_only_reach_subscribed_clients():
+    app, socketio = create_app(Settings.for_testing())
+    watcher = socketio.test_client(app)
+    bystander = socketio.test_client(app)
+
+    requested = [HEALTH_ROOM, JOBS_CREATED_ROOM, "bogus", "connector:nope", "event:nope"]
+    ack = watcher.emit("subscribe", {"rooms": requested}, callback=True)
+    assert ack["rooms"] == [HEALTH_ROOM, JOBS_CREATED_ROOM]
+    watcher.get_received()
+    bystander.get_received()
+
+    app.test_client().post("/api/jobs", json={"type": "deploy:test"})
+    assert len(_events(watcher, "jobs:created")) == 1
+    assert _events(bystander, "jobs:created") == []
+
+    health = app.config["health_cache"]
+    health.publish("redis", {"status": "error", "error": "down"})
+    broadcast_health(health, app.config["broadcaster"], {})
+    patches = _events(watcher, "health:update")
+    assert patches and patches[-1]["databases"]["redis"]["status"] == "error"
+    assert _events(bystander, "health:update") == []
+
+    narrow = socketio.test_client(app)
+    narrow.get_received()
+    narrow.emit("subscribe", {"rooms": ["connector:redis"]}, callback=True)
+    assert [set(update["databases"]) for update in _events(narrow, "health:update")] == [{"redis"}]
+    narrow.disconnect()
+
+    directory = app.config["broadcaster"].directory
+    watcher.disconnect()
+    assert directory.count(HEALTH_ROOM) == 0
+    bystander.disconnect()
+
+
+def test_health_subscribers_get_one_snapshot_and_job_shortcuts_check_payloads():
+    app, socketio = create_app(Settings.for_testing())
+    client = socketio.test_client(app)
+
+    client.emit("subscribe", {"rooms": [HEALTH_ROOM]}, callback=True)
+    snapshots = _events(client, "health:update")
+    assert len(snapshots) == 1 and snapshots[0]["full"] is True
+
+    for payload in ("abc", ["id"], None, {"id": "nope"}):
+        ack = client.emit("jobs:subscribe", payload, callback=True)
+        assert "error" in ack
+        assert "error" in client.emit("jobs:unsubscribe", payload, callback=True)
+    job_id = str(uuid4())
+    assert client.emit("jobs:subscribe", {"id": job_id}, callback=True)["rooms"] == [HEALTH_ROOM, job_room(job_id)]
+    assert client.emit("jobs:unsubscribe", {"id": job_id}, callback=True)["rooms"] == [HEALTH_ROOM]
+    client.disconnect()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app import create_app
+from app.config import Settings
+from app.rooms import HEALTH_ROOM
+from app.serialization import JSONSerializer, get_serializer
+
+
+def test_serializers_agree_on_rest_bodies():
+    payload = {"b": [1, 2.5, None], "a": {"z": True, "when": datetime(2024, 1, 2, tzinfo=timezone.utc)}}
+    fast = get_serializer("auto")
+    assert fast.name != "json"  # orjson ships in requirements.txt
+
+    assert fast.dumps_bytes(payload, sort_keys=True) == JSONSerializer().dumps_bytes(payload, sort_keys=True)
+    assert fast.loads(fast.dumps(payload))["a"]["when"] == "2024-01-02T00:00:00+00:00"
+    # Integers wider than 64 bits fall back to the stdlib encoder.
+    wide = {"n": 2**70}
+    assert fast.dumps_bytes(wide) == JSONSerializer().dumps_bytes(wide) == b'{"n":1180591620717411303424}'
+    with pytest.raises(ValueError):
+        get_serializer("yaml")
+
+
+def test_broadcast_is_encoded_once_for_all_recipients(monkeypatch):
+    app, socketio = create_app(Settings.for_testing())
+    clients = [socketio.test_client(app) for _ in range(5)]
+    for client in clients:
+        client.emit("subscribe", {"rooms": [HEALTH_ROOM]}, callback=True)
+        client.get_received()
+
+    serializer = app.config["serializer"]
+    encoded = []
+    original = serializer.dumps
+
+    def counting(obj, *args, **kwargs):
+        encoded.append(obj)
+        return original(obj, *args, **kwargs)
+
+    sent = []
+    deliver = socketio.server._send_eio_packet
+
+    def capture(eio_sid, pkt):
+        # The test client decodes and re-encodes each packet it receives, so
+        # count the encodes made before the first delivery.
+        sent.append((pkt, len(encoded)))
+        deliver(eio_sid, pkt)
+
+    monkeypatch.setattr(serializer, "dumps", counting)
+    monkeypatch.setattr(socketio.server, "_send_eio_packet", capture)
+    app.config["broadcaster"].emit("health:update", {"seq": 1, "databases": {}}, HEALTH_ROOM)
+
+    assert all(len(client.get_received()) == 1 for client in clients)
+    assert len(sent) == 5
+    assert len({id(pkt) for pkt, _ in sent}) == 1
+    assert sent[0][1] == 1
@@ -1,4 +1,4 @@
-import { type FormEvent, useCallback, useEffect, useMemo, useState } from 'react'
+import { type FormEvent, useCallback, useEffect, useMemo, useRef, useState } from 'react'
 import { io, Socket } from 'socket.io-client'
 import './App.css'
 import {
@@ -8,6 +8,7 @@ import {
   getWsUrl,
   sendEcho,
   type HealthResponse,
+  type HealthUpdate,
 } from './lib/backend'
 
 type EventEntry = {
@@ -32,8 +33,12 @@ const badgeCopy: Record<string, string> = {
   ok: 'Healthy',
   error: 'Failing',
   skipped: 'Idle',
+  timeout: 'Timed out',
+  pending: 'Pending',
 }
 
+const SOCKET_ROOMS = ['event:health:update', 'event:jobs:created', 'event:jobs:update']
+
 const randomId = () => `evt-${Date.now()}-${Math.random().toString(16).slice(2)}`
 
 function App() {
@@ -46,6 +51,7 @@ function App() {
   const [echoBody, setEchoBody] = useState(() => defaultEcho())
   const [echoResult, setEchoResult] = useState('')
   const [events, setEvents] = useState<EventEntry[]>([])
+  const healthSeq = useRef(0)
 
   const apiBase = useMemo(() => getApiBaseUrl(), [])
   const wsUrl = useMemo(() => getWsUrl(), [])
@@ -93,15 +99,32 @@ function App() {
       return
     }
 
-    socket.on('connect', () => appendEvent('socket:connect', { id: socket?.id }))
+    socket.on('connect', () => {
+      appendEvent('socket:connect', { id: socket?.id })
+      // Broadcasts are room-scoped: only subscribed rooms receive them.
+      socket?.emit('subscribe', { rooms: SOCKET_ROOMS })
+    })
     socket.on('disconnect', () => appendEvent('socket:disconnect', { id: socket?.id }))
     socket.on('connect_error', (error) => appendEvent('socket:error', { message: error.message }))
 
-    socket.on('health:update', (payload) => {
+    socket.on('health:update', (payload: HealthUpdate) => {
       appendEvent('health:update', payload)
+      if (!payload.full) {
+        if (payload.base !== undefined && payload.base > healthSeq.current) {
+          // Missed at least one patch: ask for a full snapshot instead.
+          socket?.emit('health:resync')
+          return
+        }
+        if (payload.seq <= healthSeq.current) {
+          return
+        }
+      }
+      healthSeq.current = payload.seq
       setHealth((prev) => {
         const nextTimestamp = payload.timestamp ?? new Date().toISOString()
-        const nextDatabases = payload.databases ?? payload
+        const nextDatabases = payload.full
+          ? payload.databases
+          : { ...(prev?.databases ?? {}), ...payload.databases }
         if (!prev) {
           return {
             service: 'auto-deploy-lab',
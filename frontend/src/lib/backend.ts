@@ -30,13 +30,24 @@ async function requestJson<T>(path: string, init?: RequestInit): Promise<T> {
   return response.json() as Promise<T>
 }
 
-export type StatusState = 'ok' | 'error' | 'skipped'
+export type StatusState = 'ok' | 'error' | 'skipped' | 'timeout' | 'pending'
+
+export type BreakerState = {
+  state: 'closed' | 'open' | 'half_open'
+  failures: number
+  trips: number
+  retry_at: string | null
+}
 
 export type DatabaseStatus = {
   status: StatusState
-  checked_at?: string
+  checked_at?: string | null
   latency_ms?: number
+  connect_ms?: number
+  age_ms?: number
+  stale?: boolean
   error?: string
+  breaker?: BreakerState
   [key: string]: unknown
 }
 
@@ -48,19 +59,39 @@ export type HealthResponse = {
   databases: Record<string, DatabaseStatus>
 }
 
+export type HealthUpdate = {
+  seq: number
+  full: boolean
+  base?: number
+  timestamp: string
+  databases: Record<string, DatabaseStatus>
+}
+
 export type JobRequest = {
   type?: string
   data?: Record<string, unknown>
 }
 
+export type JobStatus = 'queued' | 'running' | 'succeeded' | 'failed'
+
 export type JobResponse = {
   id: string
   type: string
-  status: string
+  status: JobStatus
   created_at: string
+  started_at: string | null
+  finished_at: string | null
+  stage: string | null
+  progress: number
+  error: string | null
   payload: Record<string, unknown>
 }
 
+export type JobList = {
+  jobs: JobResponse[]
+  queued: number
+}
+
 export type EchoResponse = {
   received: Record<string, unknown>
   metadata: Record<string, unknown>
@@ -84,6 +115,10 @@ export const createJob = (job: JobRequest = {}) =>
     }),
   })
 
+export const fetchJob = (id: string) => requestJson<JobResponse>(`/jobs/${encodeURIComponent(id)}`)
+
+export const fetchJobs = () => requestJson<JobList>('/jobs')
+
 export const sendEcho = (payload: Record<string, unknown>) =>
   requestJson<EchoResponse>('/echo', {
     method: 'POST',